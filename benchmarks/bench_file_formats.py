@@ -0,0 +1,63 @@
+"""Compara o formato JSON (.stx) com o formato binário colunar (.stxb).
+
+Uso: python benchmarks/bench_file_formats.py [num_nos]
+"""
+import os
+import sys
+import time
+import tempfile
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_handler import DataHandler
+from core.file_manager import FileManager
+
+# Monta um modelo sintético (malha de nós ligados em sequência) direto em colunas
+def build_model(num_nodes):
+    handler = DataHandler()
+    side = int(np.ceil(np.sqrt(num_nodes)))
+    idx = np.arange(num_nodes)
+    nodes = {col: np.zeros(num_nodes, dtype=dtype) for col, dtype in handler.node_dtypes.items()}
+    nodes["X"] = (idx % side).astype(float)
+    nodes["Y"] = (idx // side).astype(float)
+    nodes["Restr_X"][:side] = True
+    nodes["Restr_Y"][:side] = True
+    nodes["Fy"][-side:] = -10.0
+
+    num_bars = num_nodes - 1
+    bars = {col: np.zeros(num_bars, dtype=dtype) for col, dtype in handler.bar_dtypes.items()}
+    bars["node_i"] = np.arange(num_bars)
+    bars["node_j"] = np.arange(1, num_nodes)
+    bars["E"][:] = 200e6
+    bars["A"][:] = 0.01
+    bars["I"][:] = 8e-5
+    handler.load_from_columns({"nodes": nodes, "bars": bars})
+    return handler
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+def main():
+    num_nodes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    handler = build_model(num_nodes)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        json_path = os.path.join(tmp, "model.stx")
+        bin_path = os.path.join(tmp, "model.stxb")
+
+        _, t_json_save = timed(lambda: FileManager.save_file(json_path, handler.get_dict_data()))
+        _, t_bin_save = timed(lambda: FileManager.save_binary_file(bin_path, handler.get_column_data()))
+
+        _, t_json_load = timed(lambda: DataHandler().load_from_dict(FileManager.load_file(json_path)[1]))
+        _, t_bin_load = timed(lambda: DataHandler().load_from_columns(FileManager.load_binary_file(bin_path)[1]))
+
+        print(f"Modelo: {num_nodes} nós / {num_nodes - 1} barras")
+        print(f"{'Formato':<10}{'Salvar (s)':>12}{'Abrir (s)':>12}{'Tamanho (MB)':>15}")
+        print(f"{'.stx':<10}{t_json_save:>12.3f}{t_json_load:>12.3f}{os.path.getsize(json_path) / 1e6:>15.2f}")
+        print(f"{'.stxb':<10}{t_bin_save:>12.3f}{t_bin_load:>12.3f}{os.path.getsize(bin_path) / 1e6:>15.2f}")
+
+if __name__ == '__main__':
+    main()
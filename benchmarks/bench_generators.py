@@ -0,0 +1,39 @@
+"""Mede o tempo dos geradores paramétricos de modelos.
+
+Uso: python benchmarks/bench_generators.py [num_barras]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_handler import DataHandler
+from core.generators import ModelGenerator
+
+def main():
+    num_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # Pórtico quase quadrado com ~num_bars barras (2 barras por nó)
+    bays = max(1, int(np.sqrt(num_bars / 2)))
+    cases = [
+        ("Pórtico", lambda handler: ModelGenerator.frame(handler, bays, bays, beam_load=-10.0)),
+        ("Treliça Pratt", lambda handler: ModelGenerator.truss(handler, "pratt", num_bars // 4, num_bars / 4, 2.0, node_load=-10.0)),
+        ("Treliça Warren", lambda handler: ModelGenerator.truss(handler, "warren", num_bars // 4, num_bars / 4, 2.0, node_load=-10.0)),
+        ("Viga contínua", lambda handler: ModelGenerator.continuous_beam(handler, np.full(100, 10.0), num_bars // 100, load=-10.0)),
+        ("Arco", lambda handler: ModelGenerator.arch(handler, 100.0, 20.0, num_bars, load=-1.0)),
+    ]
+
+    print(f"{'Modelo':<16}{'Nós':>10}{'Barras':>10}{'Tempo (s)':>12}")
+    for label, generate in cases:
+        handler = DataHandler()
+        start = time.perf_counter()
+        success, msg = generate(handler)
+        elapsed = time.perf_counter() - start
+        if not success:
+            print(f"{label:<16}{msg}")
+            continue
+        print(f"{label:<16}{len(handler.nodes):>10}{len(handler.bars):>10}{elapsed:>12.3f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Mede o tempo das consultas do cursor (nó ou barra mais próximo) em modelos de tamanhos diferentes.
+
+Uso: python benchmarks/bench_picking.py [num_consultas]
+"""
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_handler import DataHandler
+from core.generators import ModelGenerator
+from core.picking import ModelPicker
+
+def main():
+    num_queries = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000
+    rng = np.random.default_rng(0)
+
+    print(f"{'Barras':>10}{'Índice (s)':>12}{'Consulta (us)':>15}{'Acertos':>10}")
+    for num_bars in (1_000, 10_000, 100_000, 500_000):
+        bays = max(1, int(np.sqrt(num_bars / 2)))
+        handler = DataHandler()
+        ModelGenerator.frame(handler, bays, bays)
+
+        start = time.perf_counter()
+        picker = ModelPicker.from_model(handler.node_arrays(), handler.bar_arrays())
+        build = time.perf_counter() - start
+
+        # Cursor em pontos aleatórios da estrutura; tolerância de 6 pixels numa tela de 800 pixels
+        low, size = picker.coord.min(axis=0), np.ptp(picker.coord, axis=0)
+        points = low + rng.uniform(size=(num_queries, 2)) * size
+        tolerance = 6 * size.max() / 800
+        start = time.perf_counter()
+        hits = sum(picker.pick(x, y, tolerance) is not None for x, y in points.tolist())
+        query = (time.perf_counter() - start) / num_queries
+        print(f"{len(picker.segments):>10}{build:>12.3f}{query * 1e6:>15.1f}{hits:>10}")
+
+if __name__ == '__main__':
+    main()
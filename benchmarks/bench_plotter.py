@@ -0,0 +1,110 @@
+"""Mede o tempo de desenho do StructuralPlotter (sem interface, backend Agg).
+
+Uso: python benchmarks/bench_plotter.py [num_barras]
+"""
+import os
+import sys
+import time
+import numpy as np
+import matplotlib
+matplotlib.use("Agg")
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.data_handler import DataHandler
+from core.generators import ModelGenerator
+from core.changes import ModelChange
+from graphics.plotter import StructuralPlotter
+
+class AggCanvas(FigureCanvasAgg):
+    """Canvas mínimo com a mesma interface usada pelo plotter (atributo axes).
+
+    draw_idle não desenha: o benchmark mede separadamente as camadas e a renderização Agg.
+    """
+    def __init__(self):
+        super().__init__(Figure(figsize=(8, 6), dpi=100))
+        self.axes = self.figure.add_subplot(111)
+
+    def draw_idle(self, *args, **kwargs):
+        pass
+
+def main():
+    num_bars = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    # Pórtico quase quadrado com ~num_bars barras (2 barras por nó)
+    bays = max(1, int(np.sqrt(num_bars / 2)))
+    handler = DataHandler()
+    ModelGenerator.frame(handler, bays, bays, beam_load=-10.0)  # Cargas distribuídas em todas as vigas
+    nodes, bars = handler.nodes_df, handler.bars_df
+
+    # Resultados fictícios (esforços aleatórios; só a geometria importa para o desenho)
+    coord = np.column_stack([handler.nodes.column("X"), handler.nodes.column("Y")])
+    connectivity = np.column_stack([handler.bars.column("node_i"), handler.bars.column("node_j")])
+    rng = np.random.default_rng(0)
+    results = {"coord": coord, "deformed_coords": coord + 0.05, "connectivity": connectivity,
+               "lengths": np.hypot(*(coord[connectivity[:, 1]] - coord[connectivity[:, 0]]).T),
+               "forces": rng.normal(size=(len(connectivity), 6)),
+               "distributed_loads": handler.bars.column("Q").astype(float),
+               "reactions": np.zeros((len(coord), 3))}
+
+    plotter = StructuralPlotter(AggCanvas())
+    print(f"Modelo: {len(nodes)} nós e {len(bars)} barras")
+    print(f"{'Vista':<16}{'Camadas (s)':>12}{'Agg (s)':>12}")
+    # Edição de uma carga nodal: só a camada de cargas é refeita
+    load_change = ModelChange()
+    load_change.add(ModelChange.LOAD, "nodes", [0])
+    # (rótulo, vista, numeração ligada, modificação)
+    steps = [
+        ("Visualização", "Visualização", False, None),
+        ("Deformação", "Deformação", False, ModelChange()),
+        ("Volta", "Visualização", False, ModelChange()),
+        ("Carga editada", "Visualização", False, load_change),
+        ("Numeração", "Visualização", True, ModelChange()),
+        ("Normal", "Diagrama de Esforços Normais", False, ModelChange()),
+        ("Momento", "Diagrama de Momento Fletor", False, ModelChange()),
+        ("Normal (volta)", "Diagrama de Esforços Normais", False, ModelChange()),
+        ("Visualização", "Visualização", False, ModelChange()),
+    ]
+    for label, view, numbering, change in steps:
+        start = time.perf_counter()
+        plotter.draw_structure(nodes, bars, results, view, True, numbering, numbering, False, change)
+        middle = time.perf_counter()
+        plotter.canvas.draw()
+        print(f"{label:<16}{middle - start:>12.3f}{time.perf_counter() - middle:>12.3f}")
+
+    # Pan numa vista de 1/10 da estrutura: só a numeração e os apoios na vista são refeitos
+    (x0, x1), (y0, y1) = plotter.ax.get_xlim(), plotter.ax.get_ylim()
+    print(f"{'Pan (por passo)':<16}{pan(plotter, x0, y0, (x1 - x0) / 10, (y1 - y0) / 10):>12.3f}")
+
+    # Pan com a estrutura inteira na vista, sem e com ladrilhos. Os ladrilhos vão para uma fila
+    # (no programa, um QThreadPool): o passo mede só a thread da interface, o refino mede a fila
+    plotter.reset_view()
+    (x0, x1), (y0, y1) = plotter.ax.get_xlim(), plotter.ax.get_ylim()
+    print(f"{'Pan inteira':<16}{pan(plotter, x0, y0, x1 - x0, y1 - y0):>12.3f}")
+    queue = []
+    plotter.set_tile_mode(True, lambda func, args, callback: queue.append((func, args, callback)))
+    plotter.reset_view()
+    run_queue(queue)
+    print(f"{'Pan ladrilhos':<16}{pan(plotter, x0, y0, x1 - x0, y1 - y0):>12.3f}")
+    count, start = len(queue), time.perf_counter()
+    run_queue(queue)
+    print(f"{'Refino (ladr.)':<16}{(time.perf_counter() - start) / max(count, 1):>12.3f}")
+
+def pan(plotter, x0, y0, width, height, num_steps=20):
+    """Tempo médio de um passo de pan (1/4 da largura da vista por passo)."""
+    start = time.perf_counter()
+    for k in range(num_steps):
+        plotter.ax.set_xlim(x0 + k * width / 4, x0 + k * width / 4 + width)
+        plotter.ax.set_ylim(y0, y0 + height)
+        plotter.canvas.draw()
+    return (time.perf_counter() - start) / num_steps
+
+def run_queue(queue):
+    """Executa os ladrilhos pendentes (e os que eles pedirem) na ordem de chegada."""
+    while queue:
+        func, args, callback = queue.pop(0)
+        callback(func(*args))
+
+if __name__ == '__main__':
+    main()
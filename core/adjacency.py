@@ -0,0 +1,63 @@
+import numpy as np
+
+class NodeBarAdjacency:
+    """Adjacência nó -> barras incidentes em formato CSR (Compressed Sparse Row).
+
+    As barras do nó k são bar_ids[offsets[k]:offsets[k + 1]]. A estrutura é montada de
+    forma vetorizada (bincount + lexsort) e só é refeita quando a conectividade muda.
+    """
+
+    def __init__(self):
+        self.offsets = np.zeros(1, dtype=np.int64)
+        self.bar_ids = np.zeros(0, dtype=np.int64)
+        self._key = None  # Versão da tabela de barras e número de nós usados na montagem
+
+    def build(self, num_nodes, node_i, node_j):
+        """Monta a adjacência a partir das colunas node_i / node_j (referências fora da faixa são ignoradas)."""
+        node_i = np.asarray(node_i, dtype=np.int64)
+        node_j = np.asarray(node_j, dtype=np.int64)
+        ends = np.concatenate([node_i, node_j])
+        bars = np.tile(np.arange(len(node_i), dtype=np.int64), 2)
+        valid = (ends >= 0) & (ends < num_nodes)
+        ends, bars = ends[valid], bars[valid]
+
+        order = np.lexsort((bars, ends))  # Por nó e, dentro de cada nó, por barra (ordem crescente)
+        self.bar_ids = bars[order]
+        self.offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(ends, minlength=num_nodes), out=self.offsets[1:])
+
+    def update(self, nodes, bars):
+        """Remonta a partir dos ColumnStore do modelo, se algo mudou desde a última montagem."""
+        key = (bars.version, len(nodes))
+        if key != self._key:
+            self.build(len(nodes), bars.column("node_i"), bars.column("node_j"))
+            self._key = key
+        return self
+
+    @property
+    def num_nodes(self):
+        return len(self.offsets) - 1
+
+    def degree(self):
+        """Número de barras incidentes em cada nó."""
+        return np.diff(self.offsets)
+
+    def bars_of(self, node):
+        """Barras incidentes no nó (view, em ordem crescente)."""
+        return self.bar_ids[self.offsets[node]:self.offsets[node + 1]]
+
+    def bars_of_nodes(self, nodes):
+        """Barras incidentes em qualquer um dos nós dados (sem repetição)."""
+        nodes = np.asarray(nodes, dtype=np.int64).ravel()
+        if len(nodes) == 0: return np.zeros(0, dtype=np.int64)
+        starts, stops = self.offsets[nodes], self.offsets[nodes + 1]
+        counts = stops - starts
+        # Concatena as faixas [start, stop) de cada nó sem laço em Python
+        positions = np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        return np.unique(self.bar_ids[positions])
+
+    def neighbors(self, node, node_i, node_j):
+        """Nós ligados ao nó dado por alguma barra."""
+        bars = self.bars_of(node)
+        other = np.where(np.asarray(node_i)[bars] == node, np.asarray(node_j)[bars], np.asarray(node_i)[bars])
+        return np.unique(other)
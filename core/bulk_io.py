@@ -0,0 +1,232 @@
+import numpy as np
+import pandas as pd
+
+class BulkIO:
+    # Nos arquivos CSV a numeração de nós e barras começa em 1, igual às tabelas da interface
+    NODE_ID_COL = "node"
+    BAR_ID_COL = "bar"
+
+    # Valores padrão de uma barra nova (mesmos do formulário da aba Barras)
+    BAR_DEFAULTS = {"E": 200e6, "A": 0.01, "I": 8e-5}
+
+    TRUE_STRINGS = ["1", "true", "verdadeiro", "sim", "s", "x", "yes", "y"]
+
+    # Saída dos esforços internos: número de pontos por barra e barras processadas por bloco
+    EXPORT_STATIONS = 11
+    EXPORT_CHUNK_BARS = 20000
+
+    # --- LEITURA E VALIDAÇÃO ---
+
+    @staticmethod
+    def read_table(filepath):
+        """Lê um CSV (separador ',' ou ';' detectado pelo cabeçalho) ou uma planilha Excel."""
+        lower = str(filepath).lower()
+        if lower.endswith((".xlsx", ".xls")):
+            return pd.read_excel(filepath)
+
+        with open(filepath, 'r', encoding='utf-8-sig') as f:
+            header = f.readline()
+        # Padrão brasileiro: ';' como separador e ',' como decimal
+        if ";" in header and "," not in header:
+            return pd.read_csv(filepath, sep=";", decimal=",", encoding='utf-8-sig')
+        return pd.read_csv(filepath, encoding='utf-8-sig')
+
+    @staticmethod
+    def _numeric_columns(df, dtypes, required):
+        """Converte as colunas presentes para os tipos do modelo, validando coluna a coluna."""
+        missing = [col for col in required if col not in df.columns]
+        if missing:
+            raise ValueError(f"Colunas obrigatórias ausentes: {', '.join(missing)}.")
+
+        columns = {}
+        for col, dtype in dtypes.items():
+            if col not in df.columns: continue
+            if np.dtype(dtype) == np.bool_:
+                if pd.api.types.is_numeric_dtype(df[col]):
+                    values = df[col].fillna(0).to_numpy() != 0
+                else:
+                    text = df[col].astype(str).str.strip().str.lower()
+                    values = text.isin(BulkIO.TRUE_STRINGS).to_numpy()
+            else:
+                numeric = pd.to_numeric(df[col], errors='coerce')
+                invalid = numeric.isna().to_numpy()
+                if invalid.any():
+                    rows = np.flatnonzero(invalid)[:5] + 2  # +1 cabeçalho, +1 numeração a partir de 1
+                    raise ValueError(f"Valores inválidos na coluna '{col}' (linhas {', '.join(map(str, rows))}...).")
+                if np.dtype(dtype).kind == 'i' and (numeric % 1 != 0).any():
+                    raise ValueError(f"A coluna '{col}' deve conter apenas números inteiros.")
+                values = numeric.to_numpy(dtype=dtype)
+            columns[col] = values
+        return columns
+
+    @staticmethod
+    def _ids(df, id_col, count, label):
+        """Converte a coluna de numeração (1-based) para índices 0-based, validando a faixa."""
+        ids = BulkIO._numeric_columns(df, {id_col: np.int64}, [id_col])[id_col] - 1
+        invalid = (ids < 0) | (ids >= count)
+        if invalid.any():
+            rows = np.flatnonzero(invalid)[:5] + 2
+            raise ValueError(f"{label} inexistentes na coluna '{id_col}' (linhas {', '.join(map(str, rows))}...).")
+        return ids
+
+    # --- IMPORTAÇÃO ---
+
+    @staticmethod
+    def import_nodes(data_handler, filepath):
+        """Adiciona nós a partir de um arquivo com colunas X, Y (e opcionalmente cargas/apoios)."""
+        try:
+            df = BulkIO.read_table(filepath)
+            columns = BulkIO._numeric_columns(df, data_handler.node_dtypes, ["X", "Y"])
+            return data_handler.add_nodes(columns)
+        except Exception as e:
+            return False, str(e)
+
+    @staticmethod
+    def import_bars(data_handler, filepath):
+        """Adiciona barras a partir de um arquivo com colunas node_i, node_j (numeração a partir de 1)."""
+        try:
+            df = BulkIO.read_table(filepath)
+            columns = BulkIO._numeric_columns(df, data_handler.bar_dtypes, ["node_i", "node_j"])
+            columns["node_i"] = columns["node_i"] - 1
+            columns["node_j"] = columns["node_j"] - 1
+            return data_handler.add_bars(columns, defaults=BulkIO.BAR_DEFAULTS)
+        except Exception as e:
+            return False, str(e)
+
+    @staticmethod
+    def import_node_values(data_handler, filepath):
+        """Atualiza apoios, cargas nodais e deslocamentos prescritos de nós existentes.
+
+        Colunas: node (a partir de 1) e qualquer coluna de nó (Restr_X, Fx, Disp_Y, ...).
+        """
+        try:
+            df = BulkIO.read_table(filepath)
+            indices = BulkIO._ids(df, BulkIO.NODE_ID_COL, len(data_handler.nodes), "Nós")
+            dtypes = {col: dtype for col, dtype in data_handler.node_dtypes.items() if col not in ("X", "Y")}
+            columns = BulkIO._numeric_columns(df, dtypes, [])
+            if not columns: return False, "Nenhuma coluna de apoio, carga ou deslocamento encontrada."
+            return data_handler.update_nodes(indices, columns)
+        except Exception as e:
+            return False, str(e)
+
+    @staticmethod
+    def import_bar_values(data_handler, filepath):
+        """Atualiza cargas distribuídas (Q) e propriedades de barras existentes.
+
+        Colunas: bar (a partir de 1) e qualquer coluna de barra exceto a conectividade.
+        """
+        try:
+            df = BulkIO.read_table(filepath)
+            indices = BulkIO._ids(df, BulkIO.BAR_ID_COL, len(data_handler.bars), "Barras")
+            dtypes = {col: dtype for col, dtype in data_handler.bar_dtypes.items() if col not in ("node_i", "node_j")}
+            columns = BulkIO._numeric_columns(df, dtypes, [])
+            if not columns: return False, "Nenhuma coluna de carga ou propriedade encontrada."
+            return data_handler.update_bars(indices, columns)
+        except Exception as e:
+            return False, str(e)
+
+    # --- EXPORTAÇÃO DE RESULTADOS ---
+
+    @staticmethod
+    def _table_writer(filepath):
+        """Retorna (write(df), close()) para CSV ou Parquet, gravando um bloco por chamada."""
+        if str(filepath).lower().endswith(".parquet"):
+            try:
+                import pyarrow as pa
+                import pyarrow.parquet as pq
+            except ImportError:
+                raise ImportError("A exportação em Parquet requer o pacote 'pyarrow' (pip install pyarrow).")
+            state = {"writer": None}
+
+            def write(df):
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                if state["writer"] is None:
+                    state["writer"] = pq.ParquetWriter(filepath, table.schema)
+                state["writer"].write_table(table)
+
+            def close():
+                if state["writer"] is not None: state["writer"].close()
+            return write, close
+
+        f = open(filepath, 'w', encoding='utf-8', newline='')
+        state = {"header": True}
+
+        def write(df):
+            df.to_csv(f, header=state["header"], index=False)
+            state["header"] = False
+        return write, f.close
+
+    @staticmethod
+    def _node_results(values, columns, chunk_rows):
+        """Gera blocos de resultados nodais (deslocamentos ou reações)."""
+        for start in range(0, len(values), chunk_rows):
+            block = values[start:start + chunk_rows]
+            data = {BulkIO.NODE_ID_COL: np.arange(start, start + len(block)) + 1}
+            data.update({col: block[:, k] for k, col in enumerate(columns)})
+            yield pd.DataFrame(data)
+
+    @staticmethod
+    def internal_force_chunks(results, num_stations=None, chunk_bars=None, parents=None):
+        """Gera blocos com N, V e M amostrados ao longo de cada barra.
+
+        As convenções de sinal são as mesmas dos diagramas desenhados pelo StructuralPlotter.
+        parents: DataHandler.bar_parents(); acrescenta a barra original e a posição nela
+        (colunas parent_bar e x_parent) para barras subdivididas.
+        """
+        num_stations = num_stations or BulkIO.EXPORT_STATIONS
+        chunk_bars = chunk_bars or BulkIO.EXPORT_CHUNK_BARS
+        forces, L, p = results['forces'], results['lengths'], results['distributed_loads']
+        t = np.linspace(0, 1, num_stations)
+
+        for start in range(0, len(forces), chunk_bars):
+            stop = min(start + chunk_bars, len(forces))
+            f, pb = forces[start:stop], p[start:stop, np.newaxis]
+            x = L[start:stop, np.newaxis] * t[np.newaxis, :]
+            N = np.broadcast_to(f[:, [0]], x.shape)
+            V = f[:, [1]] + pb * x
+            M = -f[:, [2]] + f[:, [1]] * x + pb * x**2 / 2
+            chunk = pd.DataFrame({
+                BulkIO.BAR_ID_COL: np.repeat(np.arange(start, stop) + 1, num_stations),
+                "station": np.tile(np.arange(num_stations), stop - start),
+                "x": x.ravel(),
+                "N": N.ravel(),
+                "V": V.ravel(),
+                "M": M.ravel(),
+            })
+            if parents is not None:
+                t0, t1 = parents["t0"][start:stop, np.newaxis], parents["t1"][start:stop, np.newaxis]
+                parent_length = L[start:stop, np.newaxis] / (t1 - t0)
+                chunk.insert(1, "parent_bar", np.repeat(parents["parent"][start:stop] + 1, num_stations))
+                chunk.insert(4, "x_parent", (parent_length * t0 + x).ravel())
+            yield chunk
+
+    @staticmethod
+    def export_results(results, filepath, kind, num_stations=None, chunk_rows=None, parents=None):
+        """Exporta resultados da análise para CSV ou Parquet (escolhido pela extensão).
+
+        kind: "displacements", "reactions" ou "internal_forces".
+        parents: origem das barras subdivididas (ver internal_force_chunks).
+        """
+        if results is None:
+            return False, "Execute a análise antes de exportar resultados."
+        num_stations = num_stations or BulkIO.EXPORT_STATIONS
+        chunk_rows = chunk_rows or BulkIO.EXPORT_CHUNK_BARS * num_stations
+        try:
+            if kind == "displacements":
+                chunks = BulkIO._node_results(results['displacements'], ["UX", "UY", "RZ"], chunk_rows)
+            elif kind == "reactions":
+                chunks = BulkIO._node_results(results['reactions'], ["Rx", "Ry", "Mz"], chunk_rows)
+            elif kind == "internal_forces":
+                chunks = BulkIO.internal_force_chunks(results, num_stations, max(1, chunk_rows // num_stations), parents)
+            else:
+                return False, f"Tipo de resultado desconhecido: {kind}."
+
+            write, close = BulkIO._table_writer(filepath)
+            try:
+                for chunk in chunks:
+                    write(chunk)
+            finally:
+                close()
+            return True, "Resultados exportados com sucesso!"
+        except Exception as e:
+            return False, str(e)
@@ -0,0 +1,100 @@
+import numpy as np
+
+class ModelChange:
+    """Descrição de uma modificação do modelo (ou lote), entregue aos ouvintes do DataHandler.
+
+    Cada modificação tem um ou mais tipos e, para cada tipo, os índices de nós e de barras
+    afetados (None = todos, ex.: arquivo carregado). Quem consome o aviso (cache do solver,
+    tabelas, desenho) refaz só o que depende dos tipos recebidos: uma carga alterada não
+    exige recalcular as matrizes das barras nem reescrever a tabela de nós.
+
+    TOPOLOGY indica linhas adicionadas, removidas ou renumeradas (ou barras religadas). Nesse
+    caso os índices dos demais tipos podem se referir à numeração anterior e os consumidores
+    devem refazer tudo o que depende da tabela.
+    """
+
+    GEOMETRY = "geometry"      # Coordenadas dos nós (e as barras ligadas a eles)
+    TOPOLOGY = "topology"      # Linhas adicionadas/removidas/renumeradas, conectividade das barras
+    SECTION = "section"        # E, A, I
+    RELEASE = "release"        # Rótulas
+    SUPPORT = "support"        # Restrições de apoio
+    LOAD = "load"              # Cargas nodais e distribuídas
+    PRESCRIBED = "prescribed"  # Deslocamentos prescritos
+
+    KINDS = (GEOMETRY, TOPOLOGY, SECTION, RELEASE, SUPPORT, LOAD, PRESCRIBED)
+
+    # Tipo de modificação de cada coluna (colunas fora da lista contam como TOPOLOGY)
+    NODE_COLUMNS = {
+        "X": GEOMETRY, "Y": GEOMETRY,
+        "Fx": LOAD, "Fy": LOAD, "Mz": LOAD,
+        "Restr_X": SUPPORT, "Restr_Y": SUPPORT, "Restr_Rz": SUPPORT, "Restr_Rot": SUPPORT,
+        "Disp_X": PRESCRIBED, "Disp_Y": PRESCRIBED, "Disp_Rz": PRESCRIBED,
+    }
+    BAR_COLUMNS = {
+        "node_i": TOPOLOGY, "node_j": TOPOLOGY,
+        "E": SECTION, "A": SECTION, "I": SECTION,
+        "Q": LOAD, "rot_i": RELEASE, "rot_j": RELEASE,
+    }
+
+    def __init__(self):
+        self.kinds = set()
+        # Tabela ("nodes" / "bars") -> tipo -> lista de arrays de índices, ou None (todos)
+        self._indices = {"nodes": {}, "bars": {}}
+
+    @classmethod
+    def everything(cls):
+        """Modificação de todos os tipos em todas as linhas (ex.: modelo novo)."""
+        change = cls()
+        for kind in cls.KINDS:
+            change.add(kind, "nodes")
+            change.add(kind, "bars")
+        return change
+
+    def __bool__(self):
+        return bool(self.kinds)
+
+    def __repr__(self):
+        return f"ModelChange({', '.join(sorted(self.kinds))})"
+
+    def add(self, kind, table, indices=None):
+        """Registra o tipo 'kind' nas linhas 'indices' da tabela (None = todas)."""
+        self.kinds.add(kind)
+        parts = self._indices[table]
+        if indices is None:
+            parts[kind] = None
+        elif parts.get(kind, []) is not None:
+            parts.setdefault(kind, []).append(np.asarray(indices, dtype=np.int64).ravel())
+
+    def add_op(self, table, op):
+        """Registra uma operação do ColumnStore (a inversa, como recebida pelo recorder).
+
+        Só "set" mantém a numeração das linhas; as demais operações são TOPOLOGY.
+        """
+        if op[0] != "set":
+            self.add(ModelChange.TOPOLOGY, table)
+            return
+        columns = ModelChange.NODE_COLUMNS if table == "nodes" else ModelChange.BAR_COLUMNS
+        indices = None if isinstance(op[1], slice) else op[1]
+        for kind in {columns.get(col, ModelChange.TOPOLOGY) for col in op[2]}:
+            self.add(kind, table, indices)
+
+    def affects(self, *kinds):
+        """True se a modificação tem algum dos tipos dados."""
+        return not self.kinds.isdisjoint(kinds)
+
+    def _union(self, table, kinds):
+        parts = self._indices[table]
+        arrays = []
+        for kind in kinds:
+            if kind not in parts: continue
+            if parts[kind] is None: return None
+            arrays.extend(parts[kind])
+        return np.unique(np.concatenate(arrays)) if arrays else np.zeros(0, dtype=np.int64)
+
+    def nodes(self, *kinds):
+        """Nós afetados por algum dos tipos dados (todos os tipos se nenhum for dado); None = todos os nós."""
+        return self._union("nodes", kinds or ModelChange.KINDS)
+
+    def bars(self, *kinds):
+        """Barras afetadas por algum dos tipos dados (todos os tipos se nenhum for dado); None = todas as barras."""
+        return self._union("bars", kinds or ModelChange.KINDS)
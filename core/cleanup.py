@@ -0,0 +1,132 @@
+import numpy as np
+from core.validator import ModelValidator
+from core.spatial_index import SpatialHash
+
+class GeometryCleanup:
+    """Limpeza de geometria importada: fusão de nós próximos e remoção de barras inválidas.
+
+    Os pares de nós próximos saem da grade ordenada de SpatialHash.close_pairs, em
+    O(n log n). Os grupos de nós a fundir são os componentes conexos desses pares.
+    """
+
+    DEFAULT_TOLERANCE = 1e-6
+
+    # Máximo de fusões listadas no relatório
+    MAX_LISTED = 20
+
+    @staticmethod
+    def plan(nodes, bars, tolerance=None):
+        """Calcula a limpeza sem aplicar.
+
+        Retorna um dicionário com:
+            target: nó que substitui cada nó (ele mesmo, se não for fundido)
+            merged: nós que serão removidos por fusão
+            zero_length / duplicate: barras que serão removidas
+        """
+        tolerance = GeometryCleanup.DEFAULT_TOLERANCE if tolerance is None else tolerance
+        coords = np.column_stack([np.asarray(nodes["X"], dtype=float), np.asarray(nodes["Y"], dtype=float)]).reshape(-1, 2)
+        num_nodes = len(coords)
+
+        # Grupos de nós próximos; o representante é o menor índice do grupo
+        a, b = SpatialHash.close_pairs(coords, tolerance)
+        target = ModelValidator.connected_components(num_nodes, a, b)
+        merged = np.flatnonzero(target != np.arange(num_nodes))
+
+        # Barras após a troca dos nós fundidos pelos representantes
+        node_i = target[np.asarray(bars["node_i"], dtype=np.int64)]
+        node_j = target[np.asarray(bars["node_j"], dtype=np.int64)]
+        length = np.hypot(*(coords[node_j] - coords[node_i]).T) if len(node_i) else np.zeros(0)
+        zero_length = np.flatnonzero((node_i == node_j) | (length <= tolerance))
+
+        # Barras repetidas (mesmo par de nós, em qualquer sentido): fica a primeira
+        valid = np.ones(len(node_i), dtype=bool)
+        valid[zero_length] = False
+        pair = np.minimum(node_i, node_j) * max(num_nodes, 1) + np.maximum(node_i, node_j)
+        candidates = np.flatnonzero(valid)
+        _, first = np.unique(pair[candidates], return_index=True)
+        keep = np.zeros(len(node_i), dtype=bool)
+        keep[candidates[first]] = True
+        duplicate = np.flatnonzero(valid & ~keep)
+
+        return {"tolerance": tolerance, "target": target, "merged": merged,
+                "zero_length": zero_length, "duplicate": duplicate}
+
+    @staticmethod
+    def report(plan):
+        """Texto com o resumo da limpeza e as primeiras fusões (numeração a partir de 1)."""
+        lines = [f"Tolerância: {plan['tolerance']:g}",
+                 f"Nós fundidos: {len(plan['merged'])}",
+                 f"Barras de comprimento nulo removidas: {len(plan['zero_length'])}",
+                 f"Barras repetidas removidas: {len(plan['duplicate'])}"]
+        merged = plan["merged"]
+        for node in merged[:GeometryCleanup.MAX_LISTED].tolist():
+            lines.append(f"  Nó {node + 1} -> Nó {plan['target'][node] + 1}")
+        if len(merged) > GeometryCleanup.MAX_LISTED:
+            lines.append(f"  ... e mais {len(merged) - GeometryCleanup.MAX_LISTED} fusões")
+        return "\n".join(lines)
+
+    @staticmethod
+    def apply(data_handler, tolerance=None):
+        """Executa a limpeza no DataHandler como uma única modificação, tudo ou nada.
+
+        Nos nós fundidos, as restrições são combinadas (OU) e as cargas nodais somadas no
+        representante; os deslocamentos prescritos do representante são mantidos.
+        Retorna (sucesso, relatório).
+        """
+        try:
+            plan = GeometryCleanup.plan(data_handler.node_arrays(), data_handler.bar_arrays(), tolerance)
+        except Exception as e:
+            return False, str(e)
+        if not (len(plan["merged"]) or len(plan["zero_length"]) or len(plan["duplicate"])):
+            return True, "Nenhum problema encontrado.\n" + GeometryCleanup.report(plan)
+
+        with data_handler.batch():
+            savepoint = data_handler.savepoint()
+            try:
+                success, msg = GeometryCleanup._apply_plan(data_handler, plan)
+            except Exception as e:
+                success, msg = False, str(e)
+            if not success:
+                # Tudo ou nada: as etapas já aplicadas são desfeitas antes do fim do lote
+                data_handler.rollback(savepoint)
+                return False, msg
+
+        return True, GeometryCleanup.report(plan)
+
+    @staticmethod
+    def _apply_plan(data_handler, plan):
+        """Etapas da limpeza (dentro do lote de apply). Retorna (sucesso, mensagem) da primeira falha."""
+        target, merged = plan["target"], plan["merged"]
+        nodes = data_handler.node_arrays()
+        node_i = target[data_handler.bars.column("node_i")]
+        node_j = target[data_handler.bars.column("node_j")]
+        remove = np.union1d(plan["zero_length"], plan["duplicate"])
+        keep = np.ones(len(node_i), dtype=bool)
+        keep[remove] = False
+
+        if len(merged):
+            # Combina os dados dos nós fundidos no representante
+            representatives = np.unique(target[merged])
+            combined = {}
+            for col in ("Restr_X", "Restr_Y", "Restr_Rz"):
+                values = nodes[col].copy()
+                np.logical_or.at(values, target[merged], nodes[col][merged])
+                combined[col] = values[representatives]
+            for col in ("Fx", "Fy", "Mz"):
+                values = nodes[col].copy()
+                np.add.at(values, target[merged], nodes[col][merged])
+                combined[col] = values[representatives]
+            success, msg = data_handler.update_nodes(representatives, combined)
+            if not success: return False, msg
+
+        if len(remove):
+            success, msg = data_handler.delete_bars(remove)
+            if not success: return False, msg
+        if len(merged) and keep.any():
+            success, msg = data_handler.update_bars(np.arange(keep.sum()), {"node_i": node_i[keep], "node_j": node_j[keep]})
+            if not success: return False, msg
+        if len(merged):
+            # Os nós fundidos já não têm barras: nenhuma barra é removida em cascata
+            success, msg = data_handler.delete_nodes(merged)
+            if not success: return False, msg
+        return True, ""
@@ -1,98 +1,326 @@
+from contextlib import contextmanager
+import numpy as np
 import pandas as pd
+from core.model_store import ColumnStore
+from core.spatial_index import SpatialHash
+from core.adjacency import NodeBarAdjacency
+from core.history import UndoStack
+from core.changes import ModelChange
 
 class DataHandler:
     def __init__(self):
+        # Revisão do estado atual (usada para saber se há alterações não salvas). Cada estado
+        # novo recebe um número nunca usado antes; desfazer volta ao número do estado anterior.
+        self.revision = 0
+        self._last_revision = 0
+        # Distância abaixo da qual dois nós são considerados coincidentes
+        self.node_tolerance = 1e-9
+        # Funções avisadas a cada modificação do modelo (ex.: atualização da interface)
+        self._listeners = []
+        # Controle de lotes: modificações dentro de batch() geram um único aviso no final
+        self._batch_depth = 0
+        self._batch_changed = False
+        # Desfazer / refazer (registro das modificações das tabelas)
+        self.history = UndoStack()
         self.init_data()
 
     def init_data(self):
-        """Inicializa ou reseta os DataFrames e resultados."""
+        """Inicializa ou reseta as tabelas e resultados."""
         # Definição das colunas
         self.node_cols = [
-            "X", "Y", "Fx", "Fy", "Mz", 
-            "Restr_X", "Restr_Y", "Restr_Rz", "Restr_Rot", 
+            "X", "Y", "Fx", "Fy", "Mz",
+            "Restr_X", "Restr_Y", "Restr_Rz", "Restr_Rot",
             "Disp_X", "Disp_Y", "Disp_Rz"
         ]
-        
+
         self.bar_cols = [
-            "node_i", "node_j", "E", "A", "I", 
+            "node_i", "node_j", "E", "A", "I",
             "Q", "rot_i", "rot_j"
         ]
-        
-        # Criação dos DataFrames vazios
-        self.nodes_df = pd.DataFrame(columns=self.node_cols)
-        self.bars_df = pd.DataFrame(columns=self.bar_cols)
-        
+
+        # Tipos de cada coluna (os mesmos do armazenamento e do formato binário)
+        self.node_dtypes = {
+            "X": np.float64, "Y": np.float64,
+            "Fx": np.float64, "Fy": np.float64, "Mz": np.float64,
+            "Restr_X": np.bool_, "Restr_Y": np.bool_, "Restr_Rz": np.bool_,
+            "Restr_Rot": np.int64,
+            "Disp_X": np.float64, "Disp_Y": np.float64, "Disp_Rz": np.float64
+        }
+
+        self.bar_dtypes = {
+            "node_i": np.int64, "node_j": np.int64,
+            "E": np.float64, "A": np.float64, "I": np.float64,
+            "Q": np.float64, "rot_i": np.bool_, "rot_j": np.bool_
+        }
+
+        # Armazenamento colunar tipado (arrays NumPy que crescem geometricamente)
+        # As modificações são registradas no histórico de desfazer
+        self.nodes = ColumnStore(self.node_dtypes)
+        # Colunas internas das barras (não salvas): barra original e trecho [t0, t1] ocupado nela após subdivisões
+        self.bars = ColumnStore(self.bar_dtypes, extras={
+            "parent": (np.int64, -1), "parent_t0": (np.float64, 0.0), "parent_t1": (np.float64, 1.0)
+        })
+
+        # Índice espacial dos nós (detecção de duplicatas e busca do nó mais próximo)
+        self.node_index = SpatialHash(self._node_coords, self.node_tolerance)
+        # Adjacência nó -> barras (remontada sob demanda quando a conectividade muda)
+        self._adjacency = NodeBarAdjacency()
+
+        self.nodes.recorder = self.bars.recorder = self._record
+        self.history.clear()
+        # Tipos e índices das modificações desde o último aviso (ver ModelChange)
+        self._change = ModelChange()
+
         # Resultados da análise ficam aqui
-        self.analysis_results = None 
+        self.analysis_results = None
+        self.revision = self._next_revision()
+        self._notify(ModelChange.everything())
+
+    def _next_revision(self):
+        self._last_revision += 1
+        return self._last_revision
+
+    def _table(self, store):
+        return "nodes" if store is self.nodes else "bars"
+
+    def _record(self, store, op):
+        self.history.record(store, op, self.revision, self.analysis_results)
+        self._change.add_op(self._table(store), op)
 
     def _reset_results(self):
         """Método interno para invalidar resultados quando algo muda."""
+        if self._batch_depth:
+            self._batch_changed = True  # Adiado para o fim do lote
+            return
         self.analysis_results = None
+        self.revision = self._next_revision()
+        self.history.commit()
+        change, self._change = self._change, ModelChange()
+        self._notify(change)
+
+    def _notify(self, change):
+        """Avisa os ouvintes. Nós movidos também marcam como GEOMETRY as barras ligadas a eles."""
+        if change.affects(ModelChange.GEOMETRY):
+            moved = change.nodes(ModelChange.GEOMETRY)
+            if moved is None or change.affects(ModelChange.TOPOLOGY):
+                change.add(ModelChange.GEOMETRY, "bars")
+            else:
+                change.add(ModelChange.GEOMETRY, "bars", self.adjacency.bars_of_nodes(moved))
+        for callback in list(self._listeners):
+            callback(change)
+
+    # --- DESFAZER / REFAZER ---
+
+    def undo(self):
+        """Desfaz a última modificação (ou lote), restaurando também os resultados daquele estado."""
+        return self._restore(self.history.undo, "Nada para desfazer.", "Modificação desfeita.")
+
+    def redo(self):
+        """Refaz a última modificação desfeita."""
+        return self._restore(self.history.redo, "Nada para refazer.", "Modificação refeita.")
+
+    def _restore(self, step, empty_msg, done_msg):
+        if self._batch_depth:
+            return False, "Não é possível desfazer durante um lote de modificações."
+        state = step(self.revision, self.analysis_results)
+        if state is None: return False, empty_msg
+        self.revision, self.analysis_results, ops = state
+        # As operações reaplicadas descrevem o que mudou, como as modificações originais
+        change = ModelChange()
+        for store, op in ops:
+            change.add_op(self._table(store), op)
+        # O índice espacial só depende das coordenadas e da numeração dos nós
+        moved = change.nodes(ModelChange.GEOMETRY, ModelChange.TOPOLOGY)
+        if moved is None or len(moved):
+            self._rebuild_node_index()
+        self._notify(change)
+        return True, done_msg
+
+    def savepoint(self):
+        """Ponto de retorno dentro de um lote (ver rollback)."""
+        return self.history.mark()
+
+    def rollback(self, savepoint=0):
+        """Desfaz as modificações do lote em andamento feitas depois de savepoint (lote tudo ou nada).
+
+        As modificações revertidas não entram no histórico de desfazer. Se nada mais foi
+        modificado no lote, o fim dele não gera revisão nem aviso.
+        """
+        ops = self.history.rollback(savepoint)
+        change = ModelChange()
+        for store, op in ops:
+            change.add_op(self._table(store), op)
+        moved = change.nodes(ModelChange.GEOMETRY, ModelChange.TOPOLOGY)
+        if moved is None or len(moved):
+            self._rebuild_node_index()
+        if not self.history.mark():
+            self._batch_changed = False
+            self._change = ModelChange()
+
+    # --- AVISOS DE MODIFICAÇÃO ---
+
+    def add_listener(self, callback):
+        """Registra callback(change) para ser chamado após cada modificação (ou lote de modificações).
+
+        change: ModelChange com os tipos e índices de nós/barras afetados.
+        """
+        self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    @contextmanager
+    def batch(self):
+        """Agrupa várias modificações em uma só transação.
+
+        Dentro do bloco, os resultados são invalidados e os ouvintes avisados uma única vez,
+        ao final, em vez de a cada chamada:
+
+            with data_handler.batch():
+                data_handler.update_nodes(storey, {"Y": y + 0.5})
+                data_handler.update_bars(beams, {"Q": -10})
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0 and self._batch_changed:
+                self._batch_changed = False
+                self._reset_results()
+
+    # --- ACESSO AOS DADOS ---
+
+    # DataFrames montados sob demanda a partir das colunas (usados pela interface e pelo plotter)
+    @property
+    def nodes_df(self):
+        return self.nodes.to_frame()
+
+    @nodes_df.setter
+    def nodes_df(self, df):
+        """Substitui a tabela de nós (como load_from_columns: vira um passo do histórico e avisa os ouvintes)."""
+        self.nodes.load(self._frame_columns(df, self.node_dtypes))
+        self._rebuild_node_index()
+        self._reset_results()
+
+    @property
+    def bars_df(self):
+        return self.bars.to_frame()
+
+    @bars_df.setter
+    def bars_df(self, df):
+        """Substitui a tabela de barras (como load_from_columns)."""
+        self.bars.load(self._frame_columns(df, self.bar_dtypes))
+        self._reset_results()
+
+    def _frame_columns(self, df, dtypes):
+        """Extrai colunas tipadas de um DataFrame (valores ausentes viram zero)."""
+        return {col: df[col].fillna(0).to_numpy(dtype=dtype) for col, dtype in dtypes.items()}
+
+    def node_arrays(self):
+        """Colunas dos nós como arrays tipados, sem cópia (entrada do solver)."""
+        return self.nodes.columns()
+
+    def bar_arrays(self):
+        """Colunas das barras como arrays tipados, sem cópia (entrada do solver)."""
+        return self.bars.columns()
+
+    def _node_coords(self):
+        return self.nodes.column("X"), self.nodes.column("Y")
+
+    def _rebuild_node_index(self):
+        """Reconstrói o índice espacial a partir das coordenadas atuais (na próxima consulta)."""
+        self.node_index.rebuild()
+
+    def set_node_tolerance(self, tolerance):
+        """Altera a tolerância de coincidência de nós e reconstrói o índice."""
+        self.node_tolerance = tolerance
+        self.node_index = SpatialHash(self._node_coords, tolerance)
+
+    def find_nearest_node(self, x, y, max_distance=float("inf")):
+        """Retorna (índice, distância) do nó mais próximo de (x, y), ou (None, inf)."""
+        return self.node_index.nearest(x, y, max_distance)
+
+    # --- CONECTIVIDADE ---
+
+    @property
+    def adjacency(self):
+        """Adjacência CSR nó -> barras, sempre coerente com as tabelas atuais."""
+        return self._adjacency.update(self.nodes, self.bars)
+
+    def bars_at_node(self, index):
+        """Índices das barras que chegam no nó, em ordem crescente."""
+        return self.adjacency.bars_of(index).copy()
+
+    def bars_at_nodes(self, indices):
+        """Índices (sem repetição) das barras que chegam em qualquer um dos nós."""
+        return self.adjacency.bars_of_nodes(indices)
+
+    def node_neighbors(self, index):
+        """Nós ligados ao nó por alguma barra."""
+        return self.adjacency.neighbors(index, self.bars.column("node_i"), self.bars.column("node_j"))
+
+    def node_degree(self):
+        """Número de barras em cada nó (0 indica nó solto)."""
+        return self.adjacency.degree()
 
     # --- MÉTODOS PARA NÓS ---
 
     def add_node(self, x, y):
         """Adiciona um novo nó se não houver duplicata na posição."""
         # Verifica se já existe um nó nestas coordenadas
-        for _, row in self.nodes_df.iterrows():
-            if x == row["X"] and y == row["Y"]:
-                return False, "Já existe um Nó na posição selecionada."
-        
-        # Cria dicionário com valores padrão zerados/False
-        new_node = {col: 0 for col in self.node_cols} 
-        new_node["X"] = x
-        new_node["Y"] = y
-        # Ajuste explícito de booleanos para garantir tipo correto
-        new_node["Restr_X"] = False
-        new_node["Restr_Y"] = False
-        new_node["Restr_Rz"] = False
-        
-        self.nodes_df.loc[len(self.nodes_df)] = new_node
+        if self.node_index.find(x, y) is not None:
+            return False, "Já existe um Nó na posição selecionada."
+
+        # Demais colunas (cargas, restrições, deslocamentos) ficam zeradas/False
+        index = self.nodes.append({"X": x, "Y": y})
+        self.node_index.insert(index, x, y)
         self._reset_results()
         return True, "Nó adicionado com sucesso."
 
     def update_node_coords(self, index, x, y):
         """Atualiza as coordenadas X, Y de um nó existente."""
-        if 0 <= index < len(self.nodes_df):
+        if 0 <= index < len(self.nodes):
             # Verifica colisão com outros nós (exceto ele mesmo)
-            for i, row in self.nodes_df.iterrows():
-                if i != index and x == row["X"] and y == row["Y"]:
-                     return False, "Já existe outro Nó nesta posição."
+            if self.node_index.find(x, y, exclude=index) is not None:
+                return False, "Já existe outro Nó nesta posição."
 
-            self.nodes_df.loc[index, "X"] = x
-            self.nodes_df.loc[index, "Y"] = y
+            self.node_index.move(index, x, y)
+            self.nodes.set(index, {"X": x, "Y": y})
             self._reset_results()
             return True, "Nó atualizado."
         return False, "Índice inválido."
 
     def delete_node(self, index):
-        """Deleta um nó e reseta o índice."""
-        if 0 <= index < len(self.nodes_df):
-            self.nodes_df = self.nodes_df.drop(index=index).reset_index(drop=True)
+        """Deleta um nó, as barras ligadas a ele, e renumera os restantes."""
+        if 0 <= index < len(self.nodes):
+            num_bars = self._delete_nodes_cascade(np.array([index]))
             self._reset_results()
+            if num_bars: return True, f"Nó deletado (e {num_bars} barra(s) ligada(s) a ele)."
             return True, "Nó deletado."
         return False, "Índice inválido."
 
     def update_nodal_loads(self, index, fx, fy, mz):
         """Atualiza cargas nodais."""
-        if 0 <= index < len(self.nodes_df):
-            self.nodes_df.loc[index, ["Fx", "Fy", "Mz"]] = [fx, fy, mz]
+        if 0 <= index < len(self.nodes):
+            self.nodes.set(index, {"Fx": fx, "Fy": fy, "Mz": mz})
             self._reset_results()
             return True
         return False
 
     def update_supports(self, index, restr_x, restr_y, restr_rz, restr_rot):
         """Atualiza condições de apoio (restrições e rotação)."""
-        if 0 <= index < len(self.nodes_df):
-            self.nodes_df.loc[index, ["Restr_X", "Restr_Y", "Restr_Rz", "Restr_Rot"]] = [restr_x, restr_y, restr_rz, restr_rot]
+        if 0 <= index < len(self.nodes):
+            self.nodes.set(index, {"Restr_X": restr_x, "Restr_Y": restr_y, "Restr_Rz": restr_rz, "Restr_Rot": restr_rot})
             self._reset_results()
             return True
         return False
 
     def update_prescribed_displacements(self, index, dx, dy, drz):
         """Atualiza deslocamentos prescritos."""
-        if 0 <= index < len(self.nodes_df):
-            self.nodes_df.loc[index, ["Disp_X", "Disp_Y", "Disp_Rz"]] = [dx, dy, drz]
+        if 0 <= index < len(self.nodes):
+            self.nodes.set(index, {"Disp_X": dx, "Disp_Y": dy, "Disp_Rz": drz})
             self._reset_results()
             return True
         return False
@@ -104,44 +332,251 @@ class DataHandler:
         # Validação simples
         if data_dict['node_i'] == data_dict['node_j']:
             return False, "A barra deve conectar nós diferentes."
-        
+
         # Garante que as chaves batam com as colunas
         new_row = {k: data_dict.get(k, 0) for k in self.bar_cols}
-        
-        self.bars_df.loc[len(self.bars_df)] = new_row
+
+        self.bars.append(new_row)
         self._reset_results()
         return True, "Barra adicionada."
 
     def update_bar(self, index, data_dict):
         """Atualiza propriedades físicas e conectividade da barra."""
-        if 0 <= index < len(self.bars_df):
+        if 0 <= index < len(self.bars):
              if data_dict['node_i'] == data_dict['node_j']:
                 return False, "A barra deve conectar nós diferentes."
-             
-             for key, value in data_dict.items():
-                 if key in self.bar_cols:
-                     self.bars_df.loc[index, key] = value
-             
+
+             self.bars.set(index, {key: value for key, value in data_dict.items() if key in self.bar_cols})
+
              self._reset_results()
              return True, "Barra atualizada."
         return False, "Índice inválido."
 
     def delete_bar(self, index):
         """Deleta uma barra."""
-        if 0 <= index < len(self.bars_df):
-            self.bars_df = self.bars_df.drop(index=index).reset_index(drop=True)
+        if 0 <= index < len(self.bars):
+            self.bars.delete([index])
             self._reset_results()
             return True
         return False
 
     def update_bar_load(self, index, q):
         """Atualiza carga distribuída da barra."""
-        if 0 <= index < len(self.bars_df):
-            self.bars_df.loc[index, "Q"] = q
+        if 0 <= index < len(self.bars):
+            self.bars.set(index, {"Q": q})
             self._reset_results()
             return True
         return False
 
+    # --- MÉTODOS EM LOTE (ÍNDICES E VALORES EM ARRAYS) ---
+
+    def _build_columns(self, columns, dtypes, defaults=None):
+        """Monta colunas tipadas completas; colunas ausentes recebem o valor padrão (ou zero)."""
+        defaults = defaults or {}
+        size = len(next(iter(columns.values()))) if columns else 0
+        return {
+            col: np.asarray(columns[col], dtype=dtype) if col in columns else np.full(size, defaults.get(col, 0), dtype=dtype)
+            for col, dtype in dtypes.items()
+        }
+
+    def add_nodes(self, columns):
+        """Adiciona vários nós de uma vez a partir de colunas ({"X": array, "Y": array, ...})."""
+        new_nodes = self._build_columns(columns, self.node_dtypes)
+        if len(new_nodes["X"]) == 0: return True, "Nenhum nó adicionado."
+
+        # Duplicatas (entre si e com os nós existentes) verificadas de uma vez, por grade ordenada
+        duplicated = self.node_index.find_many(new_nodes["X"], new_nodes["Y"])
+        if len(duplicated):
+            rows = duplicated[:5] + 1
+            return False, f"Nós em posições já ocupadas (linhas {', '.join(map(str, rows))}...)."
+
+        self.nodes.extend(new_nodes)
+        self._rebuild_node_index()
+        self._reset_results()
+        return True, f"{len(new_nodes['X'])} nós adicionados."
+
+    def add_bars(self, columns, defaults=None):
+        """Adiciona várias barras de uma vez a partir de colunas (índices de nós 0-based)."""
+        new_bars = self._build_columns(columns, self.bar_dtypes, defaults)
+        if len(new_bars["node_i"]) == 0: return True, "Nenhuma barra adicionada."
+
+        node_i, node_j = new_bars["node_i"], new_bars["node_j"]
+        invalid = (node_i == node_j) | (node_i < 0) | (node_j < 0) | (node_i >= len(self.nodes)) | (node_j >= len(self.nodes))
+        if invalid.any():
+            rows = np.flatnonzero(invalid)[:5] + 1
+            return False, f"Barras com nós inexistentes ou repetidos (linhas {', '.join(map(str, rows))}...)."
+
+        self.bars.extend(new_bars)
+        self._reset_results()
+        return True, f"{len(node_i)} barras adicionadas."
+
+    def update_nodes(self, indices, columns):
+        """Atualiza colunas de vários nós de uma vez (coordenadas, apoios, cargas, deslocamentos...).
+
+        columns: {coluna: valor único ou array com um valor por índice}.
+        """
+        return self._update_rows(self.nodes, indices, columns, "Nós")
+
+    def update_bars(self, indices, columns):
+        """Atualiza colunas de várias barras de uma vez (conectividade, propriedades, cargas...)."""
+        return self._update_rows(self.bars, indices, columns, "Barras")
+
+    def delete_nodes(self, indices):
+        """Deleta vários nós de uma vez, junto com as barras ligadas a eles, e renumera os restantes."""
+        return self._delete_rows(self.nodes, indices, "Nós")
+
+    def delete_bars(self, indices):
+        """Deleta várias barras de uma vez e renumera as restantes."""
+        return self._delete_rows(self.bars, indices, "Barras")
+
+    def _check_indices(self, store, indices, label):
+        indices = np.asarray(indices, dtype=np.int64).ravel()
+        invalid = (indices < 0) | (indices >= len(store))
+        if invalid.any():
+            rows = np.flatnonzero(invalid)[:5] + 1
+            return None, f"{label} inexistentes (linhas {', '.join(map(str, rows))}...)."
+        if len(np.unique(indices)) != len(indices):
+            return None, f"{label} repetidos na lista de índices."
+        return indices, ""
+
+    def _update_rows(self, store, indices, columns, label):
+        indices, msg = self._check_indices(store, indices, label)
+        if indices is None: return False, msg
+
+        unknown = [col for col in columns if col not in store.dtypes]
+        if unknown:
+            return False, f"Colunas desconhecidas: {', '.join(unknown)}."
+
+        # Valores únicos são repetidos para todos os índices
+        columns = {col: np.broadcast_to(np.asarray(values, dtype=store.dtypes[col]), indices.shape) for col, values in columns.items()}
+
+        # Validação completa antes de escrever (tudo ou nada)
+        if store is self.bars and ("node_i" in columns or "node_j" in columns):
+            node_i = columns.get("node_i", self.bars.column("node_i")[indices])
+            node_j = columns.get("node_j", self.bars.column("node_j")[indices])
+            invalid = (node_i == node_j) | (node_i < 0) | (node_j < 0) | (node_i >= len(self.nodes)) | (node_j >= len(self.nodes))
+            if invalid.any():
+                return False, f"Barra {indices[np.argmax(invalid)] + 1} ficaria com nós inexistentes ou repetidos."
+
+        moved = store is self.nodes and ("X" in columns or "Y" in columns)
+        if moved:
+            # Colisões com os demais nós e entre os próprios nós movidos, verificadas de uma vez
+            new_x = columns.get("X", self.nodes.column("X")[indices])
+            new_y = columns.get("Y", self.nodes.column("Y")[indices])
+            collisions = self.node_index.find_many(new_x, new_y, exclude=indices)
+            if len(collisions):
+                return False, f"O Nó {indices[collisions[0]] + 1} ficaria na posição de outro nó."
+
+        store.set(indices, columns)
+        if moved: self._rebuild_node_index()
+        self._reset_results()
+        return True, f"{len(indices)} registros atualizados."
+
+    def _delete_rows(self, store, indices, label):
+        indices, msg = self._check_indices(store, indices, label)
+        if indices is None: return False, msg
+        if len(indices) == 0: return True, "Nenhum registro deletado."
+
+        if store is self.nodes:
+            num_bars = self._delete_nodes_cascade(indices)
+            self._reset_results()
+            return True, f"{len(indices)} nós e {num_bars} barras deletados."
+
+        store.delete(indices)
+        self._reset_results()
+        return True, f"{len(indices)} registros deletados."
+
+    def _delete_nodes_cascade(self, indices):
+        """Remove os nós, as barras incidentes e corrige node_i/node_j. Retorna o nº de barras removidas."""
+        incident = self.adjacency.bars_of_nodes(indices)
+        if len(incident):
+            self.bars.delete(incident)
+
+        # Novo número de cada nó após a compactação (nós removidos ficam com -1)
+        keep = np.ones(len(self.nodes), dtype=bool)
+        keep[indices] = False
+        new_index = np.where(keep, np.cumsum(keep) - 1, -1)
+        self.nodes.delete(indices)
+        if len(self.bars):
+            # Referências já inválidas (arquivos antigos) também viram -1
+            remap = lambda ref: np.where((ref >= 0) & (ref < len(new_index)), new_index[np.clip(ref, 0, len(new_index) - 1)], -1)
+            self.bars.set(slice(None), {
+                "node_i": remap(self.bars.column("node_i")),
+                "node_j": remap(self.bars.column("node_j")),
+            })
+        self.node_index.renumber(keep)  # A renumeração desloca os índices seguintes
+        return len(incident)
+
+    # --- SUBDIVISÃO DE BARRAS ---
+
+    def subdivide_bars(self, indices=None, num_segments=2):
+        """Divide as barras dadas (todas, se None) em num_segments trechos iguais.
+
+        Os nós internos são criados de uma vez; cada trecho herda E, A, I e Q, a rótula
+        inicial fica no primeiro trecho e a final no último. O primeiro trecho ocupa a linha
+        da barra original e os demais vão para o fim da tabela, de modo que a numeração das
+        barras existentes não muda. A origem de cada trecho fica em bar_parents().
+        """
+        if num_segments < 2:
+            return False, "Informe pelo menos 2 trechos por barra."
+        indices, msg = self._check_indices(self.bars, np.arange(len(self.bars)) if indices is None else indices, "Barras")
+        if indices is None: return False, msg
+        if len(indices) == 0: return True, "Nenhuma barra subdividida."
+
+        m, n = len(indices), num_segments
+        node_i = self.bars.column("node_i")[indices]
+        node_j = self.bars.column("node_j")[indices]
+        X, Y = self.nodes.column("X"), self.nodes.column("Y")
+        t = np.arange(1, n) / n
+
+        # Cadeia de nós de cada barra: [node_i, internos..., node_j] -> trechos consecutivos
+        internal = len(self.nodes) + np.arange(m * (n - 1)).reshape(m, n - 1)
+        chain = np.column_stack([node_i, internal, node_j])
+
+        # Posição de cada trecho na barra original (acumulada com subdivisões anteriores)
+        parent = self.bars.column("parent")[indices]
+        t0 = self.bars.column("parent_t0")[indices]
+        t1 = self.bars.column("parent_t1")[indices]
+        fractions = t0[:, np.newaxis] + (t1 - t0)[:, np.newaxis] * np.arange(n + 1) / n
+
+        segments = {col: np.repeat(self.bars.column(col)[indices], n).reshape(m, n) for col in ("E", "A", "I", "Q")}
+        segments["node_i"], segments["node_j"] = chain[:, :-1], chain[:, 1:]
+        segments["rot_i"] = np.zeros((m, n), dtype=bool)
+        segments["rot_j"] = np.zeros((m, n), dtype=bool)
+        segments["rot_i"][:, 0] = self.bars.column("rot_i")[indices]
+        segments["rot_j"][:, -1] = self.bars.column("rot_j")[indices]
+        segments["parent"] = np.repeat(np.where(parent >= 0, parent, indices), n).reshape(m, n)
+        segments["parent_t0"], segments["parent_t1"] = fractions[:, :-1], fractions[:, 1:]
+
+        with self.batch():
+            success, msg = self.add_nodes({
+                "X": (X[node_i][:, np.newaxis] + (X[node_j] - X[node_i])[:, np.newaxis] * t).ravel(),
+                "Y": (Y[node_i][:, np.newaxis] + (Y[node_j] - Y[node_i])[:, np.newaxis] * t).ravel(),
+            })
+            if not success:
+                return False, f"Não foi possível criar os nós internos: {msg}"
+            self.bars.set(indices, {col: values[:, 0] for col, values in segments.items()})
+            self.bars.extend({col: values[:, 1:].ravel() for col, values in segments.items()})
+            self._reset_results()
+        return True, f"{m} barras divididas em {n} trechos ({m * (n - 1)} nós criados)."
+
+    def is_subdivided(self):
+        return bool((self.bars.column("parent") >= 0).any())
+
+    def bar_parents(self):
+        """Origem de cada barra: {"parent": barra original, "t0"/"t1": trecho ocupado nela (0 a 1)}.
+
+        Barras nunca subdivididas são a sua própria origem, com trecho [0, 1]. A informação vale
+        para a sessão atual (não é salva no arquivo).
+        """
+        size = len(self.bars)
+        parent = self.bars.arrays["parent"][:size]
+        return {
+            "parent": np.where(parent >= 0, parent, np.arange(size)),
+            "t0": self.bars.arrays["parent_t0"][:size].copy(),
+            "t1": self.bars.arrays["parent_t1"][:size].copy(),
+        }
+
     # --- MÉTODOS DE ARQUIVO (IO) ---
 
     def get_dict_data(self):
@@ -152,11 +587,38 @@ class DataHandler:
         }
 
     def load_from_dict(self, data):
-        """Carrega DataFrames a partir de dicionário (JSON carregado)."""
+        """Carrega as tabelas a partir de dicionário (JSON carregado)."""
+        try:
+            nodes_df = pd.DataFrame.from_records(data['nodes'], columns=self.node_cols)
+            bars_df = pd.DataFrame.from_records(data['bars'], columns=self.bar_cols)
+            nodes = self._frame_columns(nodes_df, self.node_dtypes)
+            bars = self._frame_columns(bars_df, self.bar_dtypes)
+            self.nodes.load(nodes)
+            self.bars.load(bars)
+            self._rebuild_node_index()
+            self._reset_results()
+            return True, "Dados carregados com sucesso."
+        except Exception as e:
+            return False, str(e)
+
+    def get_column_data(self):
+        """Retorna uma cópia dos dados como colunas tipadas (arrays NumPy contíguos).
+
+        Por ser uma cópia, pode ser usada como snapshot e gravada em outra thread.
+        """
+        nodes = {col: values.copy() for col, values in self.nodes.columns().items()}
+        bars = {col: values.copy() for col, values in self.bars.columns().items()}
+        return {"nodes": nodes, "bars": bars}
+
+    def load_from_columns(self, data):
+        """Carrega as tabelas a partir de colunas (formato binário ou leitura em blocos)."""
         try:
-            self.nodes_df = pd.DataFrame.from_records(data['nodes'], columns=self.node_cols)
-            self.bars_df = pd.DataFrame.from_records(data['bars'], columns=self.bar_cols)
+            nodes = {col: np.asarray(data['nodes'][col], dtype=dtype) for col, dtype in self.node_dtypes.items()}
+            bars = {col: np.asarray(data['bars'][col], dtype=dtype) for col, dtype in self.bar_dtypes.items()}
+            self.nodes.load(nodes)
+            self.bars.load(bars)
+            self._rebuild_node_index()
             self._reset_results()
             return True, "Dados carregados com sucesso."
         except Exception as e:
-            return False, str(e)
\ No newline at end of file
+            return False, str(e)
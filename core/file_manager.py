@@ -1,10 +1,94 @@
+import gzip
+import io
 import json
+import lzma
+import mmap
+import os
+import struct
+import numpy as np
+
+# Leitor incremental de JSON: consome o arquivo em blocos de texto e decodifica um valor por vez
+class _JsonStreamReader:
+    def __init__(self, f, block_size, progress_callback=None):
+        self.f = f
+        self.block_size = block_size
+        self.progress_callback = progress_callback
+        self.decoder = json.JSONDecoder()
+        self.buf = ""
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self):
+        data = self.f.read(self.block_size)
+        if not data:
+            self.eof = True
+        else:
+            self.buf = self.buf[self.pos:] + data
+            self.pos = 0
+        if self.progress_callback: self.progress_callback()
+
+    def peek(self):
+        """Retorna o próximo caractere não-branco (sem consumi-lo) ou '' no fim do arquivo."""
+        while True:
+            while self.pos < len(self.buf) and self.buf[self.pos] in " \t\r\n":
+                self.pos += 1
+            if self.pos < len(self.buf): return self.buf[self.pos]
+            if self.eof: return ""
+            self._fill()
+
+    def expect(self, char):
+        if self.peek() != char:
+            raise ValueError(f"JSON inválido: esperado '{char}' na posição {self.pos}.")
+        self.pos += 1
+
+    def value(self):
+        """Decodifica o próximo valor JSON completo, lendo mais blocos se necessário."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self.decoder.raw_decode(self.buf, self.pos)
+                # Um número no fim do buffer pode estar truncado: só aceita se houver mais texto depois
+                if end == len(self.buf) and not self.eof:
+                    self._fill()
+                    continue
+                self.pos = end
+                return obj
+            except json.JSONDecodeError:
+                if self.eof: raise
+                self._fill()
 
 class FileManager:
+    # Formato binário colunar (.stxb):
+    #   [MAGIC (8 bytes)] [tamanho do cabeçalho (uint64)] [cabeçalho JSON] [colunas alinhadas]
+    # O cabeçalho descreve, para cada tabela, o número de linhas e o nome, tipo e offset de cada coluna.
+    BINARY_EXTENSION = ".stxb"
+    BINARY_MAGIC = b"STXB0001"
+    BINARY_ALIGN = 64
+
+    # Leitura/escrita em blocos do .stx (JSON), com compressão opcional pela extensão (.gz / .xz)
+    STREAM_CHUNK_ROWS = 10000
+    STREAM_BLOCK_SIZE = 1 << 20
+
+    @staticmethod
+    def _open_text(filepath, mode, raw=None):
+        """Abre o arquivo em modo texto, comprimindo/descomprimindo de forma transparente.
+
+        raw: arquivo binário já aberto (permite acompanhar o progresso pela posição em disco).
+        """
+        lower = str(filepath).lower()
+        source = filepath if raw is None else raw
+        if lower.endswith(".gz"):
+            stream = gzip.open(source, mode + 'b')
+        elif lower.endswith(".xz"):
+            stream = lzma.open(source, mode + 'b')
+        else:
+            stream = open(filepath, mode + 'b') if raw is None else raw
+        return io.TextIOWrapper(stream, encoding='utf-8')
+
     @staticmethod
     def save_file(filepath, data_dict):
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
+            with FileManager._open_text(filepath, 'w') as f:
                 json.dump(data_dict, f, ensure_ascii=False, indent=4)
             return True, "Arquivo salvo com sucesso!"
         except Exception as e:
@@ -13,8 +97,227 @@ class FileManager:
     @staticmethod
     def load_file(filepath):
         try:
-            with open(filepath, 'r', encoding='utf-8') as f:
+            with FileManager._open_text(filepath, 'r') as f:
                 data = json.load(f)
             return True, data
         except Exception as e:
-            return False, str(e)
\ No newline at end of file
+            return False, str(e)
+
+    @staticmethod
+    def save_file_stream(filepath, column_data, chunk_rows=None):
+        """Salva colunas {"nodes": {...}, "bars": {...}} como .stx, serializando poucas linhas por vez.
+
+        O arquivo gerado é o mesmo JSON de registros lido por load_file (um registro por linha).
+        """
+        chunk_rows = chunk_rows or FileManager.STREAM_CHUNK_ROWS
+        try:
+            with FileManager._open_text(filepath, 'w') as f:
+                f.write("{")
+                for t, (table_name, columns) in enumerate(column_data.items()):
+                    names = list(columns.keys())
+                    rows = len(columns[names[0]]) if names else 0
+                    f.write(",\n" if t else "\n")
+                    f.write(f"{json.dumps(table_name)}: [")
+                    for start in range(0, rows, chunk_rows):
+                        stop = min(start + chunk_rows, rows)
+                        # Converte apenas o bloco atual para tipos nativos do Python
+                        chunk = zip(*(np.asarray(columns[name][start:stop]).tolist() for name in names))
+                        text = ",\n".join(json.dumps(dict(zip(names, row)), ensure_ascii=False) for row in chunk)
+                        f.write(",\n" if start else "\n")
+                        f.write(text)
+                    f.write("\n]")
+                f.write("\n}\n")
+            return True, "Arquivo salvo com sucesso!"
+        except Exception as e:
+            return False, str(e)
+
+    @staticmethod
+    def load_file_stream(filepath, dtypes=None, chunk_rows=None, progress_callback=None):
+        """Lê um .stx em blocos, acumulando os registros diretamente em colunas NumPy.
+
+        dtypes: {"nodes": {col: dtype}, "bars": {...}} opcional; sem ele os tipos são inferidos.
+        progress_callback: função opcional chamada com a fração (0 a 1) do arquivo já lida.
+        Retorna {"nodes": {col: array}, "bars": {...}} no mesmo formato de load_binary_file.
+        """
+        chunk_rows = chunk_rows or FileManager.STREAM_CHUNK_ROWS
+        dtypes = dtypes or {}
+        try:
+            raw = open(filepath, 'rb')
+            total_size = max(os.path.getsize(filepath), 1)
+            report = (lambda: progress_callback(min(raw.tell() / total_size, 1.0))) if progress_callback else None
+            with raw, FileManager._open_text(filepath, 'r', raw) as f:
+                reader = _JsonStreamReader(f, FileManager.STREAM_BLOCK_SIZE, report)
+                data = {}
+                reader.expect("{")
+                while reader.peek() != "}":
+                    if data: reader.expect(",")
+                    key = reader.value()
+                    reader.expect(":")
+                    if reader.peek() != "[":
+                        reader.value()  # Valor que não é tabela: ignorado
+                        data.setdefault(key, None)
+                        continue
+
+                    table_dtypes = dtypes.get(key, {})
+                    column_chunks = {col: [] for col in table_dtypes}
+                    records = []
+
+                    def flush():
+                        names = list(column_chunks.keys()) or list(records[0].keys())
+                        for name in names:
+                            values = [record.get(name, 0) for record in records]
+                            column_chunks.setdefault(name, []).append(np.array(values, dtype=table_dtypes.get(name)))
+                        records.clear()
+
+                    reader.expect("[")
+                    first = True
+                    while reader.peek() != "]":
+                        if not first: reader.expect(",")
+                        first = False
+                        records.append(reader.value())
+                        if len(records) >= chunk_rows: flush()
+                    reader.expect("]")
+                    if records: flush()
+
+                    data[key] = {
+                        name: np.concatenate(chunks) if chunks else np.empty(0, dtype=table_dtypes.get(name, np.float64))
+                        for name, chunks in column_chunks.items()
+                    }
+                reader.expect("}")
+            return True, {key: value for key, value in data.items() if value is not None}
+        except Exception as e:
+            return False, str(e)
+
+    # --- FORMATO BINÁRIO COLUNAR ---
+
+    @staticmethod
+    def is_binary_file(filepath):
+        return str(filepath).lower().endswith(FileManager.BINARY_EXTENSION)
+
+    @staticmethod
+    def _align(offset):
+        return -(-offset // FileManager.BINARY_ALIGN) * FileManager.BINARY_ALIGN
+
+    @staticmethod
+    def save_binary_file(filepath, column_data):
+        """Salva {"nodes": {col: array}, "bars": {col: array}} como colunas contíguas tipadas."""
+        try:
+            tables = {}
+            blocks = []
+            # Primeiro monta o cabeçalho com offsets relativos ao início da área de dados
+            offset = 0
+            for table_name, columns in column_data.items():
+                columns = {name: np.ascontiguousarray(values) for name, values in columns.items()}
+                rows = len(next(iter(columns.values()))) if columns else 0
+                table_header = {"rows": rows, "columns": []}
+                for name, values in columns.items():
+                    if len(values) != rows:
+                        raise ValueError(f"Coluna '{name}' da tabela '{table_name}' tem tamanho inconsistente.")
+                    offset = FileManager._align(offset)
+                    table_header["columns"].append({"name": name, "dtype": values.dtype.str, "offset": offset})
+                    blocks.append((offset, values))
+                    offset += values.nbytes
+                tables[table_name] = table_header
+
+            header = json.dumps({"version": 1, "tables": tables}, ensure_ascii=False).encode('utf-8')
+            data_start = FileManager._align(len(FileManager.BINARY_MAGIC) + 8 + len(header))
+
+            with open(filepath, 'wb') as f:
+                f.write(FileManager.BINARY_MAGIC)
+                f.write(struct.pack('<Q', len(header)))
+                f.write(header)
+                for block_offset, values in blocks:
+                    f.seek(data_start + block_offset)
+                    f.write(values.tobytes())
+                f.truncate(data_start + offset)
+            return True, "Arquivo salvo com sucesso!"
+        except Exception as e:
+            return False, str(e)
+
+    @staticmethod
+    def load_binary_file(filepath, copy=False):
+        """Lê um arquivo .stxb via memory mapping.
+
+        Com copy=False as colunas são views somente-leitura sobre o arquivo mapeado,
+        sem criar nenhum objeto Python por linha.
+        """
+        try:
+            with open(filepath, 'rb') as f:
+                if f.read(len(FileManager.BINARY_MAGIC)) != FileManager.BINARY_MAGIC:
+                    raise ValueError("Arquivo não está no formato binário do StruTrix.")
+                header_len = struct.unpack('<Q', f.read(8))[0]
+                header = json.loads(f.read(header_len).decode('utf-8'))
+                data_start = FileManager._align(len(FileManager.BINARY_MAGIC) + 8 + header_len)
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+            data = {}
+            for table_name, table_header in header["tables"].items():
+                rows = table_header["rows"]
+                columns = {}
+                for column in table_header["columns"]:
+                    dtype = np.dtype(column["dtype"])
+                    if rows == 0:
+                        values = np.empty(0, dtype=dtype)
+                    else:
+                        values = np.frombuffer(buffer, dtype=dtype, count=rows, offset=data_start + column["offset"])
+                    columns[column["name"]] = values.copy() if copy else values
+                data[table_name] = columns
+            return True, data
+        except Exception as e:
+            return False, str(e)
+
+    # --- CONVERSÃO ENTRE FORMATOS ---
+
+    @staticmethod
+    def convert_file(source_path, target_path):
+        """Converte entre .stx (JSON) e .stxb (binário), escolhendo o formato pela extensão."""
+        from core.data_handler import DataHandler
+
+        handler = DataHandler()
+        if FileManager.is_binary_file(source_path):
+            success, data = FileManager.load_binary_file(source_path)
+            if not success: return False, data
+            success, msg = handler.load_from_columns(data)
+        else:
+            success, data = FileManager.load_file(source_path)
+            if not success: return False, data
+            success, msg = handler.load_from_dict(data)
+        if not success: return False, msg
+
+        if FileManager.is_binary_file(target_path):
+            return FileManager.save_binary_file(target_path, handler.get_column_data())
+        return FileManager.save_file(target_path, handler.get_dict_data())
+
+    # --- PROJETO (ESCOLHA DO FORMATO PELA EXTENSÃO) ---
+
+    @staticmethod
+    def save_project(filepath, column_data, progress_callback=None):
+        """Salva colunas no formato indicado pela extensão, de forma atômica.
+
+        Escreve em um arquivo temporário na mesma pasta e só então o renomeia sobre o destino,
+        de modo que uma falha no meio da escrita nunca corrompe o arquivo anterior.
+        """
+        directory, name = os.path.split(os.path.abspath(filepath))
+        temp_path = os.path.join(directory, f"~{name}")  # Mantém a extensão (.gz/.xz/.stxb)
+        if FileManager.is_binary_file(filepath):
+            success, msg = FileManager.save_binary_file(temp_path, column_data)
+        else:
+            success, msg = FileManager.save_file_stream(temp_path, column_data)
+        try:
+            if success:
+                os.replace(temp_path, filepath)
+            elif os.path.exists(temp_path):
+                os.remove(temp_path)
+        except Exception as e:
+            return False, str(e)
+        if progress_callback: progress_callback(1.0)
+        return success, msg
+
+    @staticmethod
+    def load_project(filepath, dtypes=None, progress_callback=None):
+        """Lê um projeto (.stx, .stx.gz, .stx.xz ou .stxb) e retorna suas colunas."""
+        if FileManager.is_binary_file(filepath):
+            success, data = FileManager.load_binary_file(filepath)
+            if progress_callback: progress_callback(1.0)
+            return success, data
+        return FileManager.load_file_stream(filepath, dtypes, progress_callback=progress_callback)
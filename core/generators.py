@@ -0,0 +1,182 @@
+import numpy as np
+
+class ModelGenerator:
+    """Geradores paramétricos de modelos (pórticos, treliças, vigas contínuas e arcos).
+
+    Todos montam as colunas de nós e barras de uma vez com NumPy e carregam o resultado
+    no DataHandler com load_from_columns (sem inserção linha a linha). Retornam
+    (sucesso, mensagem), como os demais métodos do DataHandler.
+    """
+
+    # Seção padrão (mesmos valores do formulário da aba Barras)
+    SECTION = {"E": 200e6, "A": 0.01, "I": 8e-5}
+
+    SUPPORTS = ("fixed", "pinned", "roller")
+    TRUSS_TYPES = ("pratt", "howe", "warren")
+    ARCH_SHAPES = ("parabolic", "circular")
+
+    # --- AUXILIARES ---
+
+    @staticmethod
+    def _empty(dtypes, size):
+        return {col: np.zeros(size, dtype=dtype) for col, dtype in dtypes.items()}
+
+    @staticmethod
+    def _load(data_handler, x, y, node_i, node_j, section=None, **bar_values):
+        """Monta as colunas completas e carrega no handler. bar_values: colunas extras das barras."""
+        nodes = ModelGenerator._empty(data_handler.node_dtypes, len(x))
+        nodes["X"][:] = x
+        nodes["Y"][:] = y
+
+        bars = ModelGenerator._empty(data_handler.bar_dtypes, len(node_i))
+        bars["node_i"][:] = node_i
+        bars["node_j"][:] = node_j
+        for col, value in {**ModelGenerator.SECTION, **(section or {}), **bar_values}.items():
+            bars[col][:] = value
+        return nodes, bars
+
+    @staticmethod
+    def _support(nodes, indices, kind):
+        """kind: "fixed" (engaste), "pinned" (2º gênero) ou "roller" (1º gênero, restringe Y)."""
+        nodes["Restr_Y"][indices] = True
+        if kind != "roller": nodes["Restr_X"][indices] = True
+        if kind == "fixed": nodes["Restr_Rz"][indices] = True
+
+    @staticmethod
+    def _finish(data_handler, nodes, bars, label):
+        success, msg = data_handler.load_from_columns({"nodes": nodes, "bars": bars})
+        if not success: return False, msg
+        return True, f"Modelo gerado ({label}): {len(nodes['X'])} nós e {len(bars['node_i'])} barras."
+
+    # --- GERADORES ---
+
+    @staticmethod
+    def frame(data_handler, num_storeys, num_bays, storey_height=3.0, bay_width=4.0,
+              column_section=None, beam_section=None, beam_load=0.0, beam_hinges=False, support="fixed"):
+        """Pórtico retangular com num_storeys andares e num_bays vãos (também serve como grade).
+
+        Nós numerados por pavimento, da esquerda para a direita (o térreo primeiro).
+        beam_load: carga distribuída Q nas vigas (negativa para baixo).
+        beam_hinges: vigas rotuladas nas duas extremidades.
+        """
+        if num_storeys < 1 or num_bays < 1:
+            return False, "O pórtico precisa de pelo menos 1 andar e 1 vão."
+        if support not in ModelGenerator.SUPPORTS:
+            return False, f"Tipo de apoio desconhecido: {support}."
+        cols = num_bays + 1
+        level, col = np.divmod(np.arange((num_storeys + 1) * cols), cols)
+
+        # Pilares: nó de cada pavimento ao nó acima; vigas: nó ao vizinho da direita (a partir do 1º andar)
+        column_i = np.arange(num_storeys * cols)
+        beam_i = (np.arange(1, num_storeys + 1)[:, np.newaxis] * cols + np.arange(num_bays)).ravel()
+        is_beam = np.repeat([False, True], [len(column_i), len(beam_i)])
+
+        nodes, bars = ModelGenerator._load(data_handler, col * float(bay_width), level * float(storey_height),
+                                           np.concatenate([column_i, beam_i]),
+                                           np.concatenate([column_i + cols, beam_i + 1]),
+                                           column_section)
+        for key, value in {**ModelGenerator.SECTION, **(beam_section or {})}.items():
+            bars[key][is_beam] = value
+        bars["Q"][is_beam] = beam_load
+        bars["rot_i"][is_beam] = bars["rot_j"][is_beam] = beam_hinges
+        ModelGenerator._support(nodes, np.arange(cols), support)
+        return ModelGenerator._finish(data_handler, nodes, bars, "Pórtico")
+
+    @staticmethod
+    def truss(data_handler, kind, num_panels, span, height, section=None, node_load=0.0):
+        """Treliça de banzos paralelos (Pratt, Howe ou Warren) com apoio fixo à esquerda e móvel à direita.
+
+        Todas as barras são rotuladas nas duas extremidades.
+        node_load: força Fy aplicada em cada nó interno do banzo inferior (negativa para baixo).
+        """
+        kind = kind.lower()
+        if kind not in ModelGenerator.TRUSS_TYPES:
+            return False, f"Tipo de treliça desconhecido: {kind}."
+        if num_panels < 2:
+            return False, "A treliça precisa de pelo menos 2 painéis."
+        n = num_panels
+        panel = span / n
+        bottom = np.arange(n + 1)  # Nós do banzo inferior: 0..n
+
+        if kind == "warren":
+            # Banzo superior com nós no meio de cada painel; diagonais alternadas, sem montantes
+            top = n + 1 + np.arange(n)
+            x = np.concatenate([bottom * panel, (np.arange(n) + 0.5) * panel])
+            y = np.concatenate([np.zeros(n + 1), np.full(n, float(height))])
+            node_i = np.concatenate([bottom[:-1], top[:-1], bottom[:-1], top])
+            node_j = np.concatenate([bottom[1:], top[1:], top, bottom[1:]])
+        else:
+            # Banzo superior sobre cada nó inferior, montantes em todos os nós
+            top = n + 1 + bottom
+            x = np.concatenate([bottom * panel, bottom * panel])
+            y = np.concatenate([np.zeros(n + 1), np.full(n + 1, float(height))])
+            # Diagonais: Pratt descem em direção ao centro (tracionadas), Howe sobem
+            k = np.arange(n)
+            left = (k + 0.5) < n / 2
+            descending = left if kind == "pratt" else ~left
+            diag_i = np.where(descending, top[k], bottom[k])
+            diag_j = np.where(descending, bottom[k + 1], top[k + 1])
+            node_i = np.concatenate([bottom[:-1], top[:-1], bottom, diag_i])
+            node_j = np.concatenate([bottom[1:], top[1:], top, diag_j])
+
+        nodes, bars = ModelGenerator._load(data_handler, x, y, node_i, node_j, section, rot_i=True, rot_j=True)
+        ModelGenerator._support(nodes, [0], "pinned")
+        ModelGenerator._support(nodes, [n], "roller")
+        nodes["Fy"][1:n] = node_load
+        return ModelGenerator._finish(data_handler, nodes, bars, f"Treliça {kind.capitalize()}")
+
+    @staticmethod
+    def continuous_beam(data_handler, spans, segments_per_span=1, section=None, load=0.0):
+        """Viga contínua sobre apoios nos extremos de cada vão (fixo no primeiro, móveis nos demais).
+
+        spans: comprimentos dos vãos. Cada vão é dividido em segments_per_span barras.
+        load: carga distribuída Q em todas as barras.
+        """
+        spans = np.asarray(spans, dtype=float).ravel()
+        if len(spans) == 0 or (spans <= 0).any():
+            return False, "Informe vãos com comprimento positivo."
+        if segments_per_span < 1:
+            return False, "Cada vão precisa de pelo menos 1 segmento."
+
+        starts = np.concatenate([[0.0], np.cumsum(spans)])
+        t = np.arange(segments_per_span) / segments_per_span
+        x = np.append((starts[:-1, np.newaxis] + spans[:, np.newaxis] * t).ravel(), starts[-1])
+        num_bars = len(x) - 1
+
+        nodes, bars = ModelGenerator._load(data_handler, x, np.zeros(len(x)), np.arange(num_bars), np.arange(1, num_bars + 1), section, Q=load)
+        supports = np.arange(len(spans) + 1) * segments_per_span
+        ModelGenerator._support(nodes, supports[:1], "pinned")
+        ModelGenerator._support(nodes, supports[1:], "roller")
+        return ModelGenerator._finish(data_handler, nodes, bars, "Viga contínua")
+
+    @staticmethod
+    def arch(data_handler, span, rise, num_segments, shape="parabolic", section=None, load=0.0, support="pinned"):
+        """Arco discretizado em num_segments barras retas, apoiado nas duas extremidades.
+
+        shape: "parabolic" (y = 4f x (L - x) / L²) ou "circular" (arco de círculo pelos apoios e pelo topo).
+        load: carga distribuída Q em todas as barras (perpendicular a cada barra).
+        """
+        if shape not in ModelGenerator.ARCH_SHAPES:
+            return False, f"Forma de arco desconhecida: {shape}."
+        if num_segments < 2 or span <= 0 or rise <= 0:
+            return False, "O arco precisa de vão e flecha positivos e pelo menos 2 segmentos."
+        if support not in ModelGenerator.SUPPORTS:
+            return False, f"Tipo de apoio desconhecido: {support}."
+
+        if shape == "parabolic":
+            x = np.linspace(0.0, span, num_segments + 1)
+            y = 4 * rise * x * (span - x) / span ** 2
+        else:
+            # Raio pelo vão e flecha; ângulos distribuídos igualmente ao longo do arco
+            radius = (span ** 2 / 4 + rise ** 2) / (2 * rise)
+            half_angle = np.arcsin(np.clip(span / (2 * radius), -1.0, 1.0))
+            if rise > radius: half_angle = np.pi - half_angle  # Arco maior que um semicírculo
+            angles = np.linspace(-half_angle, half_angle, num_segments + 1)
+            x = span / 2 + radius * np.sin(angles)
+            y = rise - radius + radius * np.cos(angles)
+            x[[0, -1]] = 0.0, span  # Apoios exatamente nas extremidades
+            y[[0, -1]] = 0.0
+
+        nodes, bars = ModelGenerator._load(data_handler, x, y, np.arange(num_segments), np.arange(1, num_segments + 1), section, Q=load)
+        ModelGenerator._support(nodes, [0, num_segments], support)
+        return ModelGenerator._finish(data_handler, nodes, bars, "Arco")
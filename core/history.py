@@ -0,0 +1,105 @@
+from core.model_store import ColumnStore
+
+class UndoStack:
+    """Histórico de desfazer/refazer baseado no registro das modificações do modelo.
+
+    Cada comando guarda apenas as operações inversas das modificações feitas nas tabelas
+    (células, linhas inseridas ou removidas), junto com a revisão e os resultados da análise
+    do estado anterior. Os comandos mais antigos são descartados quando o total de memória
+    passa de max_bytes ou o número de passos passa de max_steps.
+    """
+
+    DEFAULT_MAX_BYTES = 64 * 2**20
+    DEFAULT_MAX_STEPS = 100
+
+    def __init__(self, max_bytes=None, max_steps=None):
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
+        self.max_steps = max_steps or self.DEFAULT_MAX_STEPS
+        self.clear()
+
+    def clear(self):
+        self.undo_commands = []
+        self.redo_commands = []
+        self._pending = None
+        self.nbytes = 0
+
+    def can_undo(self):
+        return bool(self.undo_commands)
+
+    def can_redo(self):
+        return bool(self.redo_commands)
+
+    # --- REGISTRO ---
+
+    def record(self, store, op, revision, results):
+        """Acrescenta a inversa de uma modificação ao comando em andamento.
+
+        revision / results: estado do modelo antes da primeira modificação do comando.
+        """
+        if self._pending is None:
+            self._pending = {"ops": [], "nbytes": 0, "revision": revision, "results": results}
+        self._pending["ops"].append((store, op))
+        self._pending["nbytes"] += ColumnStore.op_nbytes(op)
+
+    def commit(self):
+        """Fecha o comando em andamento (chamado uma vez por modificação ou lote)."""
+        command, self._pending = self._pending, None
+        if command is None: return
+        self._drop(self.redo_commands)
+        self.redo_commands = []
+        if command["nbytes"] > self.max_bytes:
+            # Modificação maior que o orçamento inteiro: o histórico anterior deixa de valer
+            self.clear()
+            return
+        self.undo_commands.append(command)
+        self.nbytes += command["nbytes"]
+        while self.undo_commands and (self.nbytes > self.max_bytes or len(self.undo_commands) > self.max_steps):
+            self.nbytes -= self.undo_commands.pop(0)["nbytes"]
+
+    def mark(self):
+        """Posição atual no comando em andamento (ponto de retorno para rollback)."""
+        return len(self._pending["ops"]) if self._pending is not None else 0
+
+    def rollback(self, mark=0):
+        """Reverte e descarta as modificações do comando em andamento feitas depois de 'mark'.
+
+        Retorna as operações revertidas (na ordem em que foram registradas).
+        """
+        if self._pending is None: return []
+        ops = self._pending["ops"][mark:]
+        del self._pending["ops"][mark:]
+        for store, op in reversed(ops):
+            store.apply(op)
+        self._pending["nbytes"] -= sum(ColumnStore.op_nbytes(op) for _, op in ops)
+        if not self._pending["ops"]:
+            self._pending = None
+        return ops
+
+    def _drop(self, commands):
+        self.nbytes -= sum(command["nbytes"] for command in commands)
+
+    # --- DESFAZER / REFAZER ---
+
+    def _swap(self, source, target, revision, results):
+        """Aplica o último comando de 'source' e guarda em 'target' o comando que o reverte.
+
+        Retorna (revisão, resultados, operações aplicadas) do estado restaurado, ou None se
+        não houver comando.
+        """
+        if not source: return None
+        command = source.pop()
+        # Aplica as inversas da última para a primeira; as inversas delas (que refazem o
+        # comando) ficam na ordem em que serão desfeitas depois
+        ops = [(store, store.apply(op)) for store, op in reversed(command["ops"])]
+        nbytes = sum(ColumnStore.op_nbytes(op) for _, op in ops)
+        self.nbytes += nbytes - command["nbytes"]
+        target.append({"ops": ops, "nbytes": nbytes, "revision": revision, "results": results})
+        return command["revision"], command["results"], command["ops"]
+
+    def undo(self, revision, results):
+        """Desfaz o último comando. revision / results: estado atual (guardado para o refazer)."""
+        return self._swap(self.undo_commands, self.redo_commands, revision, results)
+
+    def redo(self, revision, results):
+        """Refaz o último comando desfeito."""
+        return self._swap(self.redo_commands, self.undo_commands, revision, results)
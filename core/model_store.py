@@ -0,0 +1,180 @@
+import numpy as np
+import pandas as pd
+
+class ColumnStore:
+    """Tabela colunar com um array NumPy tipado por coluna.
+
+    Os arrays têm capacidade maior que o número de linhas e dobram de tamanho quando
+    enchem, de modo que inserir uma linha custa O(1) amortizado. As colunas são expostas
+    como views (sem cópia) e o DataFrame (uma cópia) só é montado quando alguém o pede.
+    """
+
+    MIN_CAPACITY = 16
+
+    def __init__(self, dtypes, extras=None):
+        """dtypes: colunas do modelo. extras: {coluna: (dtype, valor padrão)} de colunas internas,
+        mantidas alinhadas às linhas mas fora do DataFrame e dos arquivos."""
+        self.dtypes = {col: np.dtype(dtype) for col, dtype in dtypes.items()}
+        self.extra_dtypes = {col: np.dtype(dtype) for col, (dtype, _) in (extras or {}).items()}
+        self.defaults = {col: default for col, (_, default) in (extras or {}).items()}
+        self.size = 0
+        self.arrays = {col: np.full(self.MIN_CAPACITY, self.defaults.get(col, 0), dtype=dtype)
+                       for col, dtype in {**self.dtypes, **self.extra_dtypes}.items()}
+        self._frame = None  # DataFrame em cache (descartado a cada modificação)
+        self.version = 0    # Incrementado a cada modificação (invalida estruturas derivadas)
+        self.recorder = None  # recorder(store, op) recebe a operação inversa de cada modificação
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def capacity(self):
+        return len(next(iter(self.arrays.values())))
+
+    def _changed(self):
+        self._frame = None
+        self.version += 1
+
+    def reserve(self, capacity):
+        """Garante espaço para 'capacity' linhas, crescendo geometricamente."""
+        if capacity <= self.capacity: return
+        new_capacity = max(capacity, 2 * self.capacity)
+        for col, array in self.arrays.items():
+            grown = np.zeros(new_capacity, dtype=array.dtype)
+            grown[:self.size] = array[:self.size]
+            self.arrays[col] = grown
+
+    # --- LEITURA ---
+
+    def column(self, col):
+        """View tipada (sem cópia) das linhas válidas de uma coluna."""
+        return self.arrays[col][:self.size]
+
+    def columns(self):
+        return {col: self.arrays[col][:self.size] for col in self.dtypes}
+
+    def row(self, index):
+        return {col: self.arrays[col][index].item() for col in self.dtypes}
+
+    def to_frame(self):
+        """DataFrame com uma cópia das colunas atuais (montado sob demanda e mantido em cache).
+
+        A cópia é um retrato do estado atual: quem guarda o DataFrame (ex.: o plotter) não o vê
+        mudar com modificações posteriores da tabela. As colunas copiadas são somente leitura,
+        pois o mesmo DataFrame é entregue a todos até a próxima modificação.
+        """
+        if self._frame is None:
+            columns = {}
+            for col in self.dtypes:
+                values = self.arrays[col][:self.size].copy()
+                values.flags.writeable = False
+                columns[col] = values
+            self._frame = pd.DataFrame(columns, columns=list(self.dtypes), copy=False)
+        return self._frame
+
+    # --- ESCRITA ---
+    # Cada modificação informa ao 'recorder' (se houver) a operação que a desfaz, como uma
+    # tupla (tipo, argumentos...) que pode ser reaplicada com apply(). Só as células ou
+    # linhas afetadas são copiadas.
+
+    def _cast(self, col, values):
+        return np.asarray(values, dtype=self.arrays[col].dtype)
+
+    def _record(self, op):
+        if self.recorder is not None:
+            self.recorder(self, op)
+
+    def _rows(self, indices):
+        """Cópia de todas as colunas (inclusive as internas) das linhas dadas."""
+        return {col: array[:self.size][indices].copy() for col, array in self.arrays.items()}
+
+    def append(self, row):
+        """Adiciona uma linha (dict); colunas ausentes ficam zeradas. Retorna o índice."""
+        self._record(("truncate", self.size))
+        self.reserve(self.size + 1)
+        index = self.size
+        for col, array in self.arrays.items():
+            array[index] = row.get(col, self.defaults.get(col, 0))
+        self.size += 1
+        self._changed()
+        return index
+
+    def extend(self, columns):
+        """Adiciona várias linhas a partir de colunas; colunas ausentes ficam zeradas."""
+        self._record(("truncate", self.size))
+        return self._extend(columns)
+
+    def _extend(self, columns):
+        count = len(next(iter(columns.values()))) if columns else 0
+        self.reserve(self.size + count)
+        for col, array in self.arrays.items():
+            array[self.size:self.size + count] = self._cast(col, columns[col]) if col in columns else self.defaults.get(col, 0)
+        self.size += count
+        self._changed()
+        return np.arange(self.size - count, self.size)
+
+    def truncate(self, size):
+        """Remove as linhas a partir de 'size'."""
+        self._record(("extend", self._rows(slice(size, self.size))))
+        self.size = size
+        self._changed()
+
+    def set(self, indices, columns):
+        """Escreve valores nas linhas 'indices' (índice único ou array) das colunas dadas."""
+        if not isinstance(indices, slice): indices = np.array(indices, dtype=np.int64)
+        self._record(("set", indices, {col: self.arrays[col][:self.size][indices].copy() for col in columns}))
+        for col, values in columns.items():
+            self.arrays[col][:self.size][indices] = self._cast(col, values)
+        self._changed()
+
+    def delete(self, indices):
+        """Remove as linhas dadas e compacta as seguintes (renumeração como reset_index)."""
+        indices = np.unique(np.asarray(indices, dtype=np.int64))
+        self._record(("insert", indices, self._rows(indices)))
+        keep = np.ones(self.size, dtype=bool)
+        keep[indices] = False
+        count = int(keep.sum())
+        for col, array in self.arrays.items():
+            array[:count] = array[:self.size][keep]
+        self.size = count
+        self._changed()
+
+    def insert(self, indices, columns):
+        """Insere linhas para que fiquem nas posições 'indices' (crescentes) da tabela final."""
+        indices = np.asarray(indices, dtype=np.int64)
+        self._record(("delete", indices))
+        new_size = self.size + len(indices)
+        self.reserve(new_size)
+        inserted = np.zeros(new_size, dtype=bool)
+        inserted[indices] = True
+        for col, array in self.arrays.items():
+            array[:new_size][~inserted] = array[:self.size].copy()
+            array[:new_size][inserted] = self._cast(col, columns[col]) if col in columns else self.defaults.get(col, 0)
+        self.size = new_size
+        self._changed()
+
+    def load(self, columns):
+        """Substitui todo o conteúdo pelas colunas dadas."""
+        self._record(("load", self._rows(slice(None))))
+        self.size = 0
+        self.reserve(max(len(next(iter(columns.values()))) if columns else 0, self.MIN_CAPACITY))
+        self._extend(columns)
+
+    def apply(self, op):
+        """Aplica uma operação registrada (ex.: a inversa de uma modificação) e retorna a sua inversa."""
+        captured = []
+        recorder, self.recorder = self.recorder, lambda store, inverse: captured.append(inverse)
+        try:
+            getattr(self, op[0])(*op[1:])
+        finally:
+            self.recorder = recorder
+        return captured[0]
+
+    @staticmethod
+    def op_nbytes(op):
+        """Memória ocupada pelos dados de uma operação registrada."""
+        total = 0
+        for arg in op[1:]:
+            values = arg.values() if isinstance(arg, dict) else [arg]
+            total += sum(value.nbytes for value in values if isinstance(value, np.ndarray))
+        return total
@@ -0,0 +1,94 @@
+import math
+import numpy as np
+from core.spatial_index import BoxGrid
+
+class ModelPicker:
+    """Nó ou barra sob o cursor e os resultados no ponto apontado.
+
+    Nós e barras ficam em dois BoxGrid (pontos e retângulos envolventes dos segmentos),
+    montados uma vez por geometria. Cada consulta lê só as células em torno do cursor e
+    calcula a distância exata aos candidatos, então o custo por movimento do mouse não
+    depende do tamanho do modelo.
+    """
+
+    def __init__(self, coord, connectivity):
+        self.coord = np.asarray(coord, dtype=float).reshape(-1, 2)
+        connectivity = np.asarray(connectivity, dtype=np.int64).reshape(-1, 2)
+        self.segments = self.coord[connectivity] if len(self.coord) else np.zeros((0, 2, 2))
+        self.node_grid = BoxGrid.from_points(self.coord)
+        self.bar_grid = BoxGrid(np.hstack([self.segments.min(axis=1), self.segments.max(axis=1)]))
+
+    @classmethod
+    def from_model(cls, nodes, bars):
+        """Índice a partir das colunas do DataHandler (node_arrays() e bar_arrays())."""
+        coord = np.column_stack([np.asarray(nodes["X"], dtype=float), np.asarray(nodes["Y"], dtype=float)])
+        return cls(coord, np.column_stack([bars["node_i"], bars["node_j"]]))
+
+    def nearest_node(self, x, y, tolerance):
+        """(índice, distância) do nó mais próximo a até 'tolerance' de (x, y), ou (None, inf)."""
+        candidates = self.node_grid.query(x - tolerance, y - tolerance, x + tolerance, y + tolerance)
+        if len(candidates) == 0: return None, math.inf
+        distance = np.hypot(self.coord[candidates, 0] - x, self.coord[candidates, 1] - y)
+        best = int(np.argmin(distance))
+        if distance[best] > tolerance: return None, math.inf
+        return int(candidates[best]), float(distance[best])
+
+    def nearest_bar(self, x, y, tolerance):
+        """(índice, t, distância) da barra mais próxima a até 'tolerance' de (x, y), ou (None, None, inf).
+
+        t: posição do ponto mais próximo ao longo da barra (0 = nó inicial, 1 = nó final).
+        """
+        candidates = self.bar_grid.query(x - tolerance, y - tolerance, x + tolerance, y + tolerance)
+        if len(candidates) == 0: return None, None, math.inf
+        start = self.segments[candidates, 0]
+        delta = self.segments[candidates, 1] - start
+        length2 = (delta ** 2).sum(axis=1)
+        t = ((np.array([x, y]) - start) * delta).sum(axis=1) / np.where(length2 > 0, length2, 1.0)
+        t = t.clip(0.0, 1.0)
+        closest = start + t[:, np.newaxis] * delta
+        distance = np.hypot(closest[:, 0] - x, closest[:, 1] - y)
+        best = int(np.argmin(distance))
+        if distance[best] > tolerance: return None, None, math.inf
+        return int(candidates[best]), float(t[best]), float(distance[best])
+
+    def pick(self, x, y, tolerance):
+        """Elemento sob o cursor: os nós têm prioridade sobre as barras dentro da tolerância.
+
+        Retorna um dicionário com kind ("node" ou "bar"), index, point (ponto apontado no
+        elemento) e, nas barras, t; ou None.
+        """
+        node, _ = self.nearest_node(x, y, tolerance)
+        if node is not None:
+            return {"kind": "node", "index": node, "point": self.coord[node].copy()}
+        bar, t, _ = self.nearest_bar(x, y, tolerance)
+        if bar is not None:
+            start, end = self.segments[bar]
+            return {"kind": "bar", "index": bar, "t": t, "point": start + t * (end - start)}
+        return None
+
+    @staticmethod
+    def bar_forces(results, bar, t):
+        """(x, N, V, M) a uma fração t do comprimento da barra, com as convenções dos diagramas."""
+        f, q = results['forces'][bar], results['distributed_loads'][bar]
+        x = t * results['lengths'][bar]
+        return x, f[0], f[1] + q * x, -f[2] + f[1] * x + q * x ** 2 / 2
+
+    @staticmethod
+    def describe(picked, results=None):
+        """Linhas de texto do elemento escolhido: deslocamentos e reações no nó, ou N, V e M no ponto da barra."""
+        index = picked["index"]
+        if picked["kind"] == "node":
+            x, y = picked["point"]
+            lines = [f"Nó {index + 1} ({x:.3f}, {y:.3f})"]
+            if results is not None:
+                ux, uy, rz = results['displacements'][index][:3]
+                lines += [f"UX = {ux:.4e} m", f"UY = {uy:.4e} m", f"RZ = {rz:.4e} rad"]
+                rx, ry, mz = results['reactions'][index][:3]
+                if rx or ry or mz:
+                    lines += [f"Rx = {rx:.2f} kN", f"Ry = {ry:.2f} kN", f"Mz = {mz:.2f} kN.m"]
+            return lines
+
+        if results is None:
+            return [f"Barra {index + 1}"]
+        x, N, V, M = ModelPicker.bar_forces(results, index, picked["t"])
+        return [f"Barra {index + 1} (x = {x:.3f} m)", f"N = {N:.2f} kN", f"V = {V:.2f} kN", f"M = {M:.2f} kN.m"]
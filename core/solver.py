@@ -1,180 +1,252 @@
 import numpy as np
-import math
+from core.validator import ModelValidator
+from core.changes import ModelChange
 
 class StructuralSolver:
     def __init__(self):
-        pass
+        self.issues = []  # Avisos da validação da última análise
+        # Cache das matrizes das barras, mantido só quando o solver acompanha um DataHandler (track)
+        self.tracking = False
+        self.element_cache = None
+        self._stale_bars = None
+        self.rebuilt_bars = 0  # Barras recalculadas na última análise (as demais vieram do cache)
+
+    def track(self, data_handler):
+        """Acompanha as modificações do DataHandler para reaproveitar entre análises as matrizes
+        das barras que não mudaram (ver on_model_changed)."""
+        data_handler.add_listener(self.on_model_changed)
+        self.tracking = True
+        self.element_cache = None
+
+    def on_model_changed(self, change):
+        """Marca as barras cujas matrizes precisam ser recalculadas.
+
+        Só geometria, seção e rótulas mudam a rigidez de uma barra; cargas, apoios e
+        deslocamentos prescritos não invalidam o cache.
+        """
+        if self.element_cache is None: return
+        stale = change.bars(ModelChange.GEOMETRY, ModelChange.SECTION, ModelChange.RELEASE)
+        if change.affects(ModelChange.TOPOLOGY) or stale is None:
+            self.element_cache = None  # Numeração das barras mudou: recalcula tudo
+        else:
+            self._stale_bars[stale] = True
+
+    def _element_stiffness(self, coord, connectivity, E, A, I, releases):
+        """Comprimentos, rotações e rigidezes locais das barras, usando o cache quando possível."""
+        num_bars = len(connectivity)
+        cache = self.element_cache
+        if cache is None or len(cache["lengths"]) != num_bars:
+            cache = {"lengths": np.zeros(num_bars), "rotation": np.zeros((num_bars, 6, 6)),
+                     "k_local": np.zeros((num_bars, 6, 6)), "k_mod": np.zeros((num_bars, 6, 6))}
+            stale = np.arange(num_bars)
+        else:
+            stale = np.flatnonzero(self._stale_bars)
+
+        if len(stale):
+            computed = self.element_matrices(coord, connectivity[stale], E[stale], A[stale], I[stale], releases[stale], stale)
+            for key, values in computed.items():
+                cache[key][stale] = values
+        self.rebuilt_bars = len(stale)
+
+        if self.tracking:
+            self.element_cache = cache
+            self._stale_bars = np.zeros(num_bars, dtype=bool)
+        return cache
+
+    @staticmethod
+    def element_matrices(coord, connectivity, E, A, I, releases, bar_ids=None):
+        """Comprimento, matriz de rotação e matrizes de rigidez local (original e com rótulas)
+        de cada barra, todas de uma vez. bar_ids: numeração usada nas mensagens de erro."""
+        dx, dy = (coord[connectivity[:, 1]] - coord[connectivity[:, 0]]).T
+        lengths = np.hypot(dx, dy)
+        short = lengths < 1e-9
+        if short.any():
+            bar = np.argmax(short) if bar_ids is None else bar_ids[np.argmax(short)]
+            raise ValueError(f"Barra {bar + 1} tem comprimento zero.")
+
+        # Constantes das barras
+        EAL = E * A / lengths
+        EIL = E * I / lengths
+        EIL2 = EIL / lengths
+        EIL3 = EIL2 / lengths
+
+        # Matriz de rigidez local (pórtico)
+        k = np.zeros((len(lengths), 6, 6))
+        k[:, 0, 0] = k[:, 3, 3] = EAL
+        k[:, 0, 3] = k[:, 3, 0] = -EAL
+        k[:, 1, 1] = k[:, 4, 4] = 12 * EIL3
+        k[:, 1, 4] = k[:, 4, 1] = -12 * EIL3
+        k[:, 1, 2] = k[:, 2, 1] = k[:, 1, 5] = k[:, 5, 1] = 6 * EIL2
+        k[:, 2, 4] = k[:, 4, 2] = k[:, 4, 5] = k[:, 5, 4] = -6 * EIL2
+        k[:, 2, 2] = k[:, 5, 5] = 4 * EIL
+        k[:, 2, 5] = k[:, 5, 2] = 2 * EIL
+
+        # Aplicação de rótulas: condensação estática do momento da extremidade rotulada
+        k_mod = k.copy()
+        for gl, only in StructuralSolver._single_releases(releases):
+            if not only.any(): continue
+            kk = k[only]
+            pivot = StructuralSolver._pivot(kk, gl)
+            k_mod[only] = kk - kk[:, :, gl, np.newaxis] * kk[:, np.newaxis, gl, :] / pivot[:, np.newaxis, np.newaxis]
+
+        # Rótula em ambos os nós (biarrotulada): matriz de treliça
+        both = (releases[:, 0] == 1) & (releases[:, 1] == 1)
+        k_mod[both] = 0
+        k_mod[both, 0, 0] = k_mod[both, 3, 3] = EAL[both]
+        k_mod[both, 0, 3] = k_mod[both, 3, 0] = -EAL[both]
+
+        # Matriz de rotação (Transformação de coordenadas)
+        c, s = dx / lengths, dy / lengths
+        rotation = np.zeros((len(lengths), 6, 6))
+        rotation[:, 0, 0] = rotation[:, 1, 1] = rotation[:, 3, 3] = rotation[:, 4, 4] = c
+        rotation[:, 0, 1] = rotation[:, 3, 4] = s
+        rotation[:, 1, 0] = rotation[:, 4, 3] = -s
+        rotation[:, 2, 2] = rotation[:, 5, 5] = 1
+
+        return {"lengths": lengths, "rotation": rotation, "k_local": k, "k_mod": k_mod}
+
+    @staticmethod
+    def _single_releases(releases):
+        """(GL do momento, barras rotuladas só naquela extremidade) para o nó inicial e o final."""
+        rot_i, rot_j = releases[:, 0] == 1, releases[:, 1] == 1
+        return ((2, rot_i & ~rot_j), (5, rot_j & ~rot_i))
+
+    @staticmethod
+    def _pivot(k, gl):
+        pivot = k[:, gl, gl]
+        return np.where(np.abs(pivot) < 1e-12, 1e-12, pivot)
+
+    @staticmethod
+    def fixed_end_forces(lengths, distributed_loads, releases, stiffness_local_matrices):
+        """Forças de engastamento perfeito locais, originais e corrigidas pelas rótulas.
+
+        Convenção: p > 0 (para cima). Índices: [Ax_i, V_i, M_i, Ax_j, V_j, M_j] -> [0, 1, 2, 3, 4, 5]
+        """
+        p, L = distributed_loads, lengths
+        fef = np.zeros((len(L), 6))
+        fef[:, 1] = fef[:, 4] = -p * L / 2  # V_i, V_j
+        fef[:, 2] = -p * L**2 / 12          # M_i
+        fef[:, 5] = p * L**2 / 12           # M_j
+
+        fef_mod = fef.copy()
+        for gl, only in StructuralSolver._single_releases(releases):
+            if not only.any(): continue
+            k = stiffness_local_matrices[only]
+            fef_mod[only] -= k[:, :, gl] / StructuralSolver._pivot(k, gl)[:, np.newaxis] * fef[only][:, gl, np.newaxis]
+        fef_mod[(releases[:, 0] == 1) & (releases[:, 1] == 1)] = 0  # Treliça: sem engastamento
+        return fef, fef_mod
+
+    @staticmethod
+    def _column(table, name, dtype=float):
+        """Coluna como array tipado; sem cópia se já estiver no tipo certo (ex.: DataHandler.node_arrays())."""
+        return np.asarray(table[name], dtype=dtype)
+
+    @staticmethod
+    def _columns(table, names, dtype=float):
+        return np.column_stack([StructuralSolver._column(table, name, dtype) for name in names])
+
+    @staticmethod
+    def active_dofs(num_nodes, connectivity, releases, nodal_restraints, dof_per_node=3):
+        """GLs globais que entram no sistema (ordenados).
+
+        A rotação de um nó fica de fora quando todas as barras que chegam nele estão rotuladas
+        naquela extremidade e ela não é restringida: sem rigidez rotacional, o GL só tornaria
+        o sistema singular. Nós sem barras mantêm seus GLs (a validação trata esse caso).
+        """
+        ends = np.asarray(connectivity, dtype=np.int64).ravel()
+        degree = np.bincount(ends, minlength=num_nodes)
+        hinged = np.bincount(ends[np.asarray(releases).ravel() == 1], minlength=num_nodes)
+        inactive_rotation = (degree > 0) & (hinged == degree) & (np.asarray(nodal_restraints)[:, 2] != 1)
+
+        active = np.ones((num_nodes, dof_per_node), dtype=bool)
+        active[:, 2] = ~inactive_rotation
+        return np.flatnonzero(active.ravel())
+
+    def run_analysis(self, nodes, bars):
+            """nodes / bars: colunas dos nós e das barras (dict de arrays ou DataFrame)."""
+            # --- 0. Validação (falha rápido, antes de montar o sistema) ---
+            self.issues = ModelValidator.check(nodes, bars)
 
-    def run_analysis(self, nodes_df, bars_df):
             # --- 1. Carregamento de Dados ---
 
             # Carrega os dados dos nós
-            coord = nodes_df[["X", "Y"]].values.astype(float)
-            nodal_forces = nodes_df[["Fx", "Fy", "Mz"]].values.astype(float)
-            nodal_restraints = nodes_df[["Restr_X", "Restr_Y", "Restr_Rz"]].values.astype(float)
-            prescribed_displacements = nodes_df[["Disp_X", "Disp_Y", "Disp_Rz"]].values.astype(float)
-            num_nodes = len(nodes_df)
+            coord = self._columns(nodes, ["X", "Y"])
+            nodal_forces = self._columns(nodes, ["Fx", "Fy", "Mz"])
+            nodal_restraints = self._columns(nodes, ["Restr_X", "Restr_Y", "Restr_Rz"])
+            prescribed_displacements = self._columns(nodes, ["Disp_X", "Disp_Y", "Disp_Rz"])
+            num_nodes = len(coord)
 
             # Carrega os dados das barras
-            connectivity = bars_df[["node_i", "node_j"]].values.astype(int)  # Matriz de conectividade (0-based)
-            A = bars_df["A"].values.astype(float) # Área
-            I = bars_df["I"].values.astype(float) # Momento de Inércia
-            E = bars_df["E"].values.astype(float) # Módulo de Elasticidade
-            distributed_loads = bars_df["Q"].values.astype(float) # Carga distribuída
-            releases = bars_df[["rot_i", "rot_j"]].values.astype(int)  # Rótulas (liberação de rotação)
-            num_bars = len(bars_df)
+            connectivity = self._columns(bars, ["node_i", "node_j"], int).reshape(-1, 2)  # Matriz de conectividade (0-based)
+            A = self._column(bars, "A") # Área
+            I = self._column(bars, "I") # Momento de Inércia
+            E = self._column(bars, "E") # Módulo de Elasticidade
+            distributed_loads = self._column(bars, "Q") # Carga distribuída
+            releases = self._columns(bars, ["rot_i", "rot_j"], int).reshape(-1, 2)  # Rótulas (liberação de rotação)
+            num_bars = len(connectivity)
 
             # Parâmetros fixos
             dof_per_node = 3
             big_number = 1e15  # Número grande para restrição (método do número grande)
 
-            # --- 2. Cálculo das Matrizes de Barra (Loop Principal) ---
-
-            # Criação de vetores / matrizes zeradas
-            lengths = np.zeros(num_bars)
-            fixed_end_forces_local = np.zeros(shape=(num_bars, 2 * dof_per_node))
-            fixed_end_forces_local_mod = np.zeros(shape=(num_bars, 2 * dof_per_node))
-            rotation_matrices = np.zeros(shape=(num_bars, 2 * dof_per_node, 2 * dof_per_node))
-            stiffness_local_matrices = np.zeros(shape=(num_bars, 2 * dof_per_node, 2 * dof_per_node))
-            stiffness_local_mod_matrices = np.zeros(shape=(num_bars, 2 * dof_per_node, 2 * dof_per_node))
-            dof_mapping = []  # Vetor de correspondência (mapeia DOFs locais para globais)
-
-            # Calculando para todas as barras:
-            for i in range(num_bars):
-                # Cálculo do comprimento e cossenos diretores
-                node_i = connectivity[i, 0]
-                node_j = connectivity[i, 1]
-                dx = coord[node_j, 0] - coord[node_i, 0]
-                dy = coord[node_j, 1] - coord[node_i, 1]
-                lengths[i] = math.sqrt(dx ** 2 + dy ** 2)
-                if lengths[i] < 1e-9:
-                    raise ValueError(f"Barra {i+1} tem comprimento zero.")
-
-                # Constantes da barra
-                L_val = lengths[i]
-                p_val = distributed_loads[i]
-                EAL = E[i] * A[i] / L_val
-                EIL = E[i] * I[i] / L_val
-                EIL2 = EIL / L_val
-                EIL3 = EIL2 / L_val
-
-                # Forças de engastamento perfeito (CORRIGIDO)
-                # Convenção: p > 0 (para cima)
-                # Índices: [Ax_i, V_i, M_i, Ax_j, V_j, M_j] -> [0, 1, 2, 3, 4, 5]
-                fixed_end_forces_local[i, 1] = -p_val * L_val / 2      # V_i
-                fixed_end_forces_local[i, 4] = -p_val * L_val / 2      # V_j
-                fixed_end_forces_local[i, 2] = -p_val * L_val**2 / 12  # M_i
-                fixed_end_forces_local[i, 5] = p_val * L_val**2 / 12 # M_j
-
-                # Matriz de rigidez local (pórtico)
-                stiffness_local_matrices[i] = np.array([
-                    [EAL, 0, 0, -EAL, 0, 0],
-                    [0, 12*EIL3, 6*EIL2, 0, -12*EIL3, 6*EIL2],
-                    [0, 6*EIL2, 4*EIL, 0, -6*EIL2, 2*EIL],
-                    [-EAL, 0, 0, EAL, 0, 0],
-                    [0, -12*EIL3, -6*EIL2, 0, 12*EIL3, -6*EIL2],
-                    [0, 6*EIL2, 2*EIL, 0, -6*EIL2, 4*EIL]])
-
-                # Aplicação de rótulas (modifica matriz de rigidez e vetor de Forças de Engastamento Perfeito)
-                stiffness_local_mod_matrices[i] = stiffness_local_matrices[i].copy()
-                fixed_end_forces_local_mod[i] = fixed_end_forces_local[i].copy()
-
-                # Rótula no nó inicial (Condensação Estática)
-                if releases[i, 0] == 1 and releases[i, 1] == 0:
-                    gl = 2  # DOF do momento em i
-                    pivot = stiffness_local_mod_matrices[i, gl, gl]
-                    if abs(pivot) < 1e-12: pivot = 1e-12
-                    K_col_orig = stiffness_local_mod_matrices[i, :, gl].copy()
-                    stiffness_local_mod_matrices[i] -= np.outer(stiffness_local_mod_matrices[i, :, gl], stiffness_local_mod_matrices[i, gl, :]) / pivot
-                    fixed_end_forces_local_mod[i] -= K_col_orig / pivot * fixed_end_forces_local_mod[i, gl]
-
-                # Rótula no nó final (Condensação Estática)
-                if releases[i, 1] == 1 and releases[i, 0] == 0:
-                    gl = 5  # DOF do momento em j
-                    pivot = stiffness_local_mod_matrices[i, gl, gl]
-                    if abs(pivot) < 1e-12: pivot = 1e-12
-                    K_col_orig = stiffness_local_mod_matrices[i, :, gl].copy()
-                    stiffness_local_mod_matrices[i] -= np.outer(stiffness_local_mod_matrices[i, :, gl], stiffness_local_mod_matrices[i, gl, :]) / pivot
-                    fixed_end_forces_local_mod[i] -= K_col_orig / pivot * fixed_end_forces_local_mod[i, gl]
-
-                # Rótula em ambos os nós (biarrotulada) (Matriz de Treliça)
-                if releases[i, 0] == 1 and releases[i, 1] == 1:
-                    stiffness_local_mod_matrices[i] = np.zeros((2 * dof_per_node, 2 * dof_per_node))
-                    stiffness_local_mod_matrices[i, 0, 0] = EAL
-                    stiffness_local_mod_matrices[i, 3, 3] = EAL
-                    stiffness_local_mod_matrices[i, 0, 3] = -EAL
-                    stiffness_local_mod_matrices[i, 3, 0] = -EAL
-                    fixed_end_forces_local_mod[i, :] = 0  # Forças de Engastamento Perfeito é zero para treliça
-
-                # Matriz de rotação (Transformação de coordenadas)
-                c, s = dx / L_val, dy / L_val
-                rotation_matrices[i] = np.array([
-                    [c, s, 0, 0, 0, 0],
-                    [-s, c, 0, 0, 0, 0],
-                    [0, 0, 1, 0, 0, 0],
-                    [0, 0, 0, c, s, 0],
-                    [0, 0, 0, -s, c, 0],
-                    [0, 0, 0, 0, 0, 1]])
-
-                # Vetor de correspondência (DOF mapping)
-                qi = np.zeros(2 * dof_per_node, dtype=int)
-                z = 0
-                for j in range(2):  # Para nó i (j=0) e nó j (j=1)
-                    for jk in range(dof_per_node):  # Para DOFs X, Y, Rz
-                        qi[z] = dof_per_node * connectivity[i, j] + jk
-                        z += 1
-                dof_mapping.append(qi)
-
-            # --- 3. Montagem do Sistema Global ---
+            # --- 2. Matrizes das Barras ---
 
+            # Rigidez e rotação vêm do cache (só as barras modificadas são recalculadas); as forças
+            # de engastamento perfeito dependem das cargas e são sempre refeitas (vetorizado)
+            elements = self._element_stiffness(coord, connectivity, E, A, I, releases)
+            lengths = elements["lengths"]
+            rotation_matrices = elements["rotation"]
+            stiffness_local_mod_matrices = elements["k_mod"]
+            _, fixed_end_forces_local_mod = self.fixed_end_forces(lengths, distributed_loads, releases, elements["k_local"])
+
+            # Vetor de correspondência (DOF mapping): GLs globais [3i, 3i+1, 3i+2, 3j, 3j+1, 3j+2] de cada barra
+            dof_mapping = (dof_per_node * connectivity[:, :, np.newaxis] + np.arange(dof_per_node)).reshape(num_bars, 2 * dof_per_node)
+
+            # --- 3. Graus de Liberdade Ativos ---
+
+            # Rotação de um nó em que todas as barras chegam rotuladas (ex.: treliças) não tem rigidez:
+            # esse GL fica fora do sistema (salvo se restringido, para manter a reação/deslocamento prescrito)
             total_dofs = dof_per_node * num_nodes
-            global_stiffness_matrix = np.zeros(shape=(total_dofs, total_dofs))
-            equivalent_nodal_forces = np.zeros(total_dofs)
-
-            # Loop de montagem
-            for i in range(num_bars):
-                # Rotaciona matriz de rigidez e vetor de forças
-                ki_global = rotation_matrices[i].T @ stiffness_local_mod_matrices[i] @ rotation_matrices[i]
-                forces_global = rotation_matrices[i].T @ fixed_end_forces_local_mod[i]
-                
-                qi = dof_mapping[i]  # Pega o mapeamento de DOFs
-                
-                # Soma as forças nodais equivalentes (sinal trocado)
-                equivalent_nodal_forces[qi] -= forces_global
-                
-                # Monta a matriz de rigidez global (método de superposição)
-                for r_idx, r_global in enumerate(qi):
-                    for c_idx, c_global in enumerate(qi):
-                        global_stiffness_matrix[r_global, c_global] += ki_global[r_idx, c_idx]
-
-            # Vetor de forças nodais combinadas (Forças de Engastamento Perfeito + Forças aplicadas)
-            total_nodal_forces = equivalent_nodal_forces.copy()
-            for i in range(num_nodes):
-                for j in range(dof_per_node):
-                    total_nodal_forces[i * dof_per_node + j] += nodal_forces[i, j]
-
-            # --- 4. Aplicação das Condições de Contorno (Método da Penalidade) ---
-
-            # Aplica número grande na Matriz de Rigidez (K)
-            global_stiffness_matrix_pen = global_stiffness_matrix.copy()
-            for i in range(num_nodes):
-                for j in range(dof_per_node):
-                    if nodal_restraints[i, j] == 1:
-                        global_dof_index = dof_per_node * i + j
-                        global_stiffness_matrix_pen[global_dof_index, global_dof_index] += big_number
+            active_dofs = self.active_dofs(num_nodes, connectivity, releases, nodal_restraints)
+            dof_index = np.full(total_dofs, -1, dtype=np.int64)  # GL global -> posição no sistema compacto
+            dof_index[active_dofs] = np.arange(len(active_dofs))
+
+            # --- 4. Montagem do Sistema Global (apenas GLs ativos) ---
+
+            # Rotaciona matrizes de rigidez e vetores de forças para o sistema global (todas as barras de uma vez)
+            stiffness_global_matrices = np.einsum('nki,nkl,nlj->nij', rotation_matrices, stiffness_local_mod_matrices, rotation_matrices)
+            forces_global = np.einsum('nki,nk->ni', rotation_matrices, fixed_end_forces_local_mod)
+
+            # Vetor de forças nodais combinadas: forças aplicadas - Forças de Engastamento Perfeito (sinal trocado)
+            total_nodal_forces = nodal_forces.ravel().copy()
+            np.add.at(total_nodal_forces, dof_mapping, -forces_global)
 
-            # Aplica número grande no Vetor de Forças (F) para deslocamentos prescritos
-            total_nodal_forces_pen = total_nodal_forces.copy()
-            for i in range(num_nodes):
-                for j in range(dof_per_node):
-                    if nodal_restraints[i, j] == 1:
-                        global_dof_index = dof_per_node * i + j
-                        total_nodal_forces_pen[global_dof_index] += big_number * prescribed_displacements[i, j]
+            # Superposição das matrizes das barras (GLs inativos têm rigidez nula e são descartados)
+            rows = dof_index[dof_mapping]
+            pairs = (rows[:, :, np.newaxis] >= 0) & (rows[:, np.newaxis, :] >= 0)
+            row_idx = np.broadcast_to(rows[:, :, np.newaxis], pairs.shape)[pairs]
+            col_idx = np.broadcast_to(rows[:, np.newaxis, :], pairs.shape)[pairs]
+            global_stiffness_matrix = np.zeros(shape=(len(active_dofs), len(active_dofs)))
+            np.add.at(global_stiffness_matrix, (row_idx, col_idx), stiffness_global_matrices[pairs])
+            active_forces = total_nodal_forces[active_dofs]
 
-            # --- 5. Solução do Sistema e Pós-Processamento ---
+            # --- 5. Aplicação das Condições de Contorno (Método da Penalidade) ---
 
-            # Deslocamentos nodais
-            global_displacements = np.linalg.solve(global_stiffness_matrix_pen, total_nodal_forces_pen)
+            restrained = nodal_restraints.ravel()[active_dofs] == 1
+            restrained_pos = np.flatnonzero(restrained)
+
+            # Aplica número grande na Matriz de Rigidez (K) e no Vetor de Forças (F) para deslocamentos prescritos
+            global_stiffness_matrix_pen = global_stiffness_matrix.copy()
+            global_stiffness_matrix_pen[restrained_pos, restrained_pos] += big_number
+            active_forces_pen = active_forces.copy()
+            active_forces_pen[restrained_pos] += big_number * prescribed_displacements.ravel()[active_dofs][restrained_pos]
+
+            # --- 6. Solução do Sistema e Pós-Processamento ---
+
+            # Deslocamentos nodais (GLs inativos ficam com zero no layout de 3 GLs por nó)
+            active_displacements = np.linalg.solve(global_stiffness_matrix_pen, active_forces_pen)
+            global_displacements = np.zeros(total_dofs)
+            global_displacements[active_dofs] = active_displacements
 
             # Coordenadas deformadas (escala automática)
             displacements_xy = global_displacements.reshape(-1, dof_per_node)[:, :2]  # Pega apenas DOFs X e Y
@@ -185,29 +257,18 @@ class StructuralSolver:
             # Define a escala como 10% da dimensão máxima da estrutura
             scale_factor = 0.1 * max_dim / max_desl if max_desl > 1e-9 else 1.0
 
-            # deformed_coords = coord + displacements_xy * scale_factor
-
             # Reações de Apoio
-            # R = K*d - F_total
-            reactions_vector = global_stiffness_matrix @ global_displacements
-            reactions_matrix = np.zeros(shape=(num_nodes, dof_per_node))
-            for i in range(num_nodes):
-                for j in range(dof_per_node):
-                    if nodal_restraints[i, j] == 1:
-                        global_dof_index = dof_per_node * i + j
-                        # Reação = Força Interna (K*d) - Força Externa Total (F_equiv + F_nodal)
-                        reactions_matrix[i, j] = reactions_vector[global_dof_index] - total_nodal_forces[global_dof_index]
+            # Reação = Força Interna (K*d) - Força Externa Total (F_equiv + F_nodal)
+            reactions_vector = global_stiffness_matrix @ active_displacements - active_forces
+            reactions = np.zeros(total_dofs)
+            reactions[active_dofs[restrained_pos]] = reactions_vector[restrained_pos]
+            reactions_matrix = reactions.reshape(num_nodes, dof_per_node)
 
             # Esforços de extremidade das barras (Forças Locais)
             # F_local = k_local_mod * (R * d_global) + Forças de Engastamento Perfeito_local_mod
-            member_end_forces_local = np.zeros(shape=(num_bars, 2 * dof_per_node))
-            for i in range(num_bars):
-                qi = dof_mapping[i]
-                displacements_global_bar = global_displacements[qi]
-                displacements_local_bar = rotation_matrices[i] @ displacements_global_bar
-                member_end_forces_local[i, :] = stiffness_local_mod_matrices[i] @ displacements_local_bar + fixed_end_forces_local_mod[i]
-
-        
+            displacements_local = np.einsum('nij,nj->ni', rotation_matrices, global_displacements[dof_mapping])
+            member_end_forces_local = np.einsum('nij,nj->ni', stiffness_local_mod_matrices, displacements_local) + fixed_end_forces_local_mod
+
             # No final, retorne o dicionário de resultados
             results = {
                 'forces': member_end_forces_local,
@@ -217,7 +278,9 @@ class StructuralSolver:
                 'lengths': lengths,
                 'distributed_loads': distributed_loads,
                 'scale_factor': scale_factor,
-                'reactions': reactions_matrix
+                'reactions': reactions_matrix,
+                'displacements': global_displacements.reshape(-1, dof_per_node),
+                'num_active_dofs': len(active_dofs)
             }
             return results
         
\ No newline at end of file
@@ -0,0 +1,368 @@
+import math
+import numpy as np
+
+class SpatialHash:
+    """Índice espacial em grade para os nós do modelo (duplicatas e nó mais próximo).
+
+    Cada nó fica na célula (floor((x - x0) / cell_size), floor((y - y0) / cell_size)), com a
+    célula ajustada ao espaçamento médio. A grade fica em formato CSR: items são os índices
+    dos nós ordenados pelo código da célula (linha * num_colunas + coluna), cells os códigos
+    ocupados, em ordem crescente, e starts o início de cada um em items. Uma célula é achada
+    por busca binária em cells e as coordenadas são lidas direto das colunas do modelo, sem
+    objetos Python por nó. A verificação de duplicatas só olha a célula do ponto e as
+    vizinhas, o que a torna O(1).
+
+    A grade é montada na primeira consulta depois de rebuild(). Nós inseridos ou movidos
+    depois disso ficam numa lista à parte (os antigos registros são marcados como inválidos),
+    incorporada na próxima montagem quando passa de MAX_PENDING.
+    """
+
+    DEFAULT_CELL_SIZE = 1.0
+
+    # Nós fora da grade (inseridos ou movidos) antes de remontá-la
+    MAX_PENDING = 256
+
+    # Anéis de células visitados por nearest() antes de passar à busca direta
+    MAX_RINGS = 8
+
+    def __init__(self, coords, tolerance=1e-9):
+        """coords(): colunas (X, Y) atuais do modelo."""
+        self.coords = coords
+        self.tolerance = tolerance
+        self.rebuild()
+
+    def __len__(self):
+        self._ensure()
+        return len(self.items) - int(self.stale.sum()) + len(self.pending)
+
+    def rebuild(self):
+        """Descarta a grade; ela é remontada a partir das colunas do modelo na próxima consulta."""
+        self._built = False
+        self.pending = {}   # índice -> (x, y) dos nós fora da grade
+
+    def _ensure(self):
+        if self._built and len(self.pending) <= self.MAX_PENDING: return
+        x, y = self.coords()
+        self.x, self.y = x, y
+        self.pending = {}
+        self._built = True
+        count = len(x)
+        self.stale = np.zeros(count, dtype=bool)  # Registros da grade que já não valem (nós movidos/removidos)
+        self.cell_size = max(self.DEFAULT_CELL_SIZE, 2 * self.tolerance)
+        if count == 0:
+            self.origin = np.zeros(2)
+            self.shape = np.ones(2, dtype=np.int64)
+            self.cells = np.zeros(0, dtype=np.int64)
+            self.starts = np.zeros(1, dtype=np.int64)
+            self.items = np.zeros(0, dtype=np.int64)
+            return
+
+        self.origin = np.array([x.min(), y.min()])
+        extent = np.array([x.max(), y.max()]) - self.origin
+        if extent.max() > 0:
+            self.cell_size = max(extent.max() / math.sqrt(count), 2 * self.tolerance)
+        self.shape = np.floor(extent / self.cell_size).astype(np.int64) + 1
+
+        col = np.floor((x - self.origin[0]) / self.cell_size).astype(np.int64)
+        row = np.floor((y - self.origin[1]) / self.cell_size).astype(np.int64)
+        code = row * self.shape[0] + col
+        self.items = np.argsort(code, kind='stable')
+        sorted_code = code[self.items]
+        first = np.flatnonzero(np.r_[True, sorted_code[1:] != sorted_code[:-1]])
+        self.cells = sorted_code[first]
+        self.starts = np.append(first, count)
+
+    def _cell(self, x, y):
+        return (math.floor((x - self.origin[0]) / self.cell_size), math.floor((y - self.origin[1]) / self.cell_size))
+
+    def _items_in(self, cols, rows):
+        """Índices válidos da grade nas células (cols, rows) dadas."""
+        cols, rows = np.asarray(cols, dtype=np.int64), np.asarray(rows, dtype=np.int64)
+        inside = (cols >= 0) & (rows >= 0) & (cols < self.shape[0]) & (rows < self.shape[1])
+        if not inside.any() or len(self.cells) == 0:
+            return np.zeros(0, dtype=np.int64)
+        codes = rows[inside] * self.shape[0] + cols[inside]
+        k = np.searchsorted(self.cells, codes).clip(max=len(self.cells) - 1)
+        k = k[self.cells[k] == codes]
+        counts = self.starts[k + 1] - self.starts[k]
+        positions = np.repeat(self.starts[k] - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+        items = self.items[positions]
+        return items[~self.stale[items]]
+
+    def insert(self, index, x, y):
+        """Registra um nó novo (as colunas do modelo devem ser atualizadas antes da próxima consulta)."""
+        self._ensure()
+        self.pending[index] = (x, y)
+
+    def remove(self, index):
+        self._ensure()
+        if self.pending.pop(index, None) is None and index < len(self.stale):
+            self.stale[index] = True
+
+    def move(self, index, x, y):
+        self.remove(index)
+        self.insert(index, x, y)
+
+    def renumber(self, keep):
+        """Nós removidos do modelo (keep: máscara dos que ficam, na numeração anterior).
+
+        Os índices restantes são renumerados como na compactação da tabela, sem remontar a
+        grade: a ordem por célula não muda, só saem os registros removidos.
+        """
+        if not self._built: return
+        keep = np.asarray(keep, dtype=bool)
+        new_index = np.cumsum(keep) - 1
+        valid = keep[self.items]
+        cell_of = np.repeat(np.arange(len(self.cells)), np.diff(self.starts))
+        counts = np.bincount(cell_of[valid], minlength=len(self.cells))
+        self.items = new_index[self.items[valid]]
+        self.cells = self.cells[counts > 0]
+        self.starts = np.append(0, np.cumsum(counts[counts > 0]))
+        self.stale = self.stale[keep[:len(self.stale)]]
+        self.pending = {int(new_index[index]): xy for index, xy in self.pending.items() if keep[index]}
+        self.x, self.y = self.coords()
+
+    def find(self, x, y, exclude=None):
+        """Retorna o índice de um nó a até 'tolerance' de (x, y), ou None."""
+        self._ensure()
+        tol2 = self.tolerance ** 2
+        for index, (px, py) in self.pending.items():
+            if index != exclude and (px - x) ** 2 + (py - y) ** 2 <= tol2:
+                return index
+        col, row = self._cell(x, y)
+        items = self._items_in([col - 1, col, col + 1] * 3, [row - 1] * 3 + [row] * 3 + [row + 1] * 3)
+        close = (self.x[items] - x) ** 2 + (self.y[items] - y) ** 2 <= tol2
+        if exclude is not None: close &= items != exclude
+        return int(items[np.argmax(close)]) if close.any() else None
+
+    def nearest(self, x, y, max_distance=math.inf):
+        """Retorna (índice, distância) do nó mais próximo de (x, y), ou (None, inf).
+
+        Percorre anéis de células em torno do ponto; o anel r só contém pontos a pelo menos
+        (r - 1) * cell_size de distância, então a busca para assim que não pode melhorar.
+        """
+        self._ensure()
+        best_index, best_dist2 = None, math.inf
+        for index, (px, py) in self.pending.items():
+            dist2 = (px - x) ** 2 + (py - y) ** 2
+            if dist2 < best_dist2:
+                best_index, best_dist2 = index, dist2
+
+        col, row = self._cell(x, y)
+        # Limite de anéis: até max_distance, ou até a busca direta ficar mais barata
+        max_ring = int(min(max_distance / self.cell_size + 1, self.MAX_RINGS))
+        for r in range(max_ring + 1):
+            if best_index is not None and r > 0 and best_dist2 <= ((r - 1) * self.cell_size) ** 2:
+                break
+            side = np.arange(-r, r + 1)
+            if r == 0:
+                cols, rows = np.array([col]), np.array([row])
+            else:
+                inner = side[1:-1]
+                cols = col + np.concatenate([side, side, np.full(len(inner), -r), np.full(len(inner), r)])
+                rows = row + np.concatenate([np.full(len(side), -r), np.full(len(side), r), inner, inner])
+            best_index, best_dist2 = self._closest(self._items_in(cols, rows), x, y, best_index, best_dist2)
+        else:
+            # Anéis esgotados sem cobrir o raio pedido (ponto longe ou grade densa): busca direta
+            covered = max_ring * self.cell_size
+            if covered < max_distance and best_dist2 > covered ** 2:
+                best_index, best_dist2 = self._closest(np.flatnonzero(~self.stale), x, y, best_index, best_dist2)
+
+        best_dist = math.sqrt(best_dist2)
+        if best_dist > max_distance: return None, math.inf
+        return best_index, best_dist
+
+    def find_many(self, x, y, exclude=None):
+        """Posições dos pontos (x, y) que coincidem com um nó do modelo ou com um ponto anterior da lista.
+
+        Verificação em lote (ex.: importação): só os nós dentro da região dos pontos entram,
+        e a busca é a de close_pairs, sem consultas ponto a ponto. exclude: nós ignorados
+        (ex.: os que serão movidos para (x, y)).
+        """
+        x, y = np.asarray(x, dtype=float).ravel(), np.asarray(y, dtype=float).ravel()
+        if len(x) == 0: return np.zeros(0, dtype=np.int64)
+        X, Y = self.coords()
+        tol = self.tolerance
+        near = (X >= x.min() - tol) & (X <= x.max() + tol) & (Y >= y.min() - tol) & (Y <= y.max() + tol)
+        if exclude is not None: near[exclude] = False
+        existing = np.column_stack([X[near], Y[near]])
+        _, b = SpatialHash.close_pairs(np.vstack([existing, np.column_stack([x, y])]), tol)
+        return np.unique(b[b >= len(existing)] - len(existing))
+
+    def _closest(self, items, x, y, best_index, best_dist2):
+        if len(items) == 0: return best_index, best_dist2
+        dist2 = (self.x[items] - x) ** 2 + (self.y[items] - y) ** 2
+        k = int(np.argmin(dist2))
+        if dist2[k] < best_dist2:
+            return int(items[k]), float(dist2[k])
+        return best_index, best_dist2
+
+    # --- PARES PRÓXIMOS EM LOTE ---
+
+    # Células vizinhas visitadas a partir de cada célula (metade da vizinhança: cada par é visto uma vez)
+    NEIGHBOR_OFFSETS = [(0, 0), (1, -1), (1, 0), (1, 1), (0, 1)]
+
+    # Pares candidatos por ponto acima dos quais a célula é reduzida (pontos muito agrupados)
+    MAX_CANDIDATES_PER_POINT = 32
+
+    @staticmethod
+    def close_pairs(coords, tolerance, cell_size=None):
+        """Pares (a, b), a < b, de pontos a até 'tolerance' um do outro.
+
+        Pontos com coordenadas iguais formam par só com a primeira ocorrência (não todos os
+        pares entre si), o que basta para agrupar os pontos ou saber se um ponto tem outro
+        anterior próximo. cell_size: célula da grade (None = pela extensão dos pontos, reduzida
+        até a tolerância se eles estiverem muito agrupados).
+        """
+        coords = np.asarray(coords, dtype=float).reshape(-1, 2)
+        empty = np.zeros(0, dtype=np.int64)
+        if len(coords) < 2 or tolerance <= 0: return empty, empty
+
+        # Repetições exatas ligadas à primeira ocorrência; a grade só recebe pontos distintos
+        points, first, inverse = np.unique(coords, axis=0, return_index=True, return_inverse=True)
+        inverse = inverse.ravel()
+        copies = np.flatnonzero(first[inverse] != np.arange(len(coords)))
+        a, b = [first[inverse[copies]]], [copies]
+
+        if len(points) > 1:
+            extent = np.ptp(points, axis=0).max()
+            size = cell_size or extent / math.sqrt(len(points))
+            # Célula nunca menor que a tolerância (só vizinhas imediatas) nem que a precisão das coordenadas
+            size = max(size, tolerance, extent * 2.0 ** -50)
+            limit = None if cell_size else SpatialHash.MAX_CANDIDATES_PER_POINT * len(points)
+            pairs = SpatialHash._grid_pairs(points, tolerance, size, limit)
+            while pairs is None:
+                size = max(size / 16, tolerance)
+                pairs = SpatialHash._grid_pairs(points, tolerance, size, None if size == tolerance else limit)
+            a.append(first[pairs[0]])
+            b.append(first[pairs[1]])
+
+        a, b = np.concatenate(a), np.concatenate(b)
+        return np.minimum(a, b), np.maximum(a, b)
+
+    @staticmethod
+    def _grid_pairs(points, tolerance, size, limit=None):
+        """Pares próximos numa grade de célula 'size' (None se houver mais de 'limit' candidatos).
+
+        Com os códigos das células ordenados, cada célula vizinha é localizada por busca
+        binária (searchsorted), o que deixa a passagem em O(n log n).
+        """
+        keys = np.floor((points - points.min(axis=0)) / size).astype(np.int64)
+        # Cada eixo é reduzido à posição entre os valores distintos (evita estouro de inteiros
+        # com células pequenas); a célula vira um único código inteiro ordenável
+        axes = [np.unique(keys[:, k]) for k in range(2)]
+        rank = lambda k, values: np.searchsorted(axes[k], values).clip(0, len(axes[k]) - 1)
+        code = rank(0, keys[:, 0]) * len(axes[1]) + rank(1, keys[:, 1])
+        order = np.argsort(code, kind='stable')
+        sorted_code = code[order]
+
+        ranges = []
+        for dx, dy in SpatialHash.NEIGHBOR_OFFSETS:
+            # Código da célula vizinha (-1 se nenhuma célula ocupada tem essa coluna/linha)
+            tx, ty = keys[order, 0] + dx, keys[order, 1] + dy
+            rx, ry = rank(0, tx), rank(1, ty)
+            exists = (axes[0][rx] == tx) & (axes[1][ry] == ty)
+            target = np.where(exists, rx * len(axes[1]) + ry, -1)
+            lo = np.searchsorted(sorted_code, target, side='left')
+            hi = np.where(exists, np.searchsorted(sorted_code, target, side='right'), lo)
+            ranges.append((dx, dy, lo, hi - lo))
+        if limit is not None and sum(int(counts.sum()) for *_, counts in ranges) > limit:
+            return None
+
+        first, second = [], []
+        for dx, dy, lo, counts in ranges:
+            # Expande cada ponto contra todos os pontos da célula vizinha
+            a = np.repeat(np.arange(len(order)), counts)
+            b = np.repeat(lo - np.cumsum(counts) + counts, counts) + np.arange(counts.sum())
+            if (dx, dy) == (0, 0):
+                same = a < b
+                a, b = a[same], b[same]
+            a, b = order[a], order[b]
+            close = np.hypot(*(points[a] - points[b]).T) <= tolerance
+            first.append(a[close])
+            second.append(b[close])
+        return np.concatenate(first), np.concatenate(second)
+
+class BoxGrid:
+    """Grade estática sobre retângulos (xmin, ymin, xmax, ymax) para consultas por região.
+
+    Ao contrário do SpatialHash (nós, com inserção e remoção), é montada de uma vez com NumPy
+    e serve para muitos itens com extensão (símbolos, textos, barras) consultados por janela.
+
+    Cada item é registrado em todas as células que o seu retângulo cobre; os registros ficam
+    ordenados pelo código da célula (linha * num_colunas + coluna), como em uma matriz CSR.
+    As células de uma linha da grade são contíguas nessa ordem, então uma consulta lê uma
+    fatia por linha coberta e o custo depende só do que está perto da região consultada.
+    Itens que cobririam muitas células (ex.: barras muito longas) ficam numa lista à parte
+    e entram em todas as consultas.
+    """
+
+    # Máximo de células por eixo
+    MAX_CELLS = 1024
+
+    # Itens que cobrem mais células que isso ficam na lista de itens grandes
+    MAX_ITEM_CELLS = 64
+
+    def __init__(self, boxes):
+        self.boxes = np.asarray(boxes, dtype=float).reshape(-1, 4)
+        count = len(self.boxes)
+        self.origin = self.boxes[:, :2].min(axis=0) if count else np.zeros(2)
+        self.corner = self.boxes[:, 2:].max(axis=0) if count else np.zeros(2)
+        extent = self.corner - self.origin
+
+        # Célula: área da região dividida igualmente entre os itens, sem ficar menor que o item típico
+        area = max(extent[0], 1e-12) * max(extent[1], 1e-12)
+        size = np.sqrt(area / max(count, 1))
+        if count:
+            size = max(size, np.median((self.boxes[:, 2:] - self.boxes[:, :2]).max(axis=1)))
+        size = max(size, extent.max() / self.MAX_CELLS, 1e-12)
+        self.cell_size = size
+        self.shape = (np.floor(extent / size).astype(np.int64) + 1).clip(1, self.MAX_CELLS)
+
+        # Faixa de células de cada item
+        low, high = self._cells(self.boxes[:, :2]), self._cells(self.boxes[:, 2:])
+        span = high - low + 1
+        cells = span[:, 0] * span[:, 1]
+        large = cells > self.MAX_ITEM_CELLS
+        self.large = np.flatnonzero(large)
+        small = np.flatnonzero(~large)
+
+        # Um registro por (item, célula coberta)
+        counts = cells[small]
+        items = np.repeat(small, counts)
+        offset = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        width = span[items, 0]
+        col = low[items, 0] + offset % width
+        row = low[items, 1] + offset // width
+        code = row * self.shape[0] + col
+        order = np.argsort(code, kind='stable')
+        self.items = items[order]
+        self.starts = np.searchsorted(code[order], np.arange(self.shape[0] * self.shape[1] + 1))
+
+    @classmethod
+    def from_points(cls, points, margin=0.0):
+        """Índice de pontos, cada um ocupando um quadrado de meia largura 'margin'."""
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        return cls(np.hstack([points - margin, points + margin]))
+
+    def __len__(self):
+        return len(self.boxes)
+
+    def _cells(self, points):
+        """Coluna e linha da célula de cada ponto (limitadas à grade)."""
+        cells = np.floor((np.asarray(points, dtype=float).reshape(-1, 2) - self.origin) / self.cell_size)
+        return cells.clip(0, self.shape - 1).astype(np.int64)
+
+    def query(self, xmin, ymin, xmax, ymax):
+        """Índices (ordenados) dos itens cujo retângulo toca a região dada."""
+        if len(self.boxes) == 0 or xmin > xmax or ymin > ymax:
+            return np.zeros(0, dtype=np.int64)
+        if xmin <= self.origin[0] and ymin <= self.origin[1] and self.corner[0] <= xmax and self.corner[1] <= ymax:
+            return np.arange(len(self.boxes))  # A região cobre todos os itens
+        (c0, r0), (c1, r1) = self._cells([[xmin, ymin], [xmax, ymax]])
+        rows = np.arange(r0, r1 + 1) * self.shape[0]
+        parts = [self.items[self.starts[start]:self.starts[stop]] for start, stop in zip((rows + c0).tolist(), (rows + c1 + 1).tolist())]
+        candidates = np.unique(np.concatenate(parts + [self.large]))
+        boxes = self.boxes[candidates]
+        inside = (boxes[:, 0] <= xmax) & (boxes[:, 2] >= xmin) & (boxes[:, 1] <= ymax) & (boxes[:, 3] >= ymin)
+        return candidates[inside]
@@ -0,0 +1,174 @@
+import numpy as np
+
+class ModelValidator:
+    """Verificações rápidas (tempo quase linear) do modelo antes da montagem do sistema.
+
+    Cada problema encontrado é um dicionário:
+        {"level": "error" | "warning", "kind": str, "message": str,
+         "nodes": array de índices de nós, "bars": array de índices de barras}
+    Os índices são 0-based; as mensagens usam a numeração da interface (a partir de 1).
+    """
+
+    ERROR = "error"
+    WARNING = "warning"
+
+    # Máximo de nós/barras citados em cada mensagem
+    MAX_LISTED = 10
+
+    @staticmethod
+    def _issue(level, kind, text, nodes=(), bars=()):
+        nodes = np.asarray(nodes, dtype=np.int64)
+        bars = np.asarray(bars, dtype=np.int64)
+        listed = []
+        if len(nodes): listed.append("Nós " + ModelValidator._ids(nodes))
+        if len(bars): listed.append("Barras " + ModelValidator._ids(bars))
+        message = f"{text}: {'; '.join(listed)}." if listed else f"{text}."
+        return {"level": level, "kind": kind, "message": message, "nodes": nodes, "bars": bars}
+
+    @staticmethod
+    def _ids(indices):
+        shown = ", ".join(str(i + 1) for i in indices[:ModelValidator.MAX_LISTED].tolist())
+        extra = len(indices) - ModelValidator.MAX_LISTED
+        return f"{shown} (e mais {extra})" if extra > 0 else shown
+
+    @staticmethod
+    def connected_components(num_nodes, node_i, node_j):
+        """Rótulo do componente conexo de cada nó (menor índice de nó do componente).
+
+        Union-find vetorizado: cada rodada liga as raízes das duas pontas de cada barra à
+        menor delas e depois comprime os caminhos (pointer jumping) até estabilizar.
+        """
+        labels = np.arange(num_nodes, dtype=np.int64)
+        if len(node_i) == 0: return labels
+        while True:
+            li, lj = labels[node_i], labels[node_j]
+            low = np.minimum(li, lj)
+            hooked = labels.copy()
+            np.minimum.at(hooked, li, low)
+            np.minimum.at(hooked, lj, low)
+            while True:
+                jumped = hooked[hooked]
+                if np.array_equal(jumped, hooked): break
+                hooked = jumped
+            if np.array_equal(hooked, labels): return labels
+            labels = hooked
+
+    @staticmethod
+    def validate(nodes, bars, tolerance=1e-9):
+        """Retorna a lista de problemas do modelo (vazia se estiver tudo certo).
+
+        nodes / bars: colunas dos nós e das barras (dict de arrays ou DataFrame), como no solver.
+        """
+        issues = []
+        column = lambda table, name, dtype=float: np.asarray(table[name], dtype=dtype)
+
+        coord = np.column_stack([column(nodes, "X"), column(nodes, "Y")]).reshape(-1, 2)
+        restraints = np.column_stack([column(nodes, name, bool) for name in ("Restr_X", "Restr_Y", "Restr_Rz")]).reshape(-1, 3)
+        num_nodes = len(coord)
+        node_i, node_j = column(bars, "node_i", np.int64), column(bars, "node_j", np.int64)
+        rot_i, rot_j = column(bars, "rot_i", bool), column(bars, "rot_j", bool)
+        E, A, I = column(bars, "E"), column(bars, "A"), column(bars, "I")
+
+        if num_nodes == 0:
+            return [ModelValidator._issue(ModelValidator.ERROR, "empty", "O modelo não tem nós")]
+
+        # --- Barras com referências inválidas (excluídas das demais verificações) ---
+        dangling = (node_i < 0) | (node_j < 0) | (node_i >= num_nodes) | (node_j >= num_nodes)
+        if dangling.any():
+            issues.append(ModelValidator._issue(ModelValidator.ERROR, "dangling", "Barras ligadas a nós inexistentes", bars=np.flatnonzero(dangling)))
+        same = ~dangling & (node_i == node_j)
+        if same.any():
+            issues.append(ModelValidator._issue(ModelValidator.ERROR, "self_loop", "Barras com os dois extremos no mesmo nó", bars=np.flatnonzero(same)))
+        valid = ~(dangling | same)
+        bar_ids = np.flatnonzero(valid)
+        ni, nj = node_i[valid], node_j[valid]
+
+        # --- Comprimento e propriedades ---
+        lengths = np.hypot(*(coord[nj] - coord[ni]).T) if len(bar_ids) else np.zeros(0)
+        short = lengths < tolerance
+        if short.any():
+            issues.append(ModelValidator._issue(ModelValidator.ERROR, "zero_length", "Barras com comprimento zero", bars=bar_ids[short]))
+        truss = rot_i[valid] & rot_j[valid]
+        bad_section = (E[valid] <= 0) | (A[valid] <= 0) | ((I[valid] <= 0) & ~truss)
+        if bad_section.any():
+            issues.append(ModelValidator._issue(ModelValidator.ERROR, "section", "Barras com E, A ou I nulos ou negativos", bars=bar_ids[bad_section]))
+
+        # --- Nós sem barras ---
+        degree = np.bincount(np.concatenate([ni, nj]), minlength=num_nodes)
+        orphan = degree == 0
+        fixed = restraints.all(axis=1)
+        if (orphan & ~fixed).any():
+            issues.append(ModelValidator._issue(ModelValidator.ERROR, "orphan", "Nós soltos (sem barras e sem engaste)", nodes=np.flatnonzero(orphan & ~fixed)))
+        if (orphan & fixed).any():
+            issues.append(ModelValidator._issue(ModelValidator.WARNING, "orphan", "Nós sem barras", nodes=np.flatnonzero(orphan & fixed)))
+
+        # --- Nós com todas as barras rotuladas e rotação livre ---
+        # O solver tira a rotação desses nós do sistema; um momento aplicado neles não teria onde atuar
+        released = np.bincount(np.concatenate([ni[rot_i[valid]], nj[rot_j[valid]]]), minlength=num_nodes)
+        hinged = ~orphan & (released == degree) & ~restraints[:, 2]
+        loaded = hinged & (column(nodes, "Mz") != 0)
+        if loaded.any():
+            issues.append(ModelValidator._issue(ModelValidator.ERROR, "hinged_node", "Momento aplicado em nós com todas as barras rotuladas (restrinja Rz ou remova uma rótula)", nodes=np.flatnonzero(loaded)))
+
+        # --- Apoios suficientes em cada parte conexa da estrutura ---
+        labels = ModelValidator.connected_components(num_nodes, ni, nj)
+        unstable = ModelValidator._unrestrained_components(coord, restraints, labels, ~orphan)
+        if len(unstable):
+            comp_nodes = np.flatnonzero(np.isin(labels, unstable) & ~orphan)
+            text = "Estrutura hipostática (apoios insuficientes para impedir movimento de corpo rígido)"
+            if len(np.unique(labels[~orphan])) > 1:
+                text = f"{len(unstable)} parte(s) desconexa(s) da estrutura com apoios insuficientes"
+            issues.append(ModelValidator._issue(ModelValidator.ERROR, "mechanism", text, nodes=comp_nodes, bars=bar_ids[np.isin(labels[ni], unstable)]))
+
+        return issues
+
+    @staticmethod
+    def _unrestrained_components(coord, restraints, labels, mask):
+        """Rótulos dos componentes cujos apoios não impedem os 3 movimentos de corpo rígido.
+
+        Cada restrição é uma linha que "vê" os modos u=(1,0,0), v=(0,1,0) e rotação
+        θ=(-(y-yc), x-xc, 1). O componente está apoiado se essas linhas têm posto 3.
+        """
+        components, comp = np.unique(labels[mask], return_inverse=True)
+        if len(components) == 0: return components
+        nodes = np.flatnonzero(mask)
+        xy = coord[nodes]
+
+        # Centro e escala de cada componente (deixa a matriz bem condicionada)
+        count = np.bincount(comp)
+        center = np.column_stack([np.bincount(comp, xy[:, k]) / count for k in range(2)])
+        local = xy - center[comp]
+        scale = np.maximum(np.bincount(comp, np.abs(local).max(axis=1)) / count, 1e-12)
+        local = local / scale[comp, np.newaxis]
+
+        # Linhas de restrição (uma por GL restringido) acumuladas em C^T C (3x3 por componente)
+        rows = np.zeros((len(nodes), 3, 3))
+        rows[:, 0] = np.column_stack([np.ones(len(nodes)), np.zeros(len(nodes)), -local[:, 1]])
+        rows[:, 1] = np.column_stack([np.zeros(len(nodes)), np.ones(len(nodes)), local[:, 0]])
+        rows[:, 2, 2] = 1.0
+        rows *= restraints[nodes][:, :, np.newaxis]
+        gram = np.zeros((len(components), 3, 3))
+        np.add.at(gram, comp, np.einsum('nri,nrj->nij', rows, rows))
+
+        rank = np.linalg.matrix_rank(gram, tol=1e-9)
+        return components[rank < 3]
+
+    @staticmethod
+    def errors(issues):
+        return [issue for issue in issues if issue["level"] == ModelValidator.ERROR]
+
+    @staticmethod
+    def report(issues):
+        """Texto com um problema por linha (erros primeiro)."""
+        ordered = sorted(issues, key=lambda issue: issue["level"] != ModelValidator.ERROR)
+        prefix = {ModelValidator.ERROR: "Erro", ModelValidator.WARNING: "Aviso"}
+        return "\n".join(f"{prefix[issue['level']]}: {issue['message']}" for issue in ordered)
+
+    @staticmethod
+    def check(nodes, bars, tolerance=1e-9):
+        """Valida o modelo e lança ValueError com o relatório se houver erros."""
+        issues = ModelValidator.validate(nodes, bars, tolerance)
+        errors = ModelValidator.errors(issues)
+        if errors:
+            raise ValueError("Modelo inválido:\n" + ModelValidator.report(errors))
+        return issues
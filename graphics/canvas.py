@@ -0,0 +1,19 @@
+from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
+from matplotlib.figure import Figure
+
+# A classe do Canvas fica aqui
+class MatplotlibCanvas(FigureCanvas):
+    def __init__(self, parent=None, width=5, height=4, dpi=100):
+        fig = Figure(figsize=(width, height), dpi=dpi)
+        self.axes = fig.add_subplot(111)
+        super(MatplotlibCanvas, self).__init__(fig)
+        self.setParent(parent)
+        
+        # Toolbar escondida
+        self.toolbar = NavigationToolbar(self, self)                                         # Cria Toolbar (Deletar e adicionar a menu bar (View))
+        self.toolbar.hide()
+        
+        # Pan inicialmente habilitado
+        self.toolbar.pan()
+
@@ -0,0 +1,150 @@
+from core.picking import ModelPicker
+
+class CanvasInspector:
+    """Dica sob o cursor e seleção por clique no desenho do modelo.
+
+    O elemento apontado vem do ModelPicker (refeito só quando a geometria muda). Dica e
+    destaques são artistas animados: ficam fora do desenho normal e são pintados por cima
+    do fundo guardado a cada desenho completo (blit), então mover o mouse não redesenha a
+    estrutura.
+    """
+
+    # Distância máxima (pixels) do cursor ao elemento apontado
+    PICK_PIXELS = 6
+
+    # Deslocamento máximo (pixels) entre apertar e soltar o botão para contar como clique
+    CLICK_PIXELS = 3
+
+    def __init__(self, canvas, model, on_select=None):
+        """model(): (node_arrays, bar_arrays, resultados ou None) atuais.
+
+        on_select(escolhido, linhas): chamado a cada clique (escolhido None = nada sob o cursor).
+        """
+        self.canvas = canvas
+        self.ax = canvas.axes
+        self.model = model
+        self.on_select = on_select
+        self.picker = None
+        self.hovered = None
+        self.selected = None
+        self.background = None
+        self.press = None
+        self.artists = None
+
+        canvas.mpl_connect('draw_event', self._on_draw)
+        canvas.mpl_connect('motion_notify_event', self._on_move)
+        canvas.mpl_connect('button_press_event', self._on_press)
+        canvas.mpl_connect('button_release_event', self._on_release)
+        canvas.mpl_connect('figure_leave_event', self._on_leave)
+
+    def invalidate(self):
+        """Geometria modificada: o índice é refeito na próxima consulta e a seleção é desfeita."""
+        self.picker = None
+        self.hovered = self.selected = None
+        self._update_artists()
+        self._blit()
+
+    def pick(self, x, y):
+        """Elemento sob o ponto (x, y), em unidades do desenho (ver ModelPicker.pick)."""
+        if self.picker is None:
+            nodes, bars, _ = self.model()
+            self.picker = ModelPicker.from_model(nodes, bars)
+        (x0, x1) = sorted(self.ax.get_xlim())
+        tolerance = self.PICK_PIXELS * max(x1 - x0, 1e-12) / max(self.ax.bbox.width, 1)
+        return self.picker.pick(x, y, tolerance)
+
+    def describe(self, picked):
+        return ModelPicker.describe(picked, self.model()[2])
+
+    # --- ARTISTAS ---
+
+    def _create_artists(self):
+        """Artistas animados da dica e dos destaques (recriados se o Axes for limpo)."""
+        if self.artists is not None and self.artists["tooltip"].axes is self.ax: return
+        tooltip = self.ax.annotate("", (0, 0), xytext=(12, 12), textcoords='offset points', fontsize=8,
+                                   bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.9),
+                                   animated=True, visible=False, zorder=10)
+        # Barra e ponto apontados; barra ou nó selecionado
+        hover_bar, = self.ax.plot([], [], '-', color='orange', linewidth=3, animated=True, visible=False, zorder=9)
+        hover_point, = self.ax.plot([], [], 'o', color='orange', markersize=7, animated=True, visible=False, zorder=9)
+        selected, = self.ax.plot([], [], '-o', color='red', linewidth=3, markersize=7, animated=True, visible=False, zorder=9)
+        self.artists = {"tooltip": tooltip, "hover_bar": hover_bar, "hover_point": hover_point, "selected": selected}
+
+    def _segment(self, picked):
+        """Pontos desenhados no destaque: a barra inteira ou o nó."""
+        if picked["kind"] == "bar":
+            return self.picker.segments[picked["index"]]
+        return picked["point"].reshape(1, 2)
+
+    def _update_artists(self):
+        if self.artists is None: return
+        self._create_artists()
+        tooltip, hover_bar = self.artists["tooltip"], self.artists["hover_bar"]
+        hover_point, selected = self.artists["hover_point"], self.artists["selected"]
+
+        hovered = self.hovered
+        tooltip.set_visible(hovered is not None)
+        hover_point.set_visible(hovered is not None)
+        hover_bar.set_visible(hovered is not None and hovered["kind"] == "bar")
+        if hovered is not None:
+            tooltip.xy = tuple(hovered["point"])
+            tooltip.set_text("\n".join(self.describe(hovered)))
+            hover_point.set_data([hovered["point"][0]], [hovered["point"][1]])
+            if hovered["kind"] == "bar":
+                segment = self._segment(hovered)
+                hover_bar.set_data(segment[:, 0], segment[:, 1])
+
+        selected.set_visible(self.selected is not None)
+        if self.selected is not None:
+            segment = self._segment(self.selected)
+            selected.set_data(segment[:, 0], segment[:, 1])
+
+    def _blit(self):
+        """Repinta só os artistas animados sobre o fundo do último desenho completo."""
+        if self.background is None or self.artists is None: return
+        self.canvas.restore_region(self.background)
+        for artist in self.artists.values():
+            if artist.get_visible() and artist.axes is self.ax:
+                self.ax.draw_artist(artist)
+        self.canvas.blit(self.canvas.figure.bbox)
+
+    # --- EVENTOS ---
+
+    def _on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        if self.artists is not None and self.artists["tooltip"].axes is not self.ax:
+            self.artists = None  # Axes limpo (cla): os artistas são recriados quando necessário
+            self.hovered = self.selected = None
+        self._blit()
+
+    def _on_move(self, event):
+        # Arrastando (pan/zoom) ou fora do gráfico: sem dica
+        picked = None
+        if event.inaxes is self.ax and event.button is None and event.xdata is not None:
+            picked = self.pick(event.xdata, event.ydata)
+        if picked is None and self.hovered is None: return  # Nada a repintar
+        self.hovered = picked
+        if picked is not None: self._create_artists()
+        self._update_artists()
+        self._blit()
+
+    def _on_leave(self, event):
+        if self.hovered is None: return
+        self.hovered = None
+        self._update_artists()
+        self._blit()
+
+    def _on_press(self, event):
+        self.press = (event.x, event.y) if event.button == 1 and event.inaxes is self.ax else None
+
+    def _on_release(self, event):
+        press, self.press = self.press, None
+        if press is None or event.button != 1 or event.xdata is None: return
+        if abs(event.x - press[0]) > self.CLICK_PIXELS or abs(event.y - press[1]) > self.CLICK_PIXELS:
+            return  # Foi um arraste (pan), não um clique
+        self.selected = self.pick(event.xdata, event.ydata)
+        self._create_artists()
+        self._update_artists()
+        self._blit()
+        if self.on_select is not None:
+            self.on_select(self.selected, self.describe(self.selected) if self.selected is not None else [])
@@ -1,362 +1,911 @@
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.backends.backend_qt5agg import NavigationToolbar2QT as NavigationToolbar
-from matplotlib.figure import Figure
-import matplotlib.patches as patches
-from matplotlib.transforms import Affine2D
+from matplotlib.collections import LineCollection, PolyCollection
+from matplotlib.image import AxesImage
+from collections import OrderedDict
+import itertools
 import numpy as np
 import math
-
-# A classe do Canvas fica aqui
-class MatplotlibCanvas(FigureCanvas):
-    def __init__(self, parent=None, width=5, height=4, dpi=100):
-        fig = Figure(figsize=(width, height), dpi=dpi)
-        self.axes = fig.add_subplot(111)
-        super(MatplotlibCanvas, self).__init__(fig)
-        self.setParent(parent)
-        
-        # Toolbar escondida
-        self.toolbar = NavigationToolbar(self, self)                                         # Cria Toolbar (Deletar e adicionar a menu bar (View))
-        self.toolbar.hide()
-        
-        # Pan inicialmente habilitado
-        self.toolbar.pan()
+from core.changes import ModelChange
+from core.spatial_index import BoxGrid
+from graphics.tiles import TileRenderer, TileCache
 
 class StructuralPlotter:
+    """Desenho do modelo e dos resultados em camadas de artistas persistentes.
+
+    Cada camada (geometria, numeração, apoios, cargas, reações, diagramas, deformada) é um
+    grupo de artistas que fica no Axes entre os redesenhos. Uma modificação do modelo refaz
+    só as camadas que dependem dela, e as opções de exibição mudam apenas a visibilidade.
+
+    Numeração, apoios, cargas e reações são desenhados só para os elementos dentro da vista
+    e espaçados de pelo menos LOD_SPACING pixels na tela (nível de detalhe). Os elementos de
+    cada uma dessas camadas ficam num BoxGrid, e o recorte é refeito a cada pan/zoom.
+
+    No modo de ladrilhos (set_tile_mode), as camadas pesadas (TILED_LAYERS) são rasterizadas
+    fora da thread da interface e a tela só compõe as imagens prontas; durante pan/zoom a
+    última imagem é esticada até o ladrilho da nova vista chegar.
+    """
+
+    # Camadas, na ordem em que são montadas
+    LAYERS = ("geometry", "node_labels", "bar_labels", "supports", "loads",
+              "reactions", "diagram", "diagram_labels", "deformed")
+
+    # Tipos de modificação do modelo (ModelChange) que afetam cada camada do modelo
+    LAYER_CHANGES = {
+        "geometry": (ModelChange.GEOMETRY, ModelChange.TOPOLOGY),
+        "node_labels": (ModelChange.GEOMETRY, ModelChange.TOPOLOGY),
+        "bar_labels": (ModelChange.GEOMETRY, ModelChange.TOPOLOGY),
+        "supports": (ModelChange.GEOMETRY, ModelChange.TOPOLOGY, ModelChange.SUPPORT),
+        "loads": (ModelChange.GEOMETRY, ModelChange.TOPOLOGY, ModelChange.LOAD),
+    }
+
+    # Camadas refeitas quando chegam resultados novos
+    RESULT_LAYERS = ("reactions", "diagram", "diagram_labels", "deformed")
+
+    # Camadas com um símbolo ou texto por elemento, recortadas pela vista
+    CULLED_LAYERS = ("node_labels", "bar_labels", "supports", "loads", "reactions")
+
+    # Espaçamento mínimo na tela (pixels) entre elementos desenhados de cada camada
+    LOD_SPACING = {"node_labels": 30, "bar_labels": 30, "supports": 15, "loads": 25, "reactions": 25}
+
+    # Máximo de elementos desenhados por camada (e por tipo de elemento) na vista
+    MAX_CULLED_ITEMS = 400
+
+    # Diagramas já desenhados para os resultados atuais ficam guardados (ocultos) ao trocar de
+    # vista; voltar a um deles só troca os artistas. O da vista que acabou de sair sempre fica;
+    # os demais saem, os usados há mais tempo primeiro, quando há mais de MAX_CACHED_DIAGRAMS
+    # guardados ou mais de MAX_CACHED_VERTICES vértices nos artistas guardados. O limite de
+    # vértices comporta os outros dois diagramas do modelo de benchmarks/bench_plotter.py
+    # (50 mil barras: ~7,6 milhões de vértices por diagrama com DIAGRAM_STATIONS = 50).
+    MAX_CACHED_DIAGRAMS = 3
+    MAX_CACHED_VERTICES = 16_000_000
+
+    # Camadas rasterizadas em ladrilhos no modo de ladrilhos (as recortadas já são leves)
+    TILED_LAYERS = ("geometry", "diagram", "deformed")
+
+    # Ordem de desenho da imagem de cada camada
+    TILE_ZORDER = {"geometry": 1, "diagram": 0, "deformed": 1}
+
+    # Folga do ladrilho em torno da vista (fração da vista de cada lado) e tamanho máximo (pixels)
+    TILE_MARGIN = 0.5
+    TILE_MAX_PIXELS = 4096
+
     def __init__(self, canvas):
         self.canvas = canvas
         self.ax = canvas.axes
+        self._tile_mode = False
+        self._submit = None                   # Executor dos ladrilhos (None = na própria thread)
+        self._revisions = itertools.count(1)  # Revisões das camadas (nunca se repetem, nem após clear)
+        self._setup_scene()
+
+    def _setup_scene(self):
+        """Cria o Axes vazio, as camadas e os artistas fixos da geometria."""
+        self.ax.set_xlabel('X (m)')
+        self.ax.set_ylabel('Y (m)')
+        self.ax.set_aspect('equal', adjustable='datalim')
+
+        # Barras e nós: sempre os mesmos artistas, só os dados mudam
+        self.bar_lines = LineCollection([], colors='k', linewidths=1.5, zorder=1)
+        self.ax.add_collection(self.bar_lines, autolim=False)
+        self.node_markers, = self.ax.plot([], [], 'ko', markersize=5, zorder=2)
+
+        self.layers = {name: [] for name in self.LAYERS}
+        self.layers["geometry"] = [self.bar_lines, self.node_markers]
+        self._stale = set(self.LAYERS)  # Camadas desatualizadas (refeitas quando ficarem visíveis)
+        self._model = None              # Últimas tabelas recebidas (nodes_df, bars_df)
+        self._results = None            # Resultados usados nas camadas de resultado
+        self._view = None
+        self._state = None              # Modo, grade e visibilidade do último desenho
+        self._diagram_data = None       # Geometria do diagrama atual (usada pelos rótulos)
+        self._diagram_cache = OrderedDict()  # Vista -> artistas e geometria de um diagrama guardado
+        self._visible = {}              # Visibilidade de cada camada no último desenho
+        self._items = {}                # Elementos e índice espacial das camadas recortadas
+        self._kept = {}                 # Elementos desenhados em cada camada recortada
+        self._culling = False
+        # Pontos extremos de cada coleção (calculados com NumPy ao criar; o Matplotlib percorreria os paths)
+        self._bounds = {}
+        # Dados e estilo de cada artista das camadas em ladrilhos, para redesenhá-lo fora da tela
+        self._sources = {}
+        self._tile_revision = {name: next(self._revisions) for name in self.TILED_LAYERS}
+        self._tiles = TileCache()
+        self._tile_images = {}                # Camada -> imagem (AxesImage) com o ladrilho atual
+        self._tile_pending = {}               # Camada -> chave do ladrilho em renderização
+
+        # Pan e zoom refazem o recorte das camadas por elemento
+        self.ax.callbacks.connect('xlim_changed', self._on_limits_changed)
+        self.ax.callbacks.connect('ylim_changed', self._on_limits_changed)
 
     def clear(self):
+        """Apaga tudo e recomeça a cena."""
         self.ax.cla()
+        self._setup_scene()
 
-    def draw_structure(self, nodes_df, bars_df, analysis_results, view_mode, show_grid, count_nodes, count_bars, show_reactions):
-        self.clear()
-        
-        # Chama as sub-funções
-        self._plot_structure_base(nodes_df, bars_df, count_nodes, count_bars)
+    @staticmethod
+    def _segments(coord, connectivity):
+        """Segmentos (n_barras, 2, 2) das barras, prontos para uma LineCollection."""
+        return np.asarray(coord, dtype=float)[np.asarray(connectivity, dtype=int).reshape(-1, 2)]
+
+    def _add_lines(self, segments, **kwargs):
+        """Desenha todas as barras de uma camada como um único artista."""
+        collection = self._add_collection(LineCollection(segments, **kwargs), segments)
+        self._sources[collection] = ("lines", segments, kwargs)
+        return collection
+
+    def _add_collection(self, collection, points):
+        self.ax.add_collection(collection, autolim=False)  # Limites vêm de _bounds (ver _rescale)
+        self._set_bounds(collection, points)
+        return collection
+
+    def _set_bounds(self, collection, points):
+        points = np.asarray(points, dtype=float).reshape(-1, 2)
+        if len(points) == 0:
+            self._bounds[collection] = None
+            return
+        # Mínimo e máximo por coluna (a redução com axis=0 num array (n, 2) é bem mais lenta)
+        x, y = points[:, 0], points[:, 1]
+        self._bounds[collection] = np.array([[x.min(), y.min()], [x.max(), y.max()]])
+
+    @staticmethod
+    def _glyph_scale(coord):
+        """Tamanho de referência dos símbolos (apoios, setas): 1/5 da diagonal da estrutura."""
+        x_coords = coord[:, 0]
+        y_coords = coord[:, 1]
+        x_min, x_max = (x_coords.min(), x_coords.max()) if len(x_coords) > 0 else (0, 1)
+        y_min, y_max = (y_coords.min(), y_coords.max()) if len(y_coords) > 0 else (0, 1)
+        diag = math.sqrt((x_max - x_min)**2 + (y_max - y_min)**2)
+        return diag / 5 if diag > 0 else 0.6
+
+    # --- CENA ---
+
+    def draw_structure(self, nodes_df, bars_df, analysis_results, view_mode, show_grid, count_nodes, count_bars, show_reactions, change=None):
+        """Atualiza o desenho reaproveitando as camadas que não mudaram.
+
+        change: ModelChange da modificação que motivou o redesenho; só as camadas que dependem
+        dos tipos modificados são refeitas (None = todas as camadas do modelo). Resultados ou
+        modo de visualização novos refazem as camadas de resultado. Grade, numeração e reações
+        só mudam a visibilidade. O desenho na tela fica para o próximo ciclo (draw_idle), junto
+        com outros pedidos.
+        """
+        self._model = (nodes_df, bars_df)
+        self.invalidate(change)
+        if analysis_results is not self._results:
+            self._results = analysis_results
+            self._stale.update(self.RESULT_LAYERS)
+            self._drop_cached_diagrams()
+        if view_mode != self._view:
+            self._swap_diagram(view_mode)
+            self._view = view_mode
+
+        # Camadas visíveis em cada modo (as ocultas e desatualizadas só são refeitas ao aparecer)
+        diagram = 'Diagrama' in view_mode
+        visible = {
+            "geometry": True, "node_labels": count_nodes, "bar_labels": count_bars,
+            "supports": view_mode == 'Visualização', "loads": view_mode == 'Visualização',
+            "reactions": diagram and show_reactions, "diagram": diagram, "diagram_labels": diagram,
+            "deformed": view_mode == 'Deformação',
+        }
+        rebuilt = [name for name in self.LAYERS if visible[name] and name in self._stale]
+        for name in rebuilt:
+            if name in self.CULLED_LAYERS: self._index_layer(name)  # Desenhada por _cull, já com os limites finais
+            else: self._build_layer(name)
+            self._stale.discard(name)
+        for name in self._stale - {"geometry"}:
+            self._remove_layer(name)  # Artistas desatualizados de camadas ocultas não ficam na memória
+            self._items.pop(name, None)
 
-        if view_mode == 'Visualização':
-            self._plot_loads_and_supports(nodes_df, bars_df)
-        elif view_mode == 'Deformação':
-            self._plot_deformed_shape(analysis_results)
-        elif 'Diagrama' in view_mode:
-            self._plot_reactions(nodes_df, analysis_results, show_reactions)
-            self._plot_diagram(analysis_results, view_mode)
+        state = (view_mode, show_grid, tuple(visible.values()))
+        if not rebuilt and state == self._state: return  # Nada mudou no desenho
+        self._state = state
+        self._visible = visible
+
+        for name, artists in self.layers.items():
+            for artist in artists:
+                artist.set_visible(visible[name])
 
         # Configurações finais
-        self.ax.set_xlabel('X (m)')
-        self.ax.set_ylabel('Y (m)')
         self.ax.set_title(f'{view_mode}')
-        self.ax.axis('equal')
         if show_grid: self.ax.grid(True, linestyle='--', alpha=0.6)
-        self.canvas.draw()
+        else: self.ax.grid(False)
+        if rebuilt: self._rescale()
+        self._cull()
+        self._update_tiles()
+        self.canvas.draw_idle()
 
-# Plota base da estrutura (Nós e barras)
-    def _plot_structure_base(self, nodes_df, bars_df, count_nodes, count_bars):        
-        # Cancela se não houverem nós
-        if nodes_df.empty: return
-        
+    def invalidate(self, change=None):
+        """Marca as camadas do modelo afetadas por change (None = todas) para o próximo desenho."""
+        if change is None:
+            self._stale.update(self.LAYER_CHANGES)
+        else:
+            self._stale.update(name for name, kinds in self.LAYER_CHANGES.items() if change.affects(*kinds))
+
+    def reset_view(self):
+        """Volta os limites do gráfico para todos os artistas visíveis."""
+        self._rescale()
+        self._cull()
+        self._update_tiles()
+        self.canvas.draw_idle()
+
+    def _build_layer(self, name, kept=None):
+        """Refaz uma camada: remove os artistas antigos e guarda os criados pela função de desenho.
+
+        kept: nas camadas recortadas, índices (em _items) dos elementos a desenhar.
+        """
+        nodes_df, bars_df = self._model
+        if name in self.TILED_LAYERS:
+            self._tile_revision[name] = next(self._revisions)  # Ladrilhos anteriores ficam obsoletos
+        if name == "geometry":
+            self._plot_structure_base(nodes_df, bars_df)  # Atualiza os dados dos artistas fixos
+            return
+        nodes = bars = None
+        if name in self.CULLED_LAYERS:
+            items = self._items[name]
+            nodes = items["ids"][kept[items["groups"][kept] == 0]]
+            bars = items["ids"][kept[items["groups"][kept] == 1]]
+        builders = {
+            "node_labels": lambda: self._plot_node_labels(nodes_df, nodes),
+            "bar_labels": lambda: self._plot_bar_labels(nodes_df, bars_df, bars),
+            "supports": lambda: self._plot_supports(nodes_df, nodes),
+            "loads": lambda: self._plot_loads(nodes_df, bars_df, nodes, bars),
+            "reactions": lambda: self._plot_reactions(nodes_df, self._results, nodes),
+            "diagram": lambda: self._plot_diagram(self._results, self._view),
+            "diagram_labels": lambda: self._plot_diagram_labels(),
+            "deformed": lambda: self._plot_deformed_shape(self._results),
+        }
+        self._remove_layer(name)
+        before = set(map(id, self.ax.get_children()))
+        builders[name]()
+        self.layers[name] = [artist for artist in self.ax.get_children() if id(artist) not in before]
+
+    def _remove_layer(self, name):
+        self._remove_artists(self.layers[name])
+        self.layers[name] = []
+
+    def _remove_artists(self, artists):
+        for artist in artists:
+            artist.remove()
+            self._bounds.pop(artist, None)
+            self._sources.pop(artist, None)
+
+    # --- DIAGRAMAS GUARDADOS ---
+
+    def _swap_diagram(self, view_mode):
+        """Guarda o diagrama da vista atual e recupera o da nova vista, se já tiver sido desenhado."""
+        diagram_layers = ("diagram", "diagram_labels")
+        left = None
+        if self._view in self.DIAGRAMS and self._diagram_data is not None and self._stale.isdisjoint(diagram_layers):
+            entry = {name: self.layers[name] for name in diagram_layers}
+            for artists in entry.values():
+                for artist in artists:
+                    artist.set_visible(False)
+            entry["data"] = self._diagram_data
+            entry["vertices"] = self.diagram_vertices(self._diagram_data[4])
+            entry["revision"] = self._tile_revision["diagram"]       # Os ladrilhos continuam valendo
+            self._diagram_cache[self._view] = entry
+            self.layers.update({name: [] for name in diagram_layers})
+            self._diagram_data = None
+            left = self._view
+
+        entry = self._diagram_cache.pop(view_mode, None)
+        if entry is None:
+            self._stale.update(diagram_layers)
+        else:
+            self.layers.update({name: entry[name] for name in diagram_layers})
+            self._diagram_data = entry["data"]
+            self._tile_revision["diagram"] = entry["revision"]
+            self._stale.difference_update(diagram_layers)
+
+        # Política de descarte: os diagramas usados há mais tempo saem primeiro, menos o da vista
+        # que acabou de sair (ida e volta entre dois diagramas sempre só troca os artistas)
+        for view in list(self._diagram_cache):
+            if (len(self._diagram_cache) <= self.MAX_CACHED_DIAGRAMS and
+                    sum(entry["vertices"] for entry in self._diagram_cache.values()) <= self.MAX_CACHED_VERTICES):
+                break
+            if view == left: continue
+            entry = self._diagram_cache.pop(view)
+            self._remove_artists(entry["diagram"] + entry["diagram_labels"])
+
+    @staticmethod
+    def diagram_vertices(diag_points):
+        """Vértices dos artistas de um diagrama: polígonos fechados do preenchimento (base, diagrama
+        e o ponto de fechamento) e contorno."""
+        num_bars, num_points = diag_points.shape[:2]
+        return num_bars * (2 * num_points + 1) + num_bars * num_points
+
+    def _drop_cached_diagrams(self):
+        """Descarta os diagramas guardados (resultados novos)."""
+        for entry in self._diagram_cache.values():
+            self._remove_artists(entry["diagram"] + entry["diagram_labels"])
+        self._diagram_cache.clear()
+
+    def _rescale(self):
+        """Ajusta os limites aos artistas visíveis.
+
+        As coleções com limites conhecidos ficam de fora do relim (o Matplotlib percorreria
+        todos os paths) e entram pelos pontos extremos guardados em _bounds. As camadas
+        recortadas entram com a extensão de todos os seus elementos, não só dos desenhados.
+        A visibilidade considerada é a das camadas (no modo de ladrilhos os artistas ficam
+        ocultos e as imagens não contam). O recorte fica suspenso até o fim (quem chama
+        refaz com _cull).
+        """
+        self._culling = True
+        try:
+            known = [artist for name, artists in self.layers.items() if self._visible.get(name)
+                     for artist in artists if artist in self._bounds]
+            hidden = [artist for artist in known + list(self._tile_images.values()) if artist.get_visible()]
+            for artist in hidden:
+                artist.set_visible(False)
+            self.ax.relim(visible_only=True)
+            for artist in hidden:
+                artist.set_visible(True)
+            for artist in known:
+                if self._bounds[artist] is not None:
+                    self.ax.update_datalim(self._bounds[artist])
+            for name, items in self._items.items():
+                if self._visible.get(name): self.ax.update_datalim(items["extent"])
+            self.ax.set_autoscale_on(True)
+            self.ax.autoscale_view()
+            self.ax.apply_aspect()
+            # Limites fixos até o próximo ajuste (como depois de um pan): os artistas recriados
+            # pelo recorte não mexem na vista
+            self.ax.set_autoscale_on(False)
+        finally:
+            self._culling = False
+
+    # --- RECORTE PELA VISTA ---
+
+    def _layer_items(self, name):
+        """Elementos com algo a desenhar na camada.
+
+        Retorna um dicionário com, para cada elemento: ids (índice do nó ou da barra), groups
+        (0 = nó, 1 = barra), points (ponto de referência na tela) e boxes (retângulo
+        xmin, ymin, xmax, ymax que o desenho ocupa). None se não houver o que desenhar.
+        """
+        nodes_df, bars_df = self._model
+        coord = self._coords(nodes_df)
+        if len(coord) == 0: return None
+        scale = self._glyph_scale(coord)
+        nodes = bars = np.zeros(0, dtype=np.int64)
+        node_margin = bar_margin = 0.0  # Alcance dos símbolos em torno do nó / da barra
+
+        if name == "node_labels":
+            nodes = np.arange(len(coord))
+        elif name == "bar_labels":
+            bars = np.arange(len(bars_df))
+        elif name == "supports":
+            nodes = np.flatnonzero(nodes_df[["Restr_X", "Restr_Y", "Restr_Rz"]].values.astype(bool).any(axis=1))
+            node_margin = 0.35 * scale
+        elif name == "loads":
+            nodes = np.flatnonzero((nodes_df[["Fx", "Fy", "Mz"]].values.astype(float) != 0).any(axis=1))
+            if not bars_df.empty:
+                bars = np.flatnonzero(np.abs(bars_df["Q"].values.astype(float)) > 1e-6)
+            node_margin, bar_margin = 1.1 * scale, 0.75 * scale
+        elif name == "reactions":
+            if not self._results: return None
+            nodes = np.flatnonzero((self._results['reactions'][:len(coord)] != 0).any(axis=1))
+            node_margin = 1.1 * scale
+
+        if len(bars):
+            segments = self._segments(coord, bars_df[["node_i", "node_j"]].values[bars])
+        else:
+            segments = np.zeros((0, 2, 2))
+        node_xy = coord[nodes]
+        return {
+            "ids": np.concatenate([nodes, bars]),
+            "groups": np.repeat([0, 1], [len(nodes), len(bars)]),
+            "points": np.concatenate([node_xy, segments.mean(axis=1)]),
+            "boxes": np.concatenate([np.hstack([node_xy - node_margin, node_xy + node_margin]),
+                                     np.hstack([segments.min(axis=1) - bar_margin, segments.max(axis=1) + bar_margin])]),
+        }
+
+    def _index_layer(self, name):
+        """Recalcula os elementos de uma camada recortada e o índice espacial deles."""
+        self._remove_layer(name)
+        self._kept.pop(name, None)
+        items = self._layer_items(name)
+        if items is None or len(items["ids"]) == 0:
+            self._items.pop(name, None)
+            return
+        boxes = items["boxes"]
+        items["index"] = BoxGrid(boxes)
+        items["extent"] = np.array([boxes[:, :2].min(axis=0), boxes[:, 2:].max(axis=0)])
+        self._items[name] = items
+
+    def _visible_items(self, name, view, cell_size):
+        """Elementos da camada que tocam a vista, no máximo um por célula de cell_size (o de menor índice)."""
+        items = self._items[name]
+        inside = items["index"].query(*view)
+        kept = []
+        for group in (0, 1):
+            candidates = inside[items["groups"][inside] == group]
+            chosen = self.declutter(items["points"][candidates], -candidates.astype(float), cell_size, self.MAX_CULLED_ITEMS)
+            kept.append(candidates[chosen])
+        return np.sort(np.concatenate(kept))
+
+    def _cull(self):
+        """Refaz as camadas recortadas visíveis cujo conjunto de elementos na vista mudou."""
+        if self._culling or not self._items: return
+        self._culling = True
+        try:
+            (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+            pixels = self.ax.bbox.width / max(x1 - x0, 1e-12)  # Pixels por unidade do desenho
+            for name in list(self._items):
+                if not self._visible.get(name): continue
+                kept = self._visible_items(name, (x0, y0, x1, y1), self.LOD_SPACING[name] / pixels)
+                if name in self._kept and np.array_equal(self._kept[name], kept): continue
+                self._kept[name] = kept
+                self._build_layer(name, kept)
+        finally:
+            self._culling = False
+
+    def _on_limits_changed(self, ax):
+        if self._culling: return
+        self._cull()
+        self._update_tiles()
+
+    # --- LADRILHOS (RENDERIZAÇÃO EM SEGUNDO PLANO) ---
+
+    def set_tile_mode(self, enabled, submit=None):
+        """Liga ou desliga a renderização das camadas pesadas em ladrilhos.
+
+        submit(func, args, callback): executa func(*args) fora da thread da interface e chama
+        callback(resultado) de volta nela (resultado None = falha). Sem submit, os ladrilhos
+        são renderizados na hora. Até o primeiro ladrilho de uma camada ficar pronto, ela é
+        desenhada normalmente.
+        """
+        self._tile_mode = enabled
+        self._submit = submit
+        if not enabled:
+            for image in self._tile_images.values():
+                image.remove()
+            self._tile_images = {}
+            self._tile_pending.clear()
+            self._tiles.clear()
+            for name in self.TILED_LAYERS:
+                for artist in self.layers[name]:
+                    artist.set_visible(self._visible.get(name, True))
+        self._update_tiles()
+        self.canvas.draw_idle()
+
+    def _tile_image(self, name):
+        image = self._tile_images.get(name)
+        if image is None:
+            image = AxesImage(self.ax, zorder=self.TILE_ZORDER[name], interpolation='bilinear')
+            self.ax.add_image(image)
+            self._tile_images[name] = image
+        return image
+
+    def _update_tiles(self):
+        """Mostra, em cada camada em ladrilhos, o melhor ladrilho da vista e pede o que faltar."""
+        if not self._tile_mode: return
+        (x0, x1), (y0, y1) = sorted(self.ax.get_xlim()), sorted(self.ax.get_ylim())
+        if self.ax.bbox.width < 1 or x1 <= x0 or y1 <= y0: return
+        view = (x0, x1, y0, y1)
+        resolution = self.ax.bbox.width / (x1 - x0)  # Pixels por unidade do desenho
+        for name in self.TILED_LAYERS:
+            live = self.layers[name]
+            found = None
+            if self._visible.get(name) and any(artist in self._sources for artist in live):
+                revision = self._tile_revision[name]
+                found = self._tiles.find(name, revision, view, resolution)
+                if found is None or not found[2]:
+                    self._request_tile(name, revision, view, resolution)
+                    found = self._tiles.find(name, revision, view, resolution) or found
+
+            image = self._tile_images.get(name)
+            if found is not None:
+                key, data, _ = found
+                image = self._tile_image(name)
+                image.set_data(data)
+                image.set_extent(key[2])
+                image.sticky_edges.x[:] = []  # A imagem não limita o autoscale
+                image.sticky_edges.y[:] = []
+                image.set_visible(True)
+            elif image is not None:
+                image.set_visible(False)
+            for artist in live:
+                artist.set_visible(bool(self._visible.get(name)) and found is None)
+
+    def _request_tile(self, name, revision, view, resolution):
+        """Renderiza (ou manda renderizar) o ladrilho da camada em torno da vista; um por camada de cada vez."""
+        if name in self._tile_pending: return
+        x0, x1, y0, y1 = view
+        width, height = x1 - x0, y1 - y0
+        # Folga em volta da vista, reduzida (e depois a resolução) se o ladrilho passar do tamanho máximo
+        factor = max(1.0, min(1 + 2 * self.TILE_MARGIN, self.TILE_MAX_PIXELS / (max(width, height) * resolution)))
+        resolution = min(resolution, self.TILE_MAX_PIXELS / (max(width, height) * factor))
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        half_w, half_h = width * factor / 2, height * factor / 2
+        extent = (cx - half_w, cx + half_w, cy - half_h, cy + half_h)
+        size = (max(1, round(2 * half_w * resolution)), max(1, round(2 * half_h * resolution)))
+        specs = [self._sources[artist] for artist in self.layers[name] if artist in self._sources]
+        key = (name, revision, extent, size)
+        args = (specs, extent, size, self.canvas.figure.dpi)
+
+        if self._submit is None:
+            self._tiles.put(key, TileRenderer.render(*args))
+            return
+        self._tile_pending[name] = key
+        self._submit(TileRenderer.render, args, lambda image: self._tile_ready(key, image))
+
+    def _tile_ready(self, key, image):
+        """Recebe um ladrilho renderizado em segundo plano (na thread da interface)."""
+        name, revision = key[0], key[1]
+        if self._tile_pending.get(name) != key: return  # Modo desligado ou cena recriada
+        del self._tile_pending[name]
+        if image is None: return  # Falha: a camada continua como está até o próximo pan/zoom
+        if revision == self._tile_revision[name]:
+            self._tiles.put(key, image)
+        # Pede o próximo se a vista ou a camada mudaram enquanto este era renderizado
+        self._update_tiles()
+        self.canvas.draw_idle()
+
+    # --- CAMADAS DO MODELO ---
+
+    @staticmethod
+    def _coords(nodes_df):
+        return nodes_df[["X", "Y"]].values.astype(float).reshape(-1, 2)
+
+    # Plota base da estrutura (Nós e barras)
+    def _plot_structure_base(self, nodes_df, bars_df):
         # Carrega os valores das cooredadas x e y de cada nó
-        coord = nodes_df[["X", "Y"]].values.astype(float)
-        
-        # Plota as barras ligando as posições x e y dos nós iniciais e finais e numera as barras
-        if not bars_df.empty:
-            M = bars_df[["node_i", "node_j"]].values.astype(int)
-            for i in range(len(bars_df)):
-                node_i, node_j = M[i, 0], M[i, 1]
-                self.canvas.axes.plot([coord[node_i, 0], coord[node_j, 0]], [coord[node_i, 1], coord[node_j, 1]], 'k-', lw=1.5, zorder=1)       
-                if count_bars:
-                    self.canvas.axes.text((coord[node_j, 0] + coord[node_i, 0])/2, (coord[node_j, 1] + coord[node_i, 1])/2 , f' {i+1}', verticalalignment='top', color='blue', zorder=3) # Numeração das barras
-                
-        # Plota Nós nas posições x e y com numeração
-        self.canvas.axes.plot(coord[:, 0], coord[:, 1], 'ko', markersize=5, zorder=2)
-        for i, (x, y) in enumerate(coord):
-            if count_nodes:
-                self.canvas.axes.text(x, y, f' {i+1}', verticalalignment='bottom', color='purple', zorder=3) # Numeração dos nós
-
-    def _plot_loads_and_supports(self, nodes_df, bars_df):        
+        coord = self._coords(nodes_df)
+
+        # Barras ligando as posições x e y dos nós iniciais e finais (uma única coleção)
+        segments = np.zeros((0, 2, 2))
+        if not (bars_df.empty or nodes_df.empty):
+            segments = self._segments(coord, bars_df[["node_i", "node_j"]].values)
+        self.bar_lines.set_segments(segments)
+        self._set_bounds(self.bar_lines, segments)
+        self._sources[self.bar_lines] = ("lines", segments, dict(colors='k', linewidths=1.5, zorder=1))
+
+        # Nós nas posições x e y (um único artista com marcadores)
+        self.node_markers.set_data(coord[:, 0], coord[:, 1])
+        self._set_bounds(self.node_markers, coord)
+        self._sources[self.node_markers] = ("markers", (coord[:, 0], coord[:, 1], 'ko'), dict(markersize=5, zorder=2))
+
+    def _plot_node_labels(self, nodes_df, nodes):
+        coord = self._coords(nodes_df)
+        for i in nodes.tolist():
+            self.canvas.axes.text(coord[i, 0], coord[i, 1], f' {i+1}', verticalalignment='bottom', color='purple', zorder=3) # Numeração dos nós
+
+    def _plot_bar_labels(self, nodes_df, bars_df, bars):
+        if bars_df.empty or nodes_df.empty: return
+        segments = self._segments(self._coords(nodes_df), bars_df[["node_i", "node_j"]].values[bars])
+        for i, (x, y) in zip(bars.tolist(), segments.mean(axis=1)):
+            self.canvas.axes.text(x, y, f' {i+1}', verticalalignment='top', color='blue', zorder=3) # Numeração das barras
+
+    # --- SÍMBOLOS (geometria vetorizada, desenhada em poucas coleções) ---
+
+    # Símbolos dos apoios em coordenadas locais, em múltiplos da escala (nó na origem, antes da rotação)
+    SUPPORT_TRIANGLE = [(-0.15, -0.2), (0.15, -0.2), (0.0, 0.0)]
+    FIXED_LINE = [(-0.15, 0.0), (0.15, 0.0)]
+    FIXED_HATCH = [(-0.15, -0.1), (0.15, -0.1), (0.15, 0.0), (-0.15, 0.0)]
+    PINNED_HATCH = [(-0.15, -0.3), (0.15, -0.3), (0.15, -0.2), (-0.15, -0.2)]
+    ROLLER_LINE = [(-0.15, -0.25), (0.15, -0.25)]
+
+    # Pontos de cada arco das setas de momento
+    MOMENT_ARC_POINTS = 16
+
+    # Espaçamento (m) entre as setas de uma carga distribuída
+    DISTRIBUTED_ARROW_SPACING = 0.5
+
+    @staticmethod
+    def _place(coord, angles, template, scale):
+        """Copia um símbolo local (k, 2) para cada nó, girado de 'angles' graus: (n, k, 2)."""
+        local = np.asarray(template, dtype=float) * scale
+        angle = np.radians(np.asarray(angles, dtype=float))[:, np.newaxis]
+        cos, sin = np.cos(angle), np.sin(angle)
+        x, y = local[np.newaxis, :, 0], local[np.newaxis, :, 1]
+        return coord[:, np.newaxis, :] + np.stack([cos * x - sin * y, sin * x + cos * y], axis=-1)
+
+    @staticmethod
+    def support_glyphs(coord, restraints, angles, scale):
+        """Geometria dos apoios: (linhas (n, 2, 2), triângulos (n, 3, 2), retângulos hachurados (n, 4, 2)).
+
+        restraints: (n, 3) booleanos Restr_X, Restr_Y, Restr_Rz; angles: Restr_Rot em graus.
+        Engaste: linha e hachura no nó. 2º gênero: triângulo e hachura. 1º gênero: triângulo e
+        linha (girado de 270° se só X for restringido). Só Rz restringido não tem símbolo.
+        """
+        coord = np.asarray(coord, dtype=float).reshape(-1, 2)
+        rx, ry, rz = np.asarray(restraints, dtype=bool).reshape(-1, 3).T
+        fixed = rx & ry & rz
+        pinned = rx & ry & ~rz
+        roller = (rx | ry) & ~(rx & ry)
+        angles = np.where(roller & rx & ~ry, 270.0, np.asarray(angles, dtype=float))
+        place = lambda mask, template: StructuralPlotter._place(coord[mask], angles[mask], template, scale)
+
+        plotter = StructuralPlotter
+        lines = np.concatenate([place(fixed, plotter.FIXED_LINE), place(roller, plotter.ROLLER_LINE)])
+        triangles = np.concatenate([place(pinned, plotter.SUPPORT_TRIANGLE), place(roller, plotter.SUPPORT_TRIANGLE)])
+        hatches = np.concatenate([place(fixed, plotter.FIXED_HATCH), place(pinned, plotter.PINNED_HATCH)])
+        return lines, triangles, hatches
+
+    @staticmethod
+    def arrow_glyphs(tails, vectors, head_width, include_head=False):
+        """Setas retas (como Axes.arrow): hastes (n, 2, 2) e cabeças (n, 3, 2).
+
+        A cabeça tem 1,5 x head_width de comprimento; com include_head=False ela é somada ao
+        vetor, senão fica dentro dele.
+        """
+        tails = np.asarray(tails, dtype=float).reshape(-1, 2)
+        vectors = np.asarray(vectors, dtype=float).reshape(-1, 2)
+        head_length = 1.5 * head_width
+        length = np.hypot(vectors[:, 0], vectors[:, 1])[:, np.newaxis]
+        direction = vectors / np.where(length > 0, length, 1.0)
+        tips = tails + direction * (length if include_head else length + head_length)
+        neck = tips - direction * head_length
+        side = np.column_stack([-direction[:, 1], direction[:, 0]]) * head_width / 2
+        return np.stack([tails, neck], axis=1), np.stack([neck + side, tips, neck - side], axis=1)
+
+    @staticmethod
+    def moment_glyphs(coord, moments, scale):
+        """Setas curvas de momento sobre cada nó: arcos (n, k, 2) e cabeças (n, 3, 2).
+
+        Arco de Bézier quadrático entre (x ∓ 0,3 escala, y), com o mesmo controle do
+        connectionstyle "arc3,rad=±1": horário para momento negativo, anti-horário para positivo.
+        """
+        coord = np.asarray(coord, dtype=float).reshape(-1, 2)
+        offset = np.column_stack([0.3 * scale * np.sign(moments), np.zeros(len(coord))])
+        start, end = coord + offset, coord - offset
+        control = coord + [0.0, 0.6 * scale]
+        t = np.linspace(0, 1, StructuralPlotter.MOMENT_ARC_POINTS)[np.newaxis, :, np.newaxis]
+        arcs = (1 - t) ** 2 * start[:, np.newaxis] + 2 * (1 - t) * t * control[:, np.newaxis] + t ** 2 * end[:, np.newaxis]
+        # Cabeça na ponta, na direção da tangente final (controle -> fim)
+        head_width = 0.07 * scale
+        tangent = end - control
+        tangent *= 1.5 * head_width / np.hypot(tangent[:, 0], tangent[:, 1])[:, np.newaxis]
+        _, heads = StructuralPlotter.arrow_glyphs(end - tangent, tangent, head_width, include_head=True)
+        return arcs, heads
+
+    @staticmethod
+    def distributed_load_glyphs(start, end, q, scale):
+        """Cargas distribuídas: linhas de carga (n, 2, 2), setas (caudas, vetores) e posição dos textos.
+
+        As setas saem da linha de carga, afastada da barra pelo comprimento da seta, e tocam a
+        barra nas extremidades e a cada DISTRIBUTED_ARROW_SPACING metros (forças negativas para
+        cima, positivas para baixo).
+        """
+        start = np.asarray(start, dtype=float).reshape(-1, 2)
+        delta = np.asarray(end, dtype=float).reshape(-1, 2) - start
+        angle = np.arctan2(delta[:, 1], delta[:, 0])
+        length = np.hypot(delta[:, 0], delta[:, 1])
+        # Vetor perp. invertido para as setas apontarem para a viga
+        offset = np.column_stack([-np.sin(angle), np.cos(angle)]) * -np.sign(q)[:, np.newaxis] * (0.5 * scale)
+        lines = np.stack([start + offset, start + delta + offset], axis=1)
+
+        # Pontos das setas em cada barra: 0 (início), 1 (fim) e os internos
+        counts = np.maximum(1, (length / StructuralPlotter.DISTRIBUTED_ARROW_SPACING).astype(np.int64)) + 2
+        bar = np.repeat(np.arange(len(start)), counts)
+        k = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        t = (k / (counts[bar] - 1))[:, np.newaxis]
+        tips = start[bar] + t * delta[bar]
+        tails = tips + offset[bar]
+        text = start + 0.5 * delta + 1.5 * offset  # Texto afastado da linha de carga
+        return lines, tails, tips - tails, text
+
+    def _add_polygons(self, polygons, **kwargs):
+        if len(polygons):
+            collection = self._add_collection(PolyCollection(polygons, **kwargs), polygons)
+            self._sources[collection] = ("polygons", polygons, kwargs)
+            return collection
+
+    def _add_arrows(self, tails, vectors, head_width, color, linewidth, include_head=False, zorder=2):
+        """Desenha várias setas retas como duas coleções (hastes e cabeças)."""
+        if len(tails) == 0: return
+        shafts, heads = self.arrow_glyphs(tails, vectors, head_width, include_head)
+        self._add_lines(shafts, colors=color, linewidths=linewidth, zorder=zorder)
+        self._add_polygons(heads, facecolors=color, edgecolors=color, linewidths=linewidth, zorder=zorder)
+
+    # As funções abaixo desenham só os nós e barras recebidos (os que estão na vista, ver _cull)
+    def _plot_supports(self, nodes_df, nodes):
+        # Cancela se não houverem nós
+        if nodes_df.empty or len(nodes) == 0: return
+
+        coord = self._coords(nodes_df)
+        restraints = nodes_df[["Restr_X", "Restr_Y", "Restr_Rz"]].values[nodes].astype(bool)
+        angles = nodes_df["Restr_Rot"].values[nodes].astype(float)
+        lines, triangles, hatches = self.support_glyphs(coord[nodes], restraints, angles, self._glyph_scale(coord))
+
+        if len(lines): self._add_lines(lines, colors='black', linewidths=1)
+        self._add_polygons(triangles, facecolors='none', edgecolors='black')
+        self._add_polygons(hatches, facecolors='none', edgecolors='black', linewidths=0, hatch='////')
+
+    def _plot_nodal_forces(self, coord, values, scale, force_color, moment_color, moment_tolerance=0.0):
+        """Setas e valores de forças (Fx, Fy) e momentos (Mz) nodais: cargas ou reações."""
+        fx, fy, mz = values[:, 0], values[:, 1], values[:, 2]
+        x_rows, y_rows = np.flatnonzero(fx != 0), np.flatnonzero(fy != 0)
+
+        # Setas de força: terminam junto ao nó, vindas do lado oposto ao sentido da força
+        sx, sy = np.sign(fx[x_rows]) * scale, np.sign(fy[y_rows]) * scale
+        zeros_x, zeros_y = np.zeros(len(x_rows)), np.zeros(len(y_rows))
+        tails = np.concatenate([coord[x_rows] - np.column_stack([sx, zeros_x]), coord[y_rows] - np.column_stack([zeros_y, sy])])
+        vectors = np.concatenate([np.column_stack([0.8 * sx, zeros_x]), np.column_stack([zeros_y, 0.8 * sy])])
+        self._add_arrows(tails, vectors, 0.1 * scale, force_color, 1.5, zorder=5)
+
+        # Setas de momento
+        arc_rows = np.flatnonzero(np.abs(mz) > moment_tolerance)
+        if len(arc_rows):
+            arcs, heads = self.moment_glyphs(coord[arc_rows], mz[arc_rows], scale)
+            self._add_lines(arcs, colors=moment_color, linewidths=1.5)
+            self._add_polygons(heads, facecolors=moment_color, edgecolors=moment_color)
+
+        # Valores (um texto por força na vista)
+        for i, s in zip(x_rows.tolist(), sx.tolist()):
+            self.ax.text(coord[i, 0] - s * 1.1, coord[i, 1], f"{fx[i]:.1f} kN", color=force_color)
+        for i, s in zip(y_rows.tolist(), sy.tolist()):
+            self.ax.text(coord[i, 0], coord[i, 1] - s * 1.1, f"{fy[i]:.1f} kN", color=force_color)
+        for i in np.flatnonzero(mz != 0).tolist():
+            self.ax.text(coord[i, 0], coord[i, 1] + scale * 0.3, f" {mz[i]:.1f} kN.m", color=moment_color)
+
+    def _plot_loads(self, nodes_df, bars_df, nodes, bars):
         # Cancela se não houverem nós
         if nodes_df.empty: return
-        
+
         # Carrega informações dos nós
-        coord = nodes_df[["X", "Y"]].values.astype(float)
-        
-        x_coords = coord[:, 0]
-        y_coords = coord[:, 1]
-        x_min, x_max = (x_coords.min(), x_coords.max()) if len(x_coords) > 0 else (0, 1)
-        y_min, y_max = (y_coords.min(), y_coords.max()) if len(y_coords) > 0 else (0, 1)
-        diag = math.sqrt((x_max - x_min)**2 + (y_max - y_min)**2)
-        scale = diag / 5 if diag > 0 else 0.6
-
-        # Desenha apoios
-        for i in range(len(coord)):
-            restrs = nodes_df.iloc[i]
-            if restrs['Restr_X'] == 1 or restrs['Restr_Y'] == 1 or restrs['Restr_Rz'] == 1:
-                no = coord[i]
-                angle_deg = restrs.get('Restr_Rot', 0)
-                
-                # Engaste (3º gênero)
-                if restrs['Restr_X'] == 1 and restrs['Restr_Y'] == 1 and restrs['Restr_Rz'] == 1:
-                     # Triangulo
-                     l1 = plt.Line2D([no[0] - 0.15*scale, no[0] + 0.15*scale], [no[1], no[1]], color='black', lw=1, transform=Affine2D().rotate_deg_around(no[0], no[1], angle_deg) + self.canvas.axes.transData)
-                     self.ax.add_line(l1)
-                     
-                     # Hachura abaixo do triangulo
-                     base = plt.Rectangle((no[0]-0.15*scale, no[1]-0.1*scale), width=0.3*scale, height=0.1*scale, fill=False, hatch='////', edgecolor='black', lw=0)
-                     base.set_transform(Affine2D().rotate_deg_around(no[0], no[1], angle_deg) + self.canvas.axes.transData)
-                     self.canvas.axes.add_patch(base)
-                
-                # Apoio 2º gênero (com hachura e rotação)
-                elif restrs['Restr_X'] == 1 and restrs['Restr_Y'] == 1 and restrs['Restr_Rz'] == 0:
-                    # Triangulo
-                    verts = [(no[0]-0.15*scale, no[1]-0.2*scale), (no[0]+0.15*scale, no[1]-0.2*scale), (no[0], no[1])]
-                    apoio_poly = plt.Polygon(verts, closed=True, fill=False, color='black')
-                    apoio_poly.set_transform(Affine2D().rotate_deg_around(no[0], no[1], angle_deg) + self.canvas.axes.transData)
-                    self.canvas.axes.add_patch(apoio_poly)
-                    
-                    # Hachura com centro de rotação no ponto do nó (no[0], no[1])
-                    base_hatch = plt.Rectangle((no[0]-0.15*scale, no[1]-0.2*scale-0.1*scale), width=0.3*scale, height=0.1*scale, fill=False, hatch='////', edgecolor='black', lw=0)
-                    base_hatch.set_transform(Affine2D().rotate_deg_around(no[0], no[1], angle_deg) + self.canvas.axes.transData)
-                    self.canvas.axes.add_patch(base_hatch)
-                
-                # Apoio 1º gênero (rolete)
-                elif restrs['Restr_X'] == 1 or restrs['Restr_Y'] == 1:
-                    # Rotaciona caso haja apenas restrição em X
-                    if restrs['Restr_X'] == 1 and restrs['Restr_Y'] == 0:
-                        angle_deg = (270)
-                    
-                    # Triangulo
-                    verts = [(no[0]-0.15*scale, no[1]-0.2*scale), (no[0]+0.15*scale, no[1]-0.2*scale), (no[0], no[1])]
-                    apoio_poly = plt.Polygon(verts, closed=True, fill=False, color='black')
-                    apoio_poly.set_transform(Affine2D().rotate_deg_around(no[0], no[1], angle_deg) + self.canvas.axes.transData)
-                    self.canvas.axes.add_patch(apoio_poly)
-                    
-                    # Linha abaixo do triangulo
-                    l2 = plt.Line2D([no[0]-0.15*scale, no[0]+0.15*scale], [no[1]-0.25*scale, no[1]-0.25*scale], color='black', lw=1, transform=Affine2D().rotate_deg_around(no[0], no[1], angle_deg) + self.canvas.axes.transData)
-                    self.canvas.axes.add_line(l2)
+        coord = self._coords(nodes_df)
+        scale = self._glyph_scale(coord)
 
         # Desenha cargas nodais
-        nodal_loads = nodes_df[["Fx", "Fy", "Mz"]].values.astype(float)
-        for i in range(len(coord)):
-            if nodal_loads[i, 0] != 0:
-                self.canvas.axes.arrow(coord[i, 0] - np.sign(nodal_loads[i, 0])*scale, 
-                                       coord[i, 1], 
-                                       np.sign(nodal_loads[i, 0])*scale*0.8, 0, 
-                                       head_width=scale*0.1, 
-                                       color='blue', 
-                                       lw=1.5, 
-                                       zorder=5)
-                
-                self.canvas.axes.text(coord[i,0] - np.sign(nodal_loads[i, 0])*scale*1.1, 
-                                      coord[i,1], 
-                                      f"{nodal_loads[i,0]:.1f} kN", 
-                                      color='blue')
-                
-            if nodal_loads[i, 1] != 0:
-                self.canvas.axes.arrow(coord[i, 0], 
-                                       coord[i, 1] - np.sign(nodal_loads[i, 1])*scale, 
-                                       0, 
-                                       np.sign(nodal_loads[i, 1])*scale*0.8, 
-                                       head_width=scale*0.1, 
-                                       color='blue', 
-                                       lw=1.5, 
-                                       zorder=5)
-                
-                self.canvas.axes.text(coord[i,0], 
-                                      coord[i,1] - np.sign(nodal_loads[i, 1])*scale*1.1, 
-                                      f"{nodal_loads[i,1]:.1f} kN", 
-                                      color='blue')
-                
-            if nodal_loads[i, 2] != 0:
-
-                if nodal_loads[i, 2] < 0: 
-                    self.canvas.axes.add_patch(patches.FancyArrowPatch((coord[i, 0]-0.3*scale, coord[i, 1]),
-                                                                   (coord[i, 0]+0.3*scale, coord[i, 1]), 
-                                                                   connectionstyle="arc3,rad=-1", 
-                                                                   **dict(arrowstyle="Simple, tail_width=0.5, head_width=4, head_length=8", color="green")))
-                else:
-                    self.canvas.axes.add_patch(patches.FancyArrowPatch((coord[i, 0]+0.3*scale, coord[i, 1]),
-                                                                   (coord[i, 0]-0.3*scale, coord[i, 1]), 
-                                                                   connectionstyle="arc3,rad=1", 
-                                                                   **dict(arrowstyle="Simple, tail_width=0.5, head_width=4, head_length=8", color="green")))
-                    
-                self.canvas.axes.text(coord[i,0], coord[i,1] + scale*0.3, f" {nodal_loads[i,2]:.1f} kN.m", color='green')
+        nodal_loads = nodes_df[["Fx", "Fy", "Mz"]].values.astype(float)[nodes]
+        self._plot_nodal_forces(coord[nodes], nodal_loads, scale, 'blue', 'green')
 
         # Desenha cargas distribuídas
-        if not bars_df.empty:
-            for i, bar in bars_df.iterrows():
-                p_val = bar.get('Q', 0)
-                if abs(p_val) > 1e-6:
-                    ni_idx, nj_idx = int(bar['node_i']), int(bar['node_j'])
-                    xi, yi = coord[ni_idx]
-                    xj, yj = coord[nj_idx]
-                    
-                    angle = np.arctan2(yj - yi, xj - xi)
-                    
-                    # Forças negativas para cima, positivas para baixo. Vetor perp. invertido para setas apontarem para a viga.
-                    direction = np.sign(p_val)
-                    perp_vec = np.array([-np.sin(angle), np.cos(angle)]) * - direction
-                    
-                    bar_length = math.sqrt((xj - xi)**2 + (yj - yi)**2)
-                    num_arrows_internal = max(1, int(bar_length / 0.5))
-                    
-                    # Pontos para as setas: 0 (início), 1 (fim) e num_arrows_internal pontos internos
-                    points_of_application = np.linspace(0, 1, num_arrows_internal + 2)
-                    
-                    arrow_len = scale * 0.5
-                    
-                    # Linha de carga (Linha sólida que as setas devem tocar)
-                    # O deslocamento é exatamente o comprimento da seta (arrow_len) para que as bases (caudas) se alinhem.
-                    start_line = np.array([xi, yi]) + perp_vec * arrow_len
-                    end_line = np.array([xj, yj]) + perp_vec * arrow_len
-                    
-                    self.canvas.axes.plot([start_line[0], end_line[0]], [start_line[1], end_line[1]], color='red', lw=1)
-                    
-                    for t in points_of_application:
-                        # Ponto na barra (ponta da seta)
-                        start_pos = np.array([xi + t * (xj - xi), yi + t * (yj - yi)])
-                        # Ponto da linha de carga (base/cauda da seta)
-                        end_pos = start_pos + perp_vec * arrow_len
-                        
-                        # Setas desenhadas da base (end_pos) para a ponta (start_pos)
-                        self.canvas.axes.arrow(end_pos[0], end_pos[1], (start_pos-end_pos)[0], (start_pos-end_pos)[1], 
-                                               head_width=scale * 0.08, color='red', lw=1, length_includes_head=True)
-                    
-                    mid_point = np.array([xi + 0.5 * (xj - xi), yi + 0.5 * (yj - yi)])
-                    text_pos = mid_point + perp_vec * arrow_len * 1.5 # Manter o texto afastado
-                    self.canvas.axes.text(text_pos[0], text_pos[1], f'{abs(p_val):.1f} kN/m', color='red', ha='center', va='center')
+        if bars_df.empty or len(bars) == 0: return
+        connectivity = bars_df[["node_i", "node_j"]].values.astype(int)[bars]
+        q = bars_df["Q"].values.astype(float)[bars]
+        lines, tails, vectors, text = self.distributed_load_glyphs(coord[connectivity[:, 0]], coord[connectivity[:, 1]], q, scale)
+
+        # Linha de carga (a que as setas tocam) e setas da linha de carga até a barra
+        self._add_lines(lines, colors='red', linewidths=1)
+        self._add_arrows(tails, vectors, 0.08 * scale, 'red', 1, include_head=True)
+        for (x, y), value in zip(text.tolist(), q.tolist()):
+            self.ax.text(x, y, f'{abs(value):.1f} kN/m', color='red', ha='center', va='center')
 
     # Desenha reações de apoio
-    def _plot_reactions(self, nodes_df, analysis_results, show_reactions):
-        if show_reactions and analysis_results:
-            nodal_reactions = analysis_results['reactions']
-
-            # Carrega informações dos nós
-            coord = nodes_df[["X", "Y"]].values.astype(float)
-            
-            x_coords = coord[:, 0]
-            y_coords = coord[:, 1]
-            x_min, x_max = (x_coords.min(), x_coords.max()) if len(x_coords) > 0 else (0, 1)
-            y_min, y_max = (y_coords.min(), y_coords.max()) if len(y_coords) > 0 else (0, 1)
-            diag = math.sqrt((x_max - x_min)**2 + (y_max - y_min)**2)
-            scale = diag / 5 if diag > 0 else 0.6
-
-
-            for i in range(len(coord)):
-                if nodal_reactions[i, 0] != 0:
-                    self.canvas.axes.arrow(coord[i, 0] - np.sign(nodal_reactions[i, 0])*scale, coord[i, 1], np.sign(nodal_reactions[i, 0])*scale*0.8, 0, head_width=scale*0.1, color='brown', lw=1.5, zorder=5)
-                    self.canvas.axes.text(coord[i,0] - np.sign(nodal_reactions[i, 0])*scale*1.1, coord[i,1], f"{nodal_reactions[i,0]:.1f} kN", color='brown')
-                if nodal_reactions[i, 1] != 0:
-                    self.canvas.axes.arrow(coord[i, 0], coord[i, 1] - np.sign(nodal_reactions[i, 1])*scale, 0, np.sign(nodal_reactions[i, 1])*scale*0.8, head_width=scale*0.1, color='brown', lw=1.5, zorder=5)
-                    self.canvas.axes.text(coord[i,0], coord[i,1] - np.sign(nodal_reactions[i, 1])*scale*1.1, f"{nodal_reactions[i,1]:.1f} kN", color='brown')
-                if nodal_reactions[i, 2] != 0:
-                    if nodal_reactions[i, 2] < -1e-5: 
-                        self.canvas.axes.add_patch(patches.FancyArrowPatch((coord[i, 0]-0.3*scale, coord[i, 1]),
-                                                                    (coord[i, 0]+0.3*scale, coord[i, 1]), 
-                                                                    connectionstyle="arc3,rad=-1", 
-                                                                    **dict(arrowstyle="Simple, tail_width=0.5, head_width=4, head_length=8", color="brown")))
-                    elif nodal_reactions[i, 2] > 1e-5:
-                        self.canvas.axes.add_patch(patches.FancyArrowPatch((coord[i, 0]+0.3*scale, coord[i, 1]),
-                                                                    (coord[i, 0]-0.3*scale, coord[i, 1]), 
-                                                                    connectionstyle="arc3,rad=1", 
-                                                                    **dict(arrowstyle="Simple, tail_width=0.5, head_width=4, head_length=8", color="brown")))
-                    self.canvas.axes.text(coord[i,0], coord[i,1] + scale*0.3, f" {nodal_reactions[i,2]:.1f} kN.m", color='brown')
-    
-    def _plot_diagram(self, analysis_results, current_view):        
-        if analysis_results is None: return
-        
+    def _plot_reactions(self, nodes_df, analysis_results, nodes):
+        if not analysis_results: return
+        coord = self._coords(nodes_df)
+        reactions = np.asarray(analysis_results['reactions'], dtype=float)[nodes]
+        self._plot_nodal_forces(coord[nodes], reactions, self._glyph_scale(coord), 'brown', 'brown', moment_tolerance=1e-5)
+
+    # Diagramas disponíveis: coluna em forces ([Ni, Vi, Mi, Nj, Vj, Mj]), cor e rótulo
+    DIAGRAMS = {
+        "Diagrama de Esforços Normais": (0, 'blue', 'N'),
+        "Diagrama de Esforços Cisalhantes": (1, 'red', 'V'),
+        "Diagrama de Momento Fletor": (2, 'green', 'M')
+    }
+
+    # Pontos de cada barra usados para desenhar o diagrama (curvas suaves)
+    DIAGRAM_STATIONS = 50
+
+    # Rótulos de valores: no máximo um por célula de uma grade com DIAGRAM_LABEL_CELLS
+    # células na maior dimensão da estrutura, e no máximo MAX_DIAGRAM_LABELS no total
+    DIAGRAM_LABEL_CELLS = 40
+    MAX_DIAGRAM_LABELS = 300
+
+    @staticmethod
+    def diagram_geometry(analysis_results, label, num_points=None):
+        """Pontos de todas as barras de uma vez para o diagrama 'label' ("N", "V" ou "M").
+
+        Retorna (base_points, diag_points, diag_vals, scale): pontos sobre as barras e do
+        diagrama, com forma (n_barras, num_points, 2), e os valores em cada ponto.
+        """
+        num_points = num_points or StructuralPlotter.DIAGRAM_STATIONS
         forces, coord = analysis_results['forces'], analysis_results['coord']
         M, L, p = analysis_results['connectivity'], analysis_results['lengths'], analysis_results['distributed_loads']
-        
+
         # Ajuste de escala para visualização
         max_force_val = np.max(np.abs(forces)) if forces.size > 0 else 1.0
         if max_force_val < 1e-9: max_force_val = 1.0
         max_L = np.max(L) if len(L) > 0 else 1.0
         scale = max_L / max_force_val * 0.2
 
-        diagram_map = {
-            "Diagrama de Esforços Normais": (0, 'blue', 'N'), 
-            "Diagrama de Esforços Cisalhantes": (1, 'red', 'V'), 
-            "Diagrama de Momento Fletor": (2, 'green', 'M')
-        }
-        
-        if current_view not in diagram_map: return
-        idx, color, label = diagram_map[current_view]
-
-        for i in range(len(M)):
-            n1, n2 = M[i, 0], M[i, 1]
-            x1, y1 = coord[n1]; x2, y2 = coord[n2]
-            
-            # Vetor diretor da barra e vetor perpendicular
-            dx, dy = x2 - x1, y2 - y1
-            angle = np.arctan2(dy, dx)
-            perp_vec = np.array([-np.sin(angle), np.cos(angle)])
-            
-            # Discretização da barra para curvas suaves
-            num_points = 50
-            x_vals_global = np.linspace(0, 1, num_points)
-            base_points = np.array([
-                [x1 + t * dx, y1 + t * dy] for t in x_vals_global
-            ])
-            x_local = x_vals_global * L[i]
-            
-            # Nota: forces[i] = [Ni, Vi, Mi, Nj, Vj, Mj]
-            
-            if label == 'N': 
-                # Normal constante (considerando apenas cargas nodais axiais por enquanto)
-                diag_vals = np.full_like(x_local, forces[i, 0])
-                plot_scale = scale # Plota normal positivo para "cima/fora"
-
-            elif label == 'V': 
-                # Cortante: V(x) = Vi + integral(q)
-                # Como p é definido positivo para cima na análise: V(x) = Vi + p*x
-                diag_vals = forces[i, 1] + p[i] * x_local
-                plot_scale = scale
-
-            else: 
-                # Momento: M(x) = M_i + V_i*x + p*x^2/2 (onde M_i no resultado é forces[i, 2])
-                diag_vals = -forces[i, 2] + forces[i, 1] * x_local + p[i] * x_local**2 / 2
-
-                # Inversão do diagrama
-                plot_scale = -scale
-            
-            # Calcula os pontos do diagrama deslocados da barra
-            diag_points = base_points + (perp_vec * diag_vals[:, np.newaxis] * plot_scale)
-            
-            # 1. Desenha e preenche o diagrama
-            # Cria um polígono fechado: Pontos da base (ida) -> Pontos do diagrama (volta)
-            plot_poly = np.vstack([base_points, diag_points[::-1]])
-            self.canvas.axes.fill(plot_poly[:, 0], plot_poly[:, 1], color=color, alpha=0.3, zorder=0)
-            self.canvas.axes.plot(diag_points[:, 0], diag_points[:, 1], color=color, lw=1.5, zorder=1)
-            
-            # 2. Plota os valores nas extremidades
-            self.canvas.axes.text(diag_points[0, 0], diag_points[0, 1], f'{diag_vals[0]:.2f}', color=color, fontsize=8)
-            self.canvas.axes.text(diag_points[-1, 0], diag_points[-1, 1], f'{diag_vals[-1]:.2f}', color=color, fontsize=8)
-
-            # 3. Plota o valor do VÉRTICE (Máximo/Mínimo) para Momento Fletor com carga distribuída
-            if label == 'M' and abs(p[i]) > 1e-5:
-                # O cortante é zero quando: V(x) = Vi + p*x = 0  =>  x = -Vi / p
-                # Possui uma tolerancia por conta da discretização do elemento
-                x_vertex = -forces[i, 1] / p[i]
-                
-                if 0 <= x_vertex <= L[i]:
-                    # Valor do momento no vértice
-                    M_vertex = forces[i, 2] + forces[i, 1] * x_vertex + p[i] * (x_vertex**2) / 2
-                    
-                    # Coordenada global do vértice na barra
-                    t_vertex = x_vertex / L[i]
-                    x_base_v = x1 + t_vertex * dx
-                    y_base_v = y1 + t_vertex * dy
-                    
-                    # Coordenada do ponto no diagrama
-                    pt_diag_v = np.array([x_base_v, y_base_v]) + perp_vec * M_vertex * plot_scale
-                    
-                    self.canvas.axes.text(pt_diag_v[0], pt_diag_v[1], 
-                                           f'{M_vertex:.2f}', color=color, fontsize=8, fontweight='bold',
-                                           ha='center', va='center', 
-                                           bbox=dict(facecolor='white', alpha=0.7, edgecolor='none', pad=0.5), 
-                                           zorder=2)
+        # Vetor diretor de cada barra e vetor perpendicular
+        start = coord[M[:, 0]]
+        delta = coord[M[:, 1]] - start
+        angle = np.arctan2(delta[:, 1], delta[:, 0])
+        perp_vec = np.column_stack([-np.sin(angle), np.cos(angle)])
+
+        # Discretização das barras: (n_barras, num_points)
+        t = np.linspace(0, 1, num_points)
+        base_points = start[:, np.newaxis, :] + t[np.newaxis, :, np.newaxis] * delta[:, np.newaxis, :]
+        x_local = t[np.newaxis, :] * L[:, np.newaxis]
+        Vi, Mi, q = forces[:, 1, np.newaxis], forces[:, 2, np.newaxis], p[:, np.newaxis]
+
+        if label == 'N':
+            # Normal constante (considerando apenas cargas nodais axiais por enquanto)
+            diag_vals = np.repeat(forces[:, 0, np.newaxis], num_points, axis=1)
+            plot_scale = scale  # Plota normal positivo para "cima/fora"
+        elif label == 'V':
+            # Cortante: V(x) = Vi + p*x (p positivo para cima na análise)
+            diag_vals = Vi + q * x_local
+            plot_scale = scale
+        else:
+            # Momento: M(x) = -Mi + Vi*x + p*x^2/2 (diagrama invertido)
+            diag_vals = -Mi + Vi * x_local + q * x_local**2 / 2
+            plot_scale = -scale
+
+        # Pontos do diagrama deslocados da barra
+        diag_points = base_points + perp_vec[:, np.newaxis, :] * (diag_vals * plot_scale)[:, :, np.newaxis]
+        return base_points, diag_points, diag_vals, plot_scale
+
+    @staticmethod
+    def diagram_labels(analysis_results, label, base_points, diag_points, diag_vals, plot_scale):
+        """Candidatos a rótulo: valores nas extremidades e, no momento com carga distribuída, no vértice.
+
+        Retorna (posições, valores, é_vértice).
+        """
+        positions = [diag_points[:, 0], diag_points[:, -1]]
+        values = [diag_vals[:, 0], diag_vals[:, -1]]
+        vertex = [np.zeros(len(diag_vals), dtype=bool)] * 2
+
+        if label == 'M':
+            # O cortante é zero quando V(x) = Vi + p*x = 0  =>  x = -Vi / p
+            forces, L, p = analysis_results['forces'], analysis_results['lengths'], analysis_results['distributed_loads']
+            loaded = np.flatnonzero(np.abs(p) > 1e-5)
+            x_vertex = -forces[loaded, 1] / p[loaded]
+            inside = (x_vertex >= 0) & (x_vertex <= L[loaded])
+            loaded, x_vertex = loaded[inside], x_vertex[inside]
+            # Valor no vértice pela mesma expressão da curva
+            M_vertex = -forces[loaded, 2] + forces[loaded, 1] * x_vertex + p[loaded] * x_vertex**2 / 2
+            t_vertex = (x_vertex / L[loaded])[:, np.newaxis]
+            base_v = base_points[loaded, 0] + t_vertex * (base_points[loaded, -1] - base_points[loaded, 0])
+            # Direção perpendicular da barra (a mesma usada na curva)
+            direction = base_points[loaded, -1] - base_points[loaded, 0]
+            perp_vec = np.column_stack([-direction[:, 1], direction[:, 0]]) / L[loaded, np.newaxis]
+            positions.append(base_v + perp_vec * (M_vertex * plot_scale)[:, np.newaxis])
+            values.append(M_vertex)
+            vertex.append(np.ones(len(loaded), dtype=bool))
+
+        return np.concatenate(positions), np.concatenate(values), np.concatenate(vertex)
+
+    @staticmethod
+    def declutter(points, priority, cell_size, max_labels):
+        """Índices dos rótulos mantidos: o de maior prioridade em cada célula da grade e no máximo max_labels."""
+        if len(points) == 0 or cell_size <= 0:
+            return np.arange(len(points))[:max_labels]
+        _, cell = np.unique(np.floor(points / cell_size).astype(np.int64), axis=0, return_inverse=True)
+        order = np.lexsort((-priority, cell.ravel()))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = cell.ravel()[order][1:] != cell.ravel()[order][:-1]
+        kept = order[first]
+        return kept[np.argsort(-priority[kept], kind='stable')][:max_labels]
+
+    def _plot_diagram(self, analysis_results, current_view):        
+        self._diagram_data = None
+        if analysis_results is None: return
+        if current_view not in self.DIAGRAMS: return
+        _, color, label = self.DIAGRAMS[current_view]
+        if len(analysis_results['connectivity']) == 0: return
+
+        base_points, diag_points, diag_vals, plot_scale = self.diagram_geometry(analysis_results, label)
+
+        # 1. Preenchimento (uma única PolyCollection) e contorno (uma única LineCollection)
+        # Cada polígono fechado: pontos da base (ida) -> pontos do diagrama (volta)
+        polygons = np.concatenate([base_points, diag_points[:, ::-1]], axis=1)
+        self._add_polygons(polygons, facecolors=color, edgecolors=color, alpha=0.3, zorder=0)
+        self._add_lines(diag_points, colors=color, linewidths=1.5, zorder=1)
+
+        # Os rótulos de valores ficam em outra camada (diagram_labels), montada a partir destes pontos
+        self._diagram_data = (analysis_results, label, color, base_points, diag_points, diag_vals, plot_scale)
+
+    def _plot_diagram_labels(self):
+        """Rótulos de valores do diagrama atual, sem sobreposição."""
+        if self._diagram_data is None: return
+        analysis_results, label, color, base_points, diag_points, diag_vals, plot_scale = self._diagram_data
+        positions, values, vertex = self.diagram_labels(analysis_results, label, base_points, diag_points, diag_vals, plot_scale)
+        extent = np.ptp(base_points.reshape(-1, 2), axis=0).max()
+        # Vértices têm prioridade sobre as extremidades na mesma célula; depois, o maior valor absoluto
+        priority = np.abs(values) + vertex * (np.abs(values).max() + 1)
+        kept = self.declutter(positions, priority, extent / self.DIAGRAM_LABEL_CELLS, self.MAX_DIAGRAM_LABELS)
+
+        for (x, y), value, is_vertex in zip(positions[kept].tolist(), values[kept].tolist(), vertex[kept].tolist()):
+            if is_vertex:
+                # Valor do vértice (Máximo/Mínimo) do momento fletor com carga distribuída
+                self.ax.text(x, y, f'{value:.2f}', color=color, fontsize=8, fontweight='bold',
+                             ha='center', va='center',
+                             bbox=dict(facecolor='white', alpha=0.7, edgecolor='none', pad=0.5),
+                             zorder=2)
+            else:
+                self.ax.text(x, y, f'{value:.2f}', color=color, fontsize=8)
 
     def _plot_deformed_shape(self, analysis_results):
         if analysis_results is None: return
@@ -367,18 +916,12 @@ class StructuralPlotter:
         connectivity = analysis_results['connectivity']
         
         # Plota estrutura original (cinza tracejado)
-        for i in range(len(connectivity)):
-            n1, n2 = connectivity[i]
-            self.ax.plot([orig_coord[n1, 0], orig_coord[n2, 0]], 
-                         [orig_coord[n1, 1], orig_coord[n2, 1]], 
-                         'k--', lw=1, alpha=0.3)
+        self._add_lines(self._segments(orig_coord, connectivity), colors='k', linestyles='--', linewidths=1, alpha=0.3)
 
         # Plota estrutura deformada (azul contínuo)
-        for i in range(len(connectivity)):
-            n1, n2 = connectivity[i]
-            self.ax.plot([def_coord[n1, 0], def_coord[n2, 0]], 
-                         [def_coord[n1, 1], def_coord[n2, 1]], 
-                         'b-', lw=2)
-            
+        self._add_lines(self._segments(def_coord, connectivity), colors='b', linewidths=2)
+
         # Plota nós deformados
-        self.ax.plot(def_coord[:, 0], def_coord[:, 1], 'bo', markersize=4)
+        markers, = self.ax.plot(def_coord[:, 0], def_coord[:, 1], 'bo', markersize=4)
+        self._set_bounds(markers, def_coord)
+        self._sources[markers] = ("markers", (def_coord[:, 0], def_coord[:, 1], 'bo'), dict(markersize=4))
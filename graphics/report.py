@@ -0,0 +1,189 @@
+"""Relatório em lote sem interface: estrutura, deformada e diagramas de cada modelo.
+
+Uso: python -m graphics.report pasta_saida modelo1.stx [modelo2.stxb ...] [--formatos pdf,png,svg] [--processos N]
+"""
+import os
+import sys
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.backends.backend_pdf import PdfPages
+from core.data_handler import DataHandler
+from core.file_manager import FileManager
+from core.solver import StructuralSolver
+from graphics.plotter import StructuralPlotter
+
+# Canvas sem interface, com o mesmo atributo axes do MatplotlibCanvas
+class HeadlessCanvas(FigureCanvasAgg):
+    def __init__(self, width=5, height=4, dpi=100):
+        super().__init__(Figure(figsize=(width, height), dpi=dpi))
+        self.axes = self.figure.add_subplot(111)
+
+    def draw_idle(self, *args, **kwargs):
+        pass  # Nada é mostrado: a figura só é renderizada ao salvar cada página
+
+class ReportRenderer:
+    """Páginas do relatório de um modelo, desenhadas pelo StructuralPlotter numa figura Agg.
+
+    A mesma figura e o mesmo plotter servem todas as páginas e todos os modelos do processo:
+    cada página só troca a vista (como na janela), então as camadas comuns às páginas não
+    são refeitas e nenhuma figura é criada por página. Vários modelos são divididos entre
+    processos por render_batch, cada um com o seu ReportRenderer.
+    """
+
+    # Páginas: vista do plotter e sufixo dos arquivos de imagem
+    PAGES = (
+        ("Visualização", "estrutura"),
+        ("Deformação", "deformada"),
+        ("Diagrama de Esforços Normais", "normal"),
+        ("Diagrama de Esforços Cisalhantes", "cortante"),
+        ("Diagrama de Momento Fletor", "momento"),
+    )
+
+    FORMATS = ("pdf", "png", "svg")
+
+    PAGE_SIZE = (11.69, 8.27)  # A4 paisagem (polegadas)
+    DPI = 150
+
+    # Extensões retiradas do nome do arquivo do modelo para nomear o relatório
+    MODEL_EXTENSIONS = (".gz", ".xz", ".stx", FileManager.BINARY_EXTENSION)
+
+    def __init__(self, page_size=None, dpi=None):
+        width, height = page_size or self.PAGE_SIZE
+        self.canvas = HeadlessCanvas(width, height, dpi or self.DPI)
+        self.plotter = StructuralPlotter(self.canvas)
+
+    @staticmethod
+    def model_name(filepath):
+        name = os.path.basename(filepath)
+        root, ext = os.path.splitext(name)
+        while ext in ReportRenderer.MODEL_EXTENSIONS and root:
+            name = root
+            root, ext = os.path.splitext(name)
+        return name
+
+    def render(self, nodes_df, bars_df, results, output, formats=("pdf",), title=None):
+        """Salva as páginas: output.pdf (todas as páginas) e/ou output_<página>.png / .svg.
+
+        Sem resultados, só a página da estrutura. Retorna (sucesso, lista de arquivos ou erro).
+        """
+        unknown = [fmt for fmt in formats if fmt not in self.FORMATS]
+        if unknown:
+            return False, f"Formato desconhecido: {', '.join(unknown)}."
+        pages = self.PAGES if results is not None else self.PAGES[:1]
+        figure = self.canvas.figure
+        figure.suptitle(title or "")
+        files = []
+        try:
+            pdf = None
+            if "pdf" in formats:
+                pdf = PdfPages(f"{output}.pdf", metadata={"Title": title or "", "Creator": "StruTrix"})
+                files.append(f"{output}.pdf")
+            try:
+                for view, suffix in pages:
+                    # Modelo novo (change None) na primeira página; depois só a vista muda. A
+                    # numeração fica só na página da estrutura (nas outras, os valores dos diagramas)
+                    numbering = view == self.PAGES[0][0]
+                    self.plotter.draw_structure(nodes_df, bars_df, results, view, True, numbering, numbering, True)
+                    if pdf is not None:
+                        pdf.savefig(figure)
+                    for fmt in formats:
+                        if fmt == "pdf": continue
+                        path = f"{output}_{suffix}.{fmt}"
+                        figure.savefig(path, format=fmt)
+                        files.append(path)
+            finally:
+                if pdf is not None: pdf.close()
+        except Exception as e:
+            return False, str(e)
+        return True, files
+
+    def render_file(self, filepath, output_dir, formats=("pdf",)):
+        """Abre o modelo, calcula e salva o relatório em output_dir (nome do arquivo do modelo).
+
+        Se a análise falhar, o relatório tem só a estrutura. Retorna (sucesso, mensagem).
+        """
+        name = self.model_name(filepath)
+        handler = DataHandler()
+        success, data = FileManager.load_project(filepath, {"nodes": handler.node_dtypes, "bars": handler.bar_dtypes})
+        if not success: return False, f"{name}: {data}"
+        success, msg = handler.load_from_columns(data)
+        if not success: return False, f"{name}: {msg}"
+
+        results, note = None, ""
+        try:
+            results = StructuralSolver().run_analysis(handler.node_arrays(), handler.bar_arrays())
+        except Exception as e:
+            note = f" (sem resultados: {e})"
+
+        success, files = self.render(handler.nodes_df, handler.bars_df, results,
+                                     os.path.join(output_dir, name), formats, title=name)
+        if not success: return False, f"{name}: {files}"
+        return True, f"{name}: {len(files)} arquivo(s){note}"
+
+    @staticmethod
+    def render_batch(filepaths, output_dir, formats=("pdf",), workers=None, progress_callback=None):
+        """Relatório de vários modelos, divididos entre processos (um ReportRenderer por processo).
+
+        workers: número de processos (None = um por núcleo, até o número de modelos; 1 = no
+        próprio processo). Retorna (todos com sucesso, resumo por modelo).
+        """
+        filepaths = list(filepaths)
+        if not filepaths: return False, "Nenhum modelo informado."
+        try:
+            os.makedirs(output_dir, exist_ok=True)
+        except Exception as e:
+            return False, str(e)
+        workers = workers or min(len(filepaths), os.cpu_count() or 1)
+        outcomes = []
+
+        if workers <= 1:
+            renderer = ReportRenderer()
+            for filepath in filepaths:
+                outcomes.append(renderer.render_file(filepath, output_dir, formats))
+                if progress_callback: progress_callback(len(outcomes) / len(filepaths))
+        else:
+            # "spawn": processos limpos, sem herdar as threads da interface
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker) as pool:
+                futures = [pool.submit(_render_in_worker, filepath, output_dir, tuple(formats)) for filepath in filepaths]
+                for future in as_completed(futures):
+                    try:
+                        outcomes.append(future.result())
+                    except Exception as e:
+                        outcomes.append((False, str(e)))
+                    if progress_callback: progress_callback(len(outcomes) / len(filepaths))
+
+        failures = sum(not success for success, _ in outcomes)
+        lines = [f"Modelos: {len(outcomes)}, com erro: {failures}"] + [msg for _, msg in outcomes]
+        return failures == 0, "\n".join(lines)
+
+# Renderizador de cada processo do pool (criado uma vez e reaproveitado entre os modelos)
+_renderer = None
+
+def _init_worker():
+    global _renderer
+    _renderer = ReportRenderer()
+
+def _render_in_worker(filepath, output_dir, formats):
+    return _renderer.render_file(filepath, output_dir, formats)
+
+def main():
+    parser = argparse.ArgumentParser(description="Relatório (PDF/PNG/SVG) de modelos do StruTrix, sem interface.")
+    parser.add_argument("output_dir", help="Pasta de saída")
+    parser.add_argument("models", nargs="+", help="Arquivos dos modelos (.stx, .stx.gz, .stx.xz, .stxb)")
+    parser.add_argument("--formatos", default="pdf", help="Formatos separados por vírgula (pdf, png, svg)")
+    parser.add_argument("--processos", type=int, default=None, help="Número de processos")
+    args = parser.parse_args()
+
+    formats = tuple(fmt.strip().lower() for fmt in args.formatos.split(",") if fmt.strip())
+    progress = lambda fraction: print(f"\r{fraction:.0%}", end="", file=sys.stderr)
+    success, report = ReportRenderer.render_batch(args.models, args.output_dir, formats, args.processos, progress)
+    print(file=sys.stderr)
+    print(report)
+    sys.exit(0 if success else 1)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import numpy as np
+from collections import OrderedDict
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection, PolyCollection
+
+class TileRenderer:
+    """Rasterização de camadas do desenho em imagens (ladrilhos) com o backend Agg.
+
+    As camadas chegam como descrições independentes dos artistas da tela (arrays NumPy e
+    estilos), então a renderização pode rodar numa thread de fundo sem tocar na figura
+    interativa: cada chamada monta a sua própria Figure.
+    """
+
+    @staticmethod
+    def render(specs, extent, size, dpi):
+        """Imagem RGBA (altura, largura, 4), com fundo transparente, das camadas na região extent.
+
+        specs: lista de (tipo, dados, estilo): "lines" (segmentos (n, 2, 2)), "polygons"
+        (lista ou array de polígonos) ou "markers" ((x, y, formato)).
+        extent: (x0, x1, y0, y1) em unidades do desenho; size: (largura, altura) em pixels.
+        """
+        width, height = size
+        figure = Figure(figsize=(width / dpi, height / dpi), dpi=dpi)
+        figure.patch.set_alpha(0)
+        canvas = FigureCanvasAgg(figure)
+        ax = figure.add_axes((0, 0, 1, 1))
+        ax.set_axis_off()
+        ax.set_autoscale_on(False)
+        for kind, data, style in specs:
+            if kind == "lines":
+                ax.add_collection(LineCollection(data, **style), autolim=False)
+            elif kind == "polygons":
+                ax.add_collection(PolyCollection(data, **style), autolim=False)
+            else:
+                x, y, fmt = data
+                ax.plot(x, y, fmt, **style)
+        ax.set_xlim(extent[0], extent[1])
+        ax.set_ylim(extent[2], extent[3])
+        canvas.draw()
+        return np.asarray(canvas.buffer_rgba()).copy()
+
+
+class TileCache:
+    """Ladrilhos prontos de cada camada, com descarte dos menos usados (limite em bytes).
+
+    Chave: (camada, revisão, extent, size). A revisão muda sempre que a camada é refeita,
+    então ladrilhos de um desenho antigo nunca são usados como se fossem atuais.
+    """
+
+    DEFAULT_MAX_BYTES = 256 * 2 ** 20
+
+    # Faixa de resolução (ladrilho / vista) aceita sem pedir um ladrilho novo
+    MIN_RATIO = 0.75
+    MAX_RATIO = 1.5
+
+    def __init__(self, max_bytes=None):
+        self.max_bytes = max_bytes or self.DEFAULT_MAX_BYTES
+        self.tiles = OrderedDict()
+        self.nbytes = 0
+
+    def __len__(self):
+        return len(self.tiles)
+
+    def clear(self):
+        self.tiles.clear()
+        self.nbytes = 0
+
+    def put(self, key, image):
+        if key in self.tiles:
+            self.nbytes -= self.tiles.pop(key).nbytes
+        self.tiles[key] = image
+        self.nbytes += image.nbytes
+        while self.nbytes > self.max_bytes and len(self.tiles) > 1:
+            _, old = self.tiles.popitem(last=False)
+            self.nbytes -= old.nbytes
+
+    @staticmethod
+    def resolution(key):
+        """Pixels por unidade do desenho de um ladrilho."""
+        extent, size = key[2], key[3]
+        return size[0] / (extent[1] - extent[0])
+
+    def find(self, layer, revision, view, resolution):
+        """Melhor ladrilho da camada para a vista (x0, x1, y0, y1) com a resolução dada.
+
+        Retorna (chave, imagem, exato) ou None. Exato: cobre a vista com resolução na faixa
+        aceita (o de resolução mais próxima). Senão, devolve o usado mais recentemente como
+        prévia (esticado pela tela até o ladrilho certo ficar pronto).
+        """
+        best, best_error, preview = None, None, None
+        for key in self.tiles:
+            if key[0] != layer or key[1] != revision: continue
+            preview = key
+            extent = key[2]
+            ratio = self.resolution(key) / resolution
+            covers = extent[0] <= view[0] and extent[1] >= view[1] and extent[2] <= view[2] and extent[3] >= view[3]
+            if covers and self.MIN_RATIO <= ratio <= self.MAX_RATIO:
+                error = abs(np.log(ratio))
+                if best is None or error < best_error:
+                    best, best_error = key, error
+        key = best or preview
+        if key is None: return None
+        self.tiles.move_to_end(key)
+        return key, self.tiles[key], best is not None
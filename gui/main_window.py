@@ -1,21 +1,32 @@
 import os
 import sys
+import tempfile
 import pandas as pd
 from PyQt5.QtWidgets import (
     QMainWindow, QWidget, QTabWidget, QVBoxLayout, QHBoxLayout,
     QGroupBox, QFormLayout, QLabel, QLineEdit, QPushButton, QComboBox,
     QCheckBox, QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView,
-    QDoubleSpinBox, QAction, QFileDialog,
+    QDoubleSpinBox, QSpinBox, QAction, QFileDialog, QProgressDialog, QInputDialog,
 )
 from PyQt5.QtGui import QIcon
-from PyQt5.QtGui import QFont
-from PyQt5.QtCore import Qt
+from PyQt5.QtGui import QFont, QKeySequence
+from PyQt5.QtCore import Qt, QThreadPool, QTimer
 
 # IMPORTA OS MÓDULOS
 from core.solver import StructuralSolver    # Importa o programa de calculo
 from core.data_handler import DataHandler   # Importa o gerenciador de dados
+from core.changes import ModelChange        # Tipos de modificação avisados pelo DataHandler
 from core.file_manager import FileManager   # Importa o gerenciador de arquivos
-from graphics.plotter import StructuralPlotter, MatplotlibCanvas    # Importa o criador de diagramas
+from core.bulk_io import BulkIO             # Importa a importação/exportação em lote
+from core.validator import ModelValidator     # Relatório da validação do modelo
+from core.cleanup import GeometryCleanup     # Fusão de nós próximos e limpeza de barras
+from graphics.plotter import StructuralPlotter    # Importa o criador de diagramas
+from graphics.canvas import MatplotlibCanvas      # Canvas Matplotlib dentro da janela Qt
+from graphics.inspector import CanvasInspector      # Dica sob o cursor e seleção por clique no desenho
+from gui.workers import FileTask, RenderTask    # Tarefas de arquivo e de renderização em segundo plano
+from gui.scheduler import RedrawScheduler       # Agrupa pedidos de redesenho próximos
+
+AUTOSAVE_INTERVAL_MS = 60_000               # Intervalo do salvamento automático (1 minuto)
 
 # Retorna o caminho absoluto do arquivo para acesso a recursos.
 def resource_path(relative_path):
@@ -42,6 +53,7 @@ class StruTrixMainWindow(QMainWindow):
         # INICIALIZA CLASSES AUXILIARES
         self.data_handler = DataHandler()  # Instância dos dados
         self.solver = StructuralSolver()
+        self.solver.track(self.data_handler)  # Reaproveita as matrizes das barras não modificadas
         self.plotter = None
 
         # --- INICIALIZAÇÃO DOS ATRIBUTOS DE ESTADO ---
@@ -52,10 +64,29 @@ class StruTrixMainWindow(QMainWindow):
         self.show_reactions = True           # Valor padrão
         self.data_handler.analysis_results = None        # Sem resultados inicialmente
         self.openfilepath = None
+
+        # Leitura/escrita de arquivos em uma única thread de fundo (operações em fila)
+        self.io_pool = QThreadPool()
+        self.io_pool.setMaxThreadCount(1)
+        # Renderização dos ladrilhos do desenho (modo opcional, ver menu Opções)
+        self.render_pool = QThreadPool()
+        self.render_pool.setMaxThreadCount(2)
+        self.saved_revision = self.data_handler.revision        # Revisão gravada pelo usuário
+        self.autosaved_revision = self.data_handler.revision    # Revisão gravada pelo autosave
+        self.progress_dialog = None
         
         self.init_ui()
+        # Redesenhos pedidos em sequência rápida (ex.: várias edições) viram um só desenho
+        self.redraw = RedrawScheduler(self.draw_plot, self.plotter.invalidate, self)
         self.update_all_widgets()
         self.update_plot()
+        # Toda modificação do modelo (ou lote de modificações) atualiza a interface uma única vez
+        self.data_handler.add_listener(self.on_model_changed)
+
+        # Salvamento automático periódico (só grava se o modelo mudou)
+        self.autosave_timer = QTimer(self)
+        self.autosave_timer.timeout.connect(self.autosave)
+        self.autosave_timer.start(AUTOSAVE_INTERVAL_MS)
 
     def init_ui(self):
         
@@ -110,6 +141,7 @@ class StruTrixMainWindow(QMainWindow):
         # Na parte do Canvas:
         self.canvas = MatplotlibCanvas(self, width=8, height=6, dpi=100)
         self.plotter = StructuralPlotter(self.canvas) # Cria o plotter
+        self.inspector = CanvasInspector(self.canvas, self.inspected_model, self.on_canvas_select)
         
         right_panel_layout.addWidget(self.canvas)
 
@@ -155,8 +187,24 @@ class StruTrixMainWindow(QMainWindow):
         ## -
         file_menu.addSeparator()
 
-        ## Exportar reações nos nós
-        export_values_action = QAction("Salvar Reações", self)
+        ## Importar dados em lote (CSV / planilha)
+        import_menu = file_menu.addMenu("&Importar")
+        import_items = [("Nós...", BulkIO.import_nodes),
+                        ("Barras...", BulkIO.import_bars),
+                        ("Apoios / Cargas Nodais / Deslocamentos...", BulkIO.import_node_values),
+                        ("Cargas Distribuídas / Propriedades das Barras...", BulkIO.import_bar_values)]
+        for label, import_func in import_items:
+            import_action = QAction(label, self)
+            import_action.triggered.connect(lambda checked, f=import_func: self.import_table(f))
+            import_menu.addAction(import_action)
+
+        ## Limpeza da geometria (nós coincidentes, barras repetidas ou nulas)
+        cleanup_action = QAction("Limpar Geometria...", self)
+        cleanup_action.triggered.connect(self.cleanup_geometry)
+        file_menu.addAction(cleanup_action)
+
+        ## Exportar resultados (deslocamentos, reações e esforços)
+        export_values_action = QAction("Exportar Resultados...", self)
         export_values_action.triggered.connect(self.export_values)
         file_menu.addAction(export_values_action)
         
@@ -168,6 +216,20 @@ class StruTrixMainWindow(QMainWindow):
         exit_action.triggered.connect(self.close)
         file_menu.addAction(exit_action)
         
+        # Menu Edit
+        edit_menu = menu_bar.addMenu("&Editar")
+
+        ## Desfazer / Refazer
+        undo_action = QAction("&Desfazer", self)
+        undo_action.setShortcut(QKeySequence.Undo)
+        undo_action.triggered.connect(self.undo)
+        edit_menu.addAction(undo_action)
+
+        redo_action = QAction("&Refazer", self)
+        redo_action.setShortcut(QKeySequence.Redo)
+        redo_action.triggered.connect(self.redo)
+        edit_menu.addAction(redo_action)
+
         # Menu View
         view_menu = menu_bar.addMenu("&Visualização")
 
@@ -196,7 +258,7 @@ class StruTrixMainWindow(QMainWindow):
         
         ## Resetar visuazlização
         resetview_action = QAction("&Resetar", self)
-        resetview_action.triggered.connect(self.update_plot)
+        resetview_action.triggered.connect(self.reset_view)
         view_menu.addAction(resetview_action)
         
         ### Pan / Zoom group
@@ -218,6 +280,16 @@ class StruTrixMainWindow(QMainWindow):
 
         # Menu Options
         options_menu = menu_bar.addMenu("&Opções")
+
+        ## Renderização das camadas pesadas em segundo plano
+        self.tile_mode_action = QAction("Renderização em Segundo Plano", self, checkable=True, checked=False)
+        self.tile_mode_action.triggered.connect(self.tile_mode_toggle)
+        options_menu.addAction(self.tile_mode_action)
+
+        ## Estatísticas do agendador de redesenho
+        redraw_stats_action = QAction("Estatísticas de Redesenho", self)
+        redraw_stats_action.triggered.connect(self.redraw_stats)
+        options_menu.addAction(redraw_stats_action)
     
     # --- Abas ---
     def create_tabs(self):                                                                          # Cria todas as abas
@@ -343,6 +415,16 @@ class StruTrixMainWindow(QMainWindow):
         self.delete_bar_button = QPushButton("Deletar Barra")
         self.delete_bar_button.clicked.connect(self.delete_bar)
 
+        # Subdivisão (barra selecionada, ou todas com "Nova Barra" selecionado)
+        subdivide_layout = QHBoxLayout()
+        self.subdivide_segments = QSpinBox()
+        self.subdivide_segments.setRange(2, 100)
+        self.subdivide_segments.setPrefix("Trechos: ")
+        self.subdivide_button = QPushButton("Subdividir Barra(s)")
+        self.subdivide_button.clicked.connect(self.subdivide_bars)
+        subdivide_layout.addWidget(self.subdivide_segments)
+        subdivide_layout.addWidget(self.subdivide_button)
+
         # Tabela de barras
         self.bars_table = QTableWidget()
         self.bars_table.setColumnCount(8)
@@ -361,6 +443,7 @@ class StruTrixMainWindow(QMainWindow):
         layout.addWidget(form_group)
         layout.addWidget(self.add_bar_button)
         layout.addWidget(self.delete_bar_button)
+        layout.addLayout(subdivide_layout)
         layout.addWidget(QLabel("Barras Existentes:"))
         layout.addWidget(self.bars_table)              
 
@@ -616,11 +699,10 @@ class StruTrixMainWindow(QMainWindow):
         
     
     def new_file(self):
-        self.data_handler.init_data()
-        self.update_all_widgets()
-        self.update_plot()
-        self.switch_view("Visualização")
+        self.current_view = "Visualização"
+        self.data_handler.init_data()  # Avisa on_model_changed (tabelas e gráfico)
         self.openfilepath = None
+        self.saved_revision = self.data_handler.revision
 
     # Transformar os dados de entrada (nodes_df e bars_df) em um único dicionário
     def data_to_save(self):
@@ -630,24 +712,49 @@ class StruTrixMainWindow(QMainWindow):
         }
     
     def open_file(self):
-        filepath, _ = QFileDialog.getOpenFileName(self, "Abrir", "", "StruTrix (*.stx)")
+        filepath, _ = QFileDialog.getOpenFileName(self, "Abrir", "", "StruTrix (*.stx *.stx.gz *.stx.xz *.stxb);;StruTrix JSON (*.stx *.stx.gz *.stx.xz);;StruTrix Binário (*.stxb)")
         if filepath:
-            # 1. FileManager lê o arquivo do disco
-            success_file, file_data = FileManager.load_file(filepath)
+            # Oferece recuperar o salvamento automático se ele for mais recente que o arquivo
+            source_path = filepath
+            autosave_path = self.autosave_path(filepath)
+            if os.path.exists(autosave_path) and os.path.getmtime(autosave_path) > os.path.getmtime(filepath):
+                answer = QMessageBox.question(self, "Recuperar", "Existe um salvamento automático mais recente deste arquivo. Deseja recuperá-lo?")
+                if answer == QMessageBox.Yes:
+                    source_path = autosave_path
+
+            # Barra de progresso (só aparece se a leitura demorar)
+            self.progress_dialog = QProgressDialog("Abrindo arquivo...", None, 0, 100, self)
+            self.progress_dialog.setWindowTitle("Abrir")
+            self.progress_dialog.setWindowModality(Qt.WindowModal)
+            self.progress_dialog.setMinimumDuration(300)
+            self.progress_dialog.setValue(0)
+
+            # 1. FileManager lê o arquivo do disco em segundo plano
+            dtypes = {"nodes": self.data_handler.node_dtypes, "bars": self.data_handler.bar_dtypes}
+            task = FileTask(FileManager.load_project, source_path, dtypes, context=filepath)
+            task.signals.progress.connect(self.progress_dialog.setValue)
+            task.signals.finished.connect(self._on_file_loaded)
+            self.io_pool.start(task)
+
+    # Chamado na thread da interface ao terminar a leitura
+    def _on_file_loaded(self, success_file, file_data, filepath):
+        if self.progress_dialog is not None:
+            self.progress_dialog.close()
+            self.progress_dialog = None
+
+        if success_file:
+            # 2. DataHandler carrega as colunas para os DataFrames
+            success_data, msg = self.data_handler.load_from_columns(file_data)
             
-            if success_file:
-                # 2. DataHandler carrega os dados brutos para os DataFrames
-                success_data, msg = self.data_handler.load_from_dict(file_data)
-                
-                if success_data:
-                    self.openfilepath = filepath
-                    self.update_all_widgets()
-                    self.update_plot()
-                    self.switch_view("Visualização")
-                else:
-                     QMessageBox.critical(self, "Erro nos Dados", msg)
+            if success_data:
+                self.data_handler.history.clear()   # Não se desfaz a abertura de um arquivo
+                self.openfilepath = filepath
+                self.saved_revision = self.data_handler.revision
+                self.switch_view("Visualização")
             else:
-                QMessageBox.critical(self, "Erro ao Abrir", file_data)
+                 QMessageBox.critical(self, "Erro nos Dados", msg)
+        else:
+            QMessageBox.critical(self, "Erro ao Abrir", file_data)
 
     def save_file(self):
         filepath = self.openfilepath
@@ -656,25 +763,115 @@ class StruTrixMainWindow(QMainWindow):
         else:
            self._save_to_path()
 
-    def save_as_file(self, filepath):
-        # 1. Pega os dados formatados do DataHandler
-        data_to_save = self.data_handler.get_dict_data()
-        
-        # 2. Manda o FileManager salvar no disco
-        success, msg = FileManager.save_file(filepath, data_to_save)
+    def save_as_file(self, filepath, autosave=False):
+        # 1. Tira um snapshot (cópia das colunas) do DataHandler
+        snapshot = self.data_handler.get_column_data()
+        context = {"filepath": filepath, "revision": self.data_handler.revision, "autosave": autosave}
         
+        # 2. Manda o FileManager salvar no disco em segundo plano (gravação atômica)
+        task = FileTask(FileManager.save_project, filepath, snapshot, context=context)
+        task.signals.finished.connect(self._on_file_saved)
+        self.io_pool.start(task)
+
+    # Chamado na thread da interface ao terminar a gravação
+    def _on_file_saved(self, success, msg, context):
         if not success:
-             QMessageBox.critical(self, "Erro", msg)
+            if context["autosave"]:
+                self.statusBar().showMessage(f"Falha no salvamento automático: {msg}", 5000)
+            else:
+                QMessageBox.critical(self, "Erro", msg)
+            return
+
+        self.autosaved_revision = context["revision"]
+        if context["autosave"]:
+            self.statusBar().showMessage("Salvamento automático concluído.", 3000)
+        else:
+            # Só agora o arquivo existe no disco: passa a ser o arquivo aberto, sem alterações pendentes
+            self.openfilepath = context["filepath"]
+            self.saved_revision = context["revision"]
+            self.statusBar().showMessage(msg, 3000)
+
+            # O salvamento automático anterior ficou obsoleto
+            autosave_path = self.autosave_path(context["filepath"])
+            if os.path.exists(autosave_path):
+                os.remove(autosave_path)
 
     def _save_to_path(self):
-        filepath, _ = QFileDialog.getSaveFileName(self, "Salvar Arquivo", "", "StruTrix File (*.stx)")
+        filepath, _ = QFileDialog.getSaveFileName(self, "Salvar Arquivo", "", "StruTrix File (*.stx);;StruTrix Comprimido (*.stx.gz *.stx.xz);;StruTrix Binário (*.stxb)")
         if filepath:
-            self.save_as_file(filepath)
-            self.openfilepath = filepath
+            self.save_as_file(filepath)  # O arquivo aberto só muda quando a gravação terminar com sucesso
 
+    # Caminho do salvamento automático (ao lado do arquivo aberto ou na pasta temporária)
+    def autosave_path(self, filepath=None):
+        filepath = filepath or self.openfilepath
+        if filepath:
+            return f"{filepath}.autosave{FileManager.BINARY_EXTENSION}"
+        return os.path.join(tempfile.gettempdir(), f"StruTrix_autosave{FileManager.BINARY_EXTENSION}")
+
+    # Salvamento automático: só grava se houve mudança desde o último salvamento
+    def autosave(self):
+        revision = self.data_handler.revision
+        if revision in (self.saved_revision, self.autosaved_revision):
+            return
+        if self.io_pool.activeThreadCount() > 0:
+            return  # Já existe uma leitura/gravação em andamento; tenta no próximo ciclo
+        self.save_as_file(self.autosave_path(), autosave=True)
+
+    # Aguarda gravações pendentes antes de fechar
+    def closeEvent(self, event):
+        self.autosave_timer.stop()
+        self.io_pool.waitForDone()
+        self.render_pool.waitForDone()
+        super().closeEvent(event)
+
+    # Importa nós, barras, apoios ou cargas de um CSV / planilha
+    def import_table(self, import_func):
+        filepath, _ = QFileDialog.getOpenFileName(self, "Importar", "", "Tabelas (*.csv *.xlsx *.xls)")
+        if filepath:
+            success, msg = import_func(self.data_handler, filepath)
+            if not success:
+                QMessageBox.warning(self, "Erro na Importação", msg)
+                return
+            self.statusBar().showMessage(msg, 5000)
+
+    # Desfazer / Refazer (resultados de análises anteriores voltam junto com o modelo)
+    def undo(self):
+        success, msg = self.data_handler.undo()
+        self.statusBar().showMessage(msg, 3000)
+
+    def redo(self):
+        success, msg = self.data_handler.redo()
+        self.statusBar().showMessage(msg, 3000)
+
+    # Funde nós próximos e remove barras repetidas ou de comprimento nulo
+    def cleanup_geometry(self):
+        tolerance, ok = QInputDialog.getDouble(self, "Limpar Geometria", "Tolerância para fundir nós (m):",
+                                               GeometryCleanup.DEFAULT_TOLERANCE, 0.0, 1e3, 9)
+        if not ok: return
+        success, msg = GeometryCleanup.apply(self.data_handler, tolerance)
+        if not success:
+            QMessageBox.warning(self, "Erro na Limpeza", msg)
+            return
+        QMessageBox.information(self, "Limpeza da Geometria", msg)
 
-    def export_values(self, filepath):
-        print()
+    # Exporta deslocamentos, reações e esforços internos (um arquivo para cada)
+    def export_values(self):
+        if self.data_handler.analysis_results is None:
+            QMessageBox.information(self, "Aviso", "Execute a análise primeiro para exportar os resultados.")
+            return
+
+        filepath, _ = QFileDialog.getSaveFileName(self, "Exportar Resultados", "", "CSV (*.csv);;Parquet (*.parquet)")
+        if filepath:
+            base, ext = os.path.splitext(filepath)
+            ext = ext or ".csv"
+            # Com barras subdivididas, os esforços também são referidos às barras originais
+            parents = self.data_handler.bar_parents() if self.data_handler.is_subdivided() else None
+            for kind, suffix in [("displacements", "deslocamentos"), ("reactions", "reacoes"), ("internal_forces", "esforcos")]:
+                success, msg = BulkIO.export_results(self.data_handler.analysis_results, f"{base}_{suffix}{ext}", kind, parents=parents)
+                if not success:
+                    QMessageBox.critical(self, "Erro", msg)
+                    return
+            self.statusBar().showMessage(msg, 5000)
 
     # --- Funções da Toolbox de Visualização ---
 
@@ -693,7 +890,29 @@ class StruTrixMainWindow(QMainWindow):
     # Salva visualização atual como imagem
     def save_view(self):
         if hasattr(self.canvas, 'toolbar'):
+            # A imagem salva sai dos artistas vetoriais, não dos ladrilhos da tela
+            self.redraw.flush()
+            tile_mode = self.tile_mode_action.isChecked()
+            if tile_mode: self.plotter.set_tile_mode(False)
             self.canvas.toolbar.save_figure()
+            if tile_mode: self.plotter.set_tile_mode(True, self.submit_render)
+
+    # Mostra quantos pedidos de redesenho foram agrupados e o tempo dos desenhos
+    def redraw_stats(self):
+        QMessageBox.information(self, "Estatísticas de Redesenho", self.redraw.report())
+
+    # Liga/desliga a renderização das camadas pesadas em segundo plano
+    def tile_mode_toggle(self, checked):
+        self.plotter.set_tile_mode(checked, self.submit_render if checked else None)
+
+    # Executa func(*args) no pool de renderização; callback(resultado) volta na thread da interface
+    def submit_render(self, func, args, callback):
+        task = RenderTask(func, args, callback)
+        task.signals.finished.connect(self._on_render_finished)
+        self.render_pool.start(task)
+
+    def _on_render_finished(self, success, result, callback):
+        callback(result if success else None)
 
     # Alterar Numeração de nós
     def count_nodes_toggle(self):
@@ -702,7 +921,7 @@ class StruTrixMainWindow(QMainWindow):
         else:
             self.count_nodes = True
         
-        self.update_plot()
+        self.update_plot(ModelChange())  # Nada mudou no modelo: só a visibilidade da numeração
 
     # Alterar Numeração de barras
     def count_bars_toggle(self):
@@ -711,7 +930,7 @@ class StruTrixMainWindow(QMainWindow):
         else:
             self.count_bars = True
 
-        self.update_plot()
+        self.update_plot(ModelChange())
 
     # Alterar Exibição de Grid
     def show_grid_toggle(self):
@@ -720,7 +939,7 @@ class StruTrixMainWindow(QMainWindow):
         else:
             self.show_grid = True
 
-        self.update_plot()
+        self.update_plot(ModelChange())
 
     # Alterar Exibição das reações de apoio
     def show_reactions_toggle(self):
@@ -729,7 +948,7 @@ class StruTrixMainWindow(QMainWindow):
         else:
             self.show_reactions = True
 
-        self.update_plot()
+        self.update_plot(ModelChange())
 
     # --- Funções de população de tabelas
 
@@ -803,21 +1022,53 @@ class StruTrixMainWindow(QMainWindow):
         self.populate_supports_table()
         self.populate_disp_table()
 
+    # Atualiza só as tabelas (e formulários) afetados pela modificação
+    def update_widgets(self, change):
+        # Linhas adicionadas, removidas ou renumeradas: refaz seletores e tabelas
+        if change.affects(ModelChange.TOPOLOGY):
+            self.update_all_widgets()
+            return
+
+        # Linhas modificadas de cada tabela (None = todas)
+        updates = [
+            (change.nodes(ModelChange.GEOMETRY), self.populate_nodes_table),
+            (change.bars(ModelChange.SECTION, ModelChange.RELEASE), self.populate_bars_table),
+            (change.nodes(ModelChange.LOAD), self.populate_nodal_loads_table),
+            (change.bars(ModelChange.LOAD), self.populate_bar_load_table),
+            (change.nodes(ModelChange.SUPPORT), self.populate_supports_table),
+            (change.nodes(ModelChange.PRESCRIBED), self.populate_disp_table),
+        ]
+        for rows, populate in updates:
+            if rows is None or len(rows):
+                populate(rows)
+
+        # Formulários que mostram os dados modificados (ex.: após desfazer)
+        if change.affects(ModelChange.GEOMETRY):
+            self.on_node_select(self.node_selector.currentIndex())
+        if change.affects(ModelChange.SECTION, ModelChange.RELEASE):
+            self.on_bar_select(self.bar_selector.currentIndex())
+        if change.affects(ModelChange.SUPPORT):
+            self.on_support_node_select(self.support_node_selector.currentIndex())
+
+    # Linhas a reescrever numa tabela (todas, se rows for None)
+    def _table_rows(self, df, rows):
+        return df.iterrows() if rows is None else df.iloc[rows].iterrows()
+
     # Popular tabela de nós
-    def populate_nodes_table(self):
+    def populate_nodes_table(self, rows=None):
         df = self.data_handler.nodes_df 
         self.nodes_table.setRowCount(len(df))
-        for i, row in df.iterrows():
+        for i, row in self._table_rows(df, rows):
             self.nodes_table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
             self.nodes_table.setItem(i, 1, QTableWidgetItem(f"{row['X']:.2f}"))
             self.nodes_table.setItem(i, 2, QTableWidgetItem(f"{row['Y']:.2f}"))
             pass
 
     # Popular tabela de barras
-    def populate_bars_table(self):
+    def populate_bars_table(self, rows=None):
         df = self.data_handler.bars_df 
         self.bars_table.setRowCount(len(df))
-        for i, row in df.iterrows():
+        for i, row in self._table_rows(df, rows):
             self.bars_table.setItem(i, 0, QTableWidgetItem(str(i+1)))
             self.bars_table.setItem(i, 1, QTableWidgetItem(f"{row['node_i']+1}"))
             self.bars_table.setItem(i, 2, QTableWidgetItem(f"{row['node_j']+1}"))
@@ -828,28 +1079,28 @@ class StruTrixMainWindow(QMainWindow):
             self.bars_table.setItem(i, 7, QTableWidgetItem("\U00002714" if row['rot_j'] else "\U0000274C"))
 
     # Popular tabela de carregamentos nodais
-    def populate_nodal_loads_table(self):
+    def populate_nodal_loads_table(self, rows=None):
         df = self.data_handler.nodes_df 
         self.nodal_load_table.setRowCount(len(df))
-        for i, row in df.iterrows():
+        for i, row in self._table_rows(df, rows):
             self.nodal_load_table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
             self.nodal_load_table.setItem(i, 1, QTableWidgetItem(f"{row['Fx']:.2f}"))
             self.nodal_load_table.setItem(i, 2, QTableWidgetItem(f"{row['Fy']:.2f}"))
             self.nodal_load_table.setItem(i, 3, QTableWidgetItem(f"{row['Mz']:.2f}"))
 
     # Popular tabela de carregamentos distribuidos
-    def populate_bar_load_table(self):
+    def populate_bar_load_table(self, rows=None):
         df = self.data_handler.bars_df 
         self.bar_load_table.setRowCount(len(df))
-        for i, row in df.iterrows():
+        for i, row in self._table_rows(df, rows):
             self.bar_load_table.setItem(i, 0, QTableWidgetItem(str(i+1)))
             self.bar_load_table.setItem(i, 1, QTableWidgetItem(f"{row['Q']:.2f}"))
 
     # Popular tabela de apoios
-    def populate_supports_table(self):
+    def populate_supports_table(self, rows=None):
         df = self.data_handler.nodes_df 
         self.support_table.setRowCount(len(df))
-        for i, row in df.iterrows():
+        for i, row in self._table_rows(df, rows):
             self.support_table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
             self.support_table.setItem(i, 1, QTableWidgetItem("\U00002714" if row['Restr_X'] else "\U0000274C"))
             self.support_table.setItem(i, 2, QTableWidgetItem("\U00002714" if row['Restr_Y'] else "\U0000274C"))
@@ -860,10 +1111,10 @@ class StruTrixMainWindow(QMainWindow):
             "\U00002714" if row['Restr_X'] else "\U0000274C"
 
     # Popular tabela de deslocamentos prescritos
-    def populate_disp_table(self):
+    def populate_disp_table(self, rows=None):
         df = self.data_handler.nodes_df 
         self.disp_table.setRowCount(len(df))
-        for i, row in df.iterrows():
+        for i, row in self._table_rows(df, rows):
             self.disp_table.setItem(i, 0, QTableWidgetItem(str(i + 1)))
             self.disp_table.setItem(i, 1, QTableWidgetItem(f"{row['Disp_X']}"))
             self.disp_table.setItem(i, 2, QTableWidgetItem(f"{row['Disp_Y']}"))
@@ -979,9 +1230,6 @@ class StruTrixMainWindow(QMainWindow):
         if not success:
             QMessageBox.warning(self, "Aviso", msg)
             return
-
-        self.update_all_widgets()
-        self.update_plot()
     
     # Deletar Nó
     def delete_node(self):
@@ -994,11 +1242,11 @@ class StruTrixMainWindow(QMainWindow):
         
         if not success:
             QMessageBox.warning(self, "Erro", msg)
+        else:
+            self.statusBar().showMessage(msg, 5000)     # Informa as barras removidas junto com o nó
 
         # Reseta a seleção para "Novo Nó"
         self.node_selector.setCurrentIndex(0)
-        self.update_all_widgets()
-        self.update_plot()
 
     # Adicionar / Atualizar Barra
     def add_update_bar(self):
@@ -1027,9 +1275,6 @@ class StruTrixMainWindow(QMainWindow):
             QMessageBox.warning(self, "Aviso", msg)
             return
 
-        self.update_all_widgets()
-        self.update_plot()
-
     # Deletar Barra
     def delete_bar(self):
         current_index = self.bar_selector.currentIndex()
@@ -1040,9 +1285,19 @@ class StruTrixMainWindow(QMainWindow):
         success = self.data_handler.delete_bar(current_index - 1)
         
         self.bar_selector.setCurrentIndex(0)
-        self.update_all_widgets()
-        self.update_plot()      
     
+    # Subdividir a barra selecionada (ou todas)
+    def subdivide_bars(self):
+        current_index = self.bar_selector.currentIndex()
+        indices = None if current_index == 0 else [current_index - 1]
+
+        success, msg = self.data_handler.subdivide_bars(indices, self.subdivide_segments.value())
+
+        if not success:
+            QMessageBox.warning(self, "Aviso", msg)
+            return
+        self.statusBar().showMessage(msg, 5000)
+
     # Aplicar / Atualizar Carregamentos nodais
     def apply_nodal_load(self):
         current_index = self.load_node_selector.currentIndex()
@@ -1055,9 +1310,6 @@ class StruTrixMainWindow(QMainWindow):
         # Chama o DataHandler
         self.data_handler.update_nodal_loads(current_index, fx, fy, mz)
 
-        self.update_all_widgets()
-        self.update_plot() 
-
     # Aplicar / Atualizar Carregamentos distribuidos nas barras
     def apply_bar_load(self):
         current_index = self.load_bar_selector.currentIndex()
@@ -1068,9 +1320,6 @@ class StruTrixMainWindow(QMainWindow):
         # Chama o DataHandler
         self.data_handler.update_bar_load(current_index, q)
 
-        self.update_all_widgets()
-        self.update_plot()
-
     # Aplicar / Atualizar Apoios
     def apply_support_load(self):
         current_index = self.support_node_selector.currentIndex()
@@ -1084,9 +1333,6 @@ class StruTrixMainWindow(QMainWindow):
         # Chama o DataHandler
         self.data_handler.update_supports(current_index, restr_x, restr_y, restr_rz, restr_rot)
 
-        self.update_all_widgets()
-        self.update_plot()
-
     # Aplica Deslocamento prescrito
     def apply_prescribed_disp(self):
         current_index = self.disp_node_selector.currentIndex()
@@ -1099,28 +1345,35 @@ class StruTrixMainWindow(QMainWindow):
         # Chama o DataHandler
         self.data_handler.update_prescribed_displacements(current_index, dx, dy, drz)
 
-        self.update_all_widgets()
-        self.update_plot()
-
     def run_analysis(self):
         try:
-            # Passa os dataframes limpos do handler para o solver
+            # Passa as colunas tipadas do handler (sem cópia) para o solver
             results = self.solver.run_analysis(
-                self.data_handler.nodes_df, 
-                self.data_handler.bars_df
+                self.data_handler.node_arrays(), 
+                self.data_handler.bar_arrays()
             )
             
             # Armazena resultados no handler
             self.data_handler.analysis_results = results
             
             self.update_all_widgets()
-            QMessageBox.information(self, "Sucesso", "Cálculo realizado!")
+            message = "Cálculo realizado!"
+            if self.solver.issues:  # Avisos da validação (ex.: nós sem barras)
+                message += "\n\n" + ModelValidator.report(self.solver.issues)
+            QMessageBox.information(self, "Sucesso", message)
 
         except ValueError as ve:
             QMessageBox.warning(self, "Aviso de Cálculo", str(ve))
         except Exception as e:
             QMessageBox.critical(self, "Erro Crítico", f"Erro na análise: {str(e)}")
 
+    # Chamado pelo DataHandler após cada modificação (ou lote de modificações) do modelo
+    def on_model_changed(self, change):
+        if change.affects(ModelChange.GEOMETRY, ModelChange.TOPOLOGY):
+            self.inspector.invalidate()  # Índice de nós e barras do cursor refeito na próxima consulta
+        self.update_widgets(change)
+        self.update_plot(change)  # O plotter refaz só as camadas afetadas
+
     # --- Funções de Plotagem e Visualização ---
 
     def switch_view(self, view_name):
@@ -1128,10 +1381,36 @@ class StruTrixMainWindow(QMainWindow):
             QMessageBox.information(self, "Aviso", "Execute a análise primeiro para visualizar os resultados.")
             return
         self.current_view = view_name
-        self.update_plot()
+        self.update_plot(ModelChange())
+
+    # Modelo consultado pela dica e pela seleção no desenho
+    def inspected_model(self):
+        return self.data_handler.node_arrays(), self.data_handler.bar_arrays(), self.data_handler.analysis_results
+
+    # Clique no desenho: seleciona o nó ou a barra nos formulários e mostra os valores na barra de status
+    def on_canvas_select(self, picked, lines):
+        if picked is None:
+            self.statusBar().clearMessage()
+            return
+        if picked["kind"] == "node":
+            self.node_selector.setCurrentIndex(picked["index"] + 1)
+        else:
+            self.bar_selector.setCurrentIndex(picked["index"] + 1)
+        self.statusBar().showMessage(" | ".join(lines))
+
+    # Volta os limites do gráfico para a estrutura inteira
+    def reset_view(self):
+        self.redraw.flush()  # Desenho pendente primeiro (a vista é ajustada ao modelo atual)
+        self.plotter.reset_view()
 
     # Plotagem
-    def update_plot(self):
+    # change: ModelChange que motivou o redesenho (None = refaz todas as camadas do modelo)
+    # O desenho é agendado: pedidos próximos são agrupados pelo RedrawScheduler
+    def update_plot(self, change=None):
+        self.redraw.request(change)
+
+    # Desenho agendado (as camadas afetadas já foram marcadas em cada pedido)
+    def draw_plot(self):
         # DELEGA O DESENHO PARA O PLOTTER
         self.plotter.draw_structure(
             self.data_handler.nodes_df, 
@@ -1141,5 +1420,6 @@ class StruTrixMainWindow(QMainWindow):
             self.show_grid,
             self.count_nodes,
             self.count_bars,
-            self.show_reactions
+            self.show_reactions,
+            ModelChange()  # Camadas do modelo já marcadas em cada pedido (invalidate)
         )
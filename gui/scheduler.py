@@ -0,0 +1,79 @@
+import math
+import time
+from PyQt5.QtCore import QObject, QTimer
+
+class RedrawScheduler(QObject):
+    """Junta pedidos de redesenho próximos em um único desenho.
+
+    Cada pedido marca na hora as camadas afetadas (invalidate) e agenda o desenho (render);
+    pedidos que chegam antes dele só se somam ao que já está marcado. Cada desenho espera
+    DEBOUNCE_MS por outros pedidos e fica a pelo menos FRAME_INTERVAL_MS do fim do anterior,
+    então edições em sequência rápida geram no máximo um desenho por intervalo.
+    """
+
+    FRAME_INTERVAL_MS = 33
+    DEBOUNCE_MS = 10
+
+    def __init__(self, render, invalidate=None, parent=None):
+        """render(): faz o desenho; invalidate(change): marca as camadas afetadas pela modificação."""
+        super().__init__(parent)
+        self.render = render
+        self.invalidate = invalidate
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.flush)
+        self._pending = False
+        self._last_end = None   # Fim do último desenho (time.perf_counter)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.requested = 0      # Pedidos recebidos
+        self.executed = 0       # Desenhos feitos
+        self.render_time = 0.0  # Tempo total de render() (s); a pintura da tela vem depois, no draw_idle
+        self.max_render_time = 0.0
+
+    @property
+    def pending(self):
+        return self._pending
+
+    @property
+    def coalesced(self):
+        """Pedidos atendidos pelo desenho de outro pedido (sem desenho próprio)."""
+        return self.requested - self.executed - int(self._pending)
+
+    def request(self, change=None):
+        """Pede um redesenho; change: ModelChange que o motivou (None = todas as camadas do modelo)."""
+        self.requested += 1
+        if self.invalidate is not None:
+            self.invalidate(change)
+        if self._pending: return
+        self._pending = True
+        delay = self.DEBOUNCE_MS
+        if self._last_end is not None:
+            delay = max(delay, self.FRAME_INTERVAL_MS - (time.perf_counter() - self._last_end) * 1000)
+        self.timer.start(int(math.ceil(delay)))
+
+    def flush(self):
+        """Desenha agora se houver pedido pendente (ex.: antes de ajustar a vista ou salvar a imagem)."""
+        if not self._pending: return
+        self._pending = False
+        self.timer.stop()
+        start = time.perf_counter()
+        try:
+            self.render()
+        finally:
+            self._last_end = time.perf_counter()
+            elapsed = self._last_end - start
+            self.executed += 1
+            self.render_time += elapsed
+            self.max_render_time = max(self.max_render_time, elapsed)
+
+    def report(self):
+        """Texto com as estatísticas de pedidos e desenhos."""
+        lines = [f"Pedidos de redesenho: {self.requested}",
+                 f"Desenhos executados: {self.executed}",
+                 f"Pedidos agrupados (sem desenho próprio): {self.coalesced}"]
+        if self.executed:
+            lines.append(f"Tempo médio por desenho: {1000 * self.render_time / self.executed:.1f} ms")
+            lines.append(f"Maior tempo de desenho: {1000 * self.max_render_time:.1f} ms")
+        return "\n".join(lines)
@@ -0,0 +1,50 @@
+from PyQt5.QtCore import QObject, QRunnable, pyqtSignal
+
+# Sinais emitidos pela tarefa (QRunnable não herda de QObject)
+class FileTaskSignals(QObject):
+    progress = pyqtSignal(int)              # Progresso em porcentagem (0 a 100)
+    finished = pyqtSignal(bool, object, object)     # (sucesso, dados ou mensagem de erro, contexto)
+
+# Executa uma operação de arquivo fora da thread da interface
+class FileTask(QRunnable):
+    def __init__(self, func, *args, context=None):
+        """func(*args, progress_callback=...) deve retornar (sucesso, resultado), como o FileManager.
+
+        context: dados repassados sem alteração ao sinal finished (ex.: caminho do arquivo).
+        """
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.context = context
+        self.signals = FileTaskSignals()
+
+    def run(self):
+        try:
+            success, result = self.func(*self.args, progress_callback=self._report_progress)
+        except Exception as e:
+            success, result = False, str(e)
+        self.signals.finished.emit(success, result, self.context)
+
+    def _report_progress(self, fraction):
+        self.signals.progress.emit(int(fraction * 100))
+
+# Sinais da renderização de um ladrilho
+class RenderTaskSignals(QObject):
+    finished = pyqtSignal(bool, object, object)     # (sucesso, imagem ou mensagem de erro, callback)
+
+# Renderiza um ladrilho do desenho fora da thread da interface
+class RenderTask(QRunnable):
+    def __init__(self, func, args, callback):
+        """func(*args) retorna a imagem; callback é repassado ao sinal finished (chamado na thread da interface)."""
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.callback = callback
+        self.signals = RenderTaskSignals()
+
+    def run(self):
+        try:
+            success, result = True, self.func(*self.args)
+        except Exception as e:
+            success, result = False, str(e)
+        self.signals.finished.emit(success, result, self.callback)
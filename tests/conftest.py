@@ -0,0 +1,32 @@
+import numpy as np
+import pytest
+from core.data_handler import DataHandler
+
+def build_model(handler, nodes, bars):
+    """Carrega no handler um modelo pequeno descrito por colunas parciais (demais colunas zeradas)."""
+    def full(columns, dtypes):
+        size = len(next(iter(columns.values())))
+        return {col: np.asarray(columns.get(col, np.zeros(size)), dtype=dtype) for col, dtype in dtypes.items()}
+    success, msg = handler.load_from_columns({"nodes": full(nodes, handler.node_dtypes),
+                                              "bars": full(bars, handler.bar_dtypes)})
+    assert success, msg
+    return handler
+
+def section(num_bars, E=200e6, A=0.01, I=8e-5):
+    return {"E": np.full(num_bars, E), "A": np.full(num_bars, A), "I": np.full(num_bars, I)}
+
+def assert_same_data(actual, expected):
+    """Compara dois snapshots de get_column_data (mesmas colunas, tamanhos e valores)."""
+    for table in ("nodes", "bars"):
+        assert actual[table].keys() == expected[table].keys()
+        for col in expected[table]:
+            np.testing.assert_array_equal(actual[table][col], expected[table][col], err_msg=f"{table}.{col}")
+
+@pytest.fixture
+def frame_handler():
+    """Pórtico de 2 andares e 2 vãos com cargas nas vigas (9 nós e 10 barras)."""
+    from core.generators import ModelGenerator
+    handler = DataHandler()
+    success, msg = ModelGenerator.frame(handler, 2, 2, beam_load=-10.0)
+    assert success, msg
+    return handler
@@ -0,0 +1,49 @@
+"""Adjacência nó -> barras (CSR) contra uma varredura direta das barras."""
+import numpy as np
+import pytest
+from core.adjacency import NodeBarAdjacency
+from core.data_handler import DataHandler
+from tests.conftest import build_model, section
+
+def _random_handler(seed, num_nodes=40, num_bars=120):
+    rng = np.random.default_rng(seed)
+    node_i = rng.integers(0, num_nodes, num_bars)
+    node_j = (node_i + rng.integers(1, num_nodes, num_bars)) % num_nodes
+    return build_model(DataHandler(),
+                       {"X": np.arange(num_nodes, dtype=float), "Y": np.zeros(num_nodes)},
+                       {"node_i": node_i, "node_j": node_j, **section(num_bars)})
+
+@pytest.mark.parametrize("seed", range(5))
+def test_bars_of_each_node_in_increasing_order(seed):
+    handler = _random_handler(seed)
+    node_i, node_j = handler.bars.column("node_i"), handler.bars.column("node_j")
+    for node in range(len(handler.nodes)):
+        expected = np.flatnonzero((node_i == node) | (node_j == node))
+        np.testing.assert_array_equal(handler.bars_at_node(node), expected)
+        expected_neighbors = np.unique(np.concatenate([node_j[node_i == node], node_i[node_j == node]]))
+        np.testing.assert_array_equal(handler.node_neighbors(node), expected_neighbors)
+    np.testing.assert_array_equal(handler.node_degree(), np.bincount(np.concatenate([node_i, node_j]), minlength=len(handler.nodes)))
+
+def test_bars_of_nodes():
+    handler = _random_handler(7)
+    node_i, node_j = handler.bars.column("node_i"), handler.bars.column("node_j")
+    nodes = [3, 17, 3, 25]
+    expected = np.flatnonzero(np.isin(node_i, nodes) | np.isin(node_j, nodes))
+    np.testing.assert_array_equal(handler.bars_at_nodes(nodes), expected)
+    assert len(handler.bars_at_nodes([])) == 0
+
+def test_invalid_references_are_ignored():
+    adjacency = NodeBarAdjacency()
+    adjacency.build(3, [0, 1, -1, 0], [1, 5, 2, 2])
+    np.testing.assert_array_equal(adjacency.degree(), [2, 2, 2])
+    np.testing.assert_array_equal(adjacency.bars_of(1), [0, 1])
+    np.testing.assert_array_equal(adjacency.bars_of(2), [2, 3])
+
+def test_follows_edits():
+    handler = _random_handler(3)
+    handler.add_bar({"node_i": 0, "node_j": 39, "E": 1.0, "A": 1.0, "I": 1.0})
+    assert handler.bars_at_node(39)[-1] == len(handler.bars) - 1
+    handler.add_node(100.0, 0.0)
+    assert len(handler.bars_at_node(40)) == 0
+    handler.update_bars([0], {"node_i": 40})
+    np.testing.assert_array_equal(handler.bars_at_node(40), [0])
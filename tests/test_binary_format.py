@@ -0,0 +1,71 @@
+"""Formato binário colunar (.stxb): ida e volta das colunas e leitura por memory mapping."""
+import numpy as np
+import pytest
+from core.data_handler import DataHandler
+from core.file_manager import FileManager
+from tests.conftest import assert_same_data
+
+def test_round_trip_keeps_values_and_dtypes(frame_handler, tmp_path):
+    path = tmp_path / "modelo.stxb"
+    data = frame_handler.get_column_data()
+    assert FileManager.save_binary_file(path, data)[0]
+
+    success, loaded = FileManager.load_binary_file(path)
+    assert success, loaded
+    assert_same_data(loaded, data)
+    for table in ("nodes", "bars"):
+        for col, values in data[table].items():
+            assert loaded[table][col].dtype == values.dtype
+
+def test_columns_are_aligned_read_only_views(frame_handler, tmp_path):
+    path = tmp_path / "modelo.stxb"
+    FileManager.save_binary_file(path, frame_handler.get_column_data())
+    _, mapped = FileManager.load_binary_file(path)
+    for values in mapped["nodes"].values():
+        assert not values.flags.writeable
+        assert values.ctypes.data % values.itemsize == 0
+    _, copied = FileManager.load_binary_file(path, copy=True)
+    assert all(values.flags.writeable for values in copied["nodes"].values())
+
+def test_load_into_handler(frame_handler, tmp_path):
+    path = tmp_path / "modelo.stxb"
+    FileManager.save_binary_file(path, frame_handler.get_column_data())
+    _, data = FileManager.load_binary_file(path)
+    handler = DataHandler()
+    assert handler.load_from_columns(data)[0]
+    assert_same_data(handler.get_column_data(), frame_handler.get_column_data())
+    # As colunas do handler são cópias próprias: editar não toca o arquivo mapeado
+    assert handler.update_nodes([0], {"Fx": 1.0})[0]
+
+def test_empty_tables(tmp_path):
+    handler = DataHandler()
+    path = tmp_path / "vazio.stxb"
+    assert FileManager.save_binary_file(path, handler.get_column_data())[0]
+    success, data = FileManager.load_binary_file(path)
+    assert success
+    assert all(len(values) == 0 for values in data["nodes"].values())
+    assert data["bars"]["node_i"].dtype == np.int64
+
+def test_inconsistent_columns_are_rejected(tmp_path):
+    success, msg = FileManager.save_binary_file(tmp_path / "x.stxb", {"nodes": {"X": np.zeros(3), "Y": np.zeros(2)}})
+    assert not success and "tamanho inconsistente" in msg
+
+def test_wrong_file_is_rejected(tmp_path):
+    path = tmp_path / "texto.stxb"
+    path.write_text('{"nodes": []}')
+    success, msg = FileManager.load_binary_file(path)
+    assert not success and "formato binário" in msg
+
+@pytest.mark.parametrize("source, target", [("modelo.stx", "modelo.stxb"), ("modelo.stxb", "modelo.stx")])
+def test_convert_file(frame_handler, tmp_path, source, target):
+    if FileManager.is_binary_file(source):
+        FileManager.save_binary_file(tmp_path / source, frame_handler.get_column_data())
+    else:
+        FileManager.save_file(tmp_path / source, frame_handler.get_dict_data())
+    assert FileManager.convert_file(tmp_path / source, tmp_path / target)[0]
+
+    handler = DataHandler()
+    success, data = FileManager.load_project(tmp_path / target, {"nodes": handler.node_dtypes, "bars": handler.bar_dtypes})
+    assert success, data
+    assert handler.load_from_columns(data)[0]
+    assert_same_data(handler.get_column_data(), frame_handler.get_column_data())
@@ -0,0 +1,46 @@
+"""Importação de tabelas (CSV) para o DataHandler."""
+import numpy as np
+from core.data_handler import DataHandler
+from core.bulk_io import BulkIO
+from core.model_store import ColumnStore
+
+def _handler_with_line(tmp_path):
+    handler = DataHandler()
+    nodes = tmp_path / "nos.csv"
+    nodes.write_text("X;Y;Restr_Y\n0;0;sim\n2,5;0;não\n5;0;x\n", encoding="utf-8")
+    assert BulkIO.import_nodes(handler, nodes) == (True, "3 nós adicionados.")
+    bars = tmp_path / "barras.csv"
+    bars.write_text("node_i,node_j,Q\n1,2,-10\n2,3,-10\n")
+    assert BulkIO.import_bars(handler, bars)[0]
+    return handler
+
+def test_import_nodes_and_bars(tmp_path):
+    handler = _handler_with_line(tmp_path)
+    np.testing.assert_array_equal(handler.nodes.column("X"), [0.0, 2.5, 5.0])
+    np.testing.assert_array_equal(handler.nodes.column("Restr_Y"), [True, False, True])
+    np.testing.assert_array_equal(handler.bars.column("node_i"), [0, 1])
+    np.testing.assert_array_equal(handler.bars.column("E"), [BulkIO.BAR_DEFAULTS["E"]] * 2)
+
+def test_import_values_updates_existing_rows_without_building_frames(tmp_path, monkeypatch):
+    handler = _handler_with_line(tmp_path)
+    def no_frame(store): raise AssertionError("DataFrame montado só para contar linhas")
+    monkeypatch.setattr(ColumnStore, "to_frame", no_frame)
+    values = tmp_path / "cargas.csv"
+    values.write_text("node,Fy\n2,-7.5\n")
+    assert BulkIO.import_node_values(handler, values)[0]
+    values = tmp_path / "barras_q.csv"
+    values.write_text("bar,Q\n2,-3\n")
+    assert BulkIO.import_bar_values(handler, values)[0]
+    np.testing.assert_array_equal(handler.nodes.column("Fy"), [0.0, -7.5, 0.0])
+    np.testing.assert_array_equal(handler.bars.column("Q"), [-10.0, -3.0])
+
+def test_invalid_rows_are_reported(tmp_path):
+    handler = _handler_with_line(tmp_path)
+    values = tmp_path / "cargas.csv"
+    values.write_text("node,Fy\n1,-1\n9,-1\n")
+    success, msg = BulkIO.import_node_values(handler, values)
+    assert not success and msg == "Nós inexistentes na coluna 'node' (linhas 3...)."
+    values.write_text("X,Y\n1,abc\n")
+    success, msg = BulkIO.import_nodes(handler, values)
+    assert not success and "coluna 'Y'" in msg
+    assert len(handler.nodes) == 3
@@ -0,0 +1,73 @@
+"""Remoção de nós em cascata: barras incidentes removidas e node_i/node_j renumerados."""
+import numpy as np
+from core.data_handler import DataHandler
+from tests.conftest import build_model, section
+
+def _line_handler():
+    """Cinco nós em linha (x = 0..4) e barras 0-1, 1-2, 2-3, 3-4 e 0-4."""
+    handler = DataHandler()
+    return build_model(handler,
+                       {"X": [0.0, 1.0, 2.0, 3.0, 4.0], "Y": [0.0, 0.0, 0.0, 0.0, 1.0]},
+                       {"node_i": [0, 1, 2, 3, 0], "node_j": [1, 2, 3, 4, 4], **section(5)})
+
+def _bar_coords(handler):
+    """Conjunto de barras como pares de coordenadas (independente da numeração)."""
+    X, Y = handler.nodes.column("X"), handler.nodes.column("Y")
+    node_i, node_j = handler.bars.column("node_i"), handler.bars.column("node_j")
+    return {((X[i], Y[i]), (X[j], Y[j])) for i, j in zip(node_i.tolist(), node_j.tolist())}
+
+def test_delete_middle_node_renumbers_following_nodes():
+    handler = _line_handler()
+    expected = {pair for pair in _bar_coords(handler) if (2.0, 0.0) not in pair}
+    success, msg = handler.delete_node(2)
+    assert success and "2 barra(s)" in msg
+
+    np.testing.assert_array_equal(handler.nodes.column("X"), [0.0, 1.0, 3.0, 4.0])
+    np.testing.assert_array_equal(handler.bars.column("node_i"), [0, 2, 0])
+    np.testing.assert_array_equal(handler.bars.column("node_j"), [1, 3, 3])
+    assert _bar_coords(handler) == expected
+
+def test_delete_several_nodes():
+    handler = _line_handler()
+    expected = {pair for pair in _bar_coords(handler) if (1.0, 0.0) not in pair and (3.0, 0.0) not in pair}
+    success, msg = handler.delete_nodes([3, 1])
+    assert success and msg == "2 nós e 4 barras deletados."
+
+    np.testing.assert_array_equal(handler.nodes.column("X"), [0.0, 2.0, 4.0])
+    np.testing.assert_array_equal(handler.bars.column("node_i"), [0])
+    np.testing.assert_array_equal(handler.bars.column("node_j"), [2])
+    assert _bar_coords(handler) == expected
+
+def test_delete_unconnected_node():
+    handler = _line_handler()
+    handler.add_node(9.0, 9.0)
+    success, msg = handler.delete_node(5)
+    assert (success, msg) == (True, "Nó deletado.")
+    assert len(handler.bars) == 5
+
+def test_queries_use_new_numbering():
+    handler = _line_handler()
+    handler.delete_node(1)
+    np.testing.assert_array_equal(handler.node_degree(), [1, 1, 2, 2])
+    np.testing.assert_array_equal(sorted(handler.node_neighbors(3)), [0, 2])
+    np.testing.assert_array_equal(sorted(handler.bars_at_node(3)), [1, 2])
+    assert handler.find_nearest_node(3.1, 0.0)[0] == 2
+    assert handler.node_index.find(4.0, 1.0) == 3
+    assert handler.node_index.find(1.0, 0.0) is None
+    # Nova posição livre e posição ocupada depois da renumeração
+    assert handler.add_node(1.0, 0.0)[0]
+    assert not handler.add_node(3.0, 0.0)[0]
+
+def test_invalid_references_become_minus_one():
+    """Referências já inválidas (arquivos antigos) viram -1 em vez de apontar para outro nó."""
+    handler = _line_handler()
+    handler.bars.set(slice(None), {"node_j": np.array([1, 2, 3, 4, 7])})
+    handler.delete_node(0)
+    np.testing.assert_array_equal(handler.bars.column("node_i"), [0, 1, 2])
+    np.testing.assert_array_equal(handler.bars.column("node_j"), [1, 2, 3])
+
+def test_delete_all_nodes():
+    handler = _line_handler()
+    assert handler.delete_nodes(np.arange(5))[0]
+    assert len(handler.nodes) == len(handler.bars) == 0
+    assert handler.find_nearest_node(0.0, 0.0) == (None, float("inf"))
@@ -0,0 +1,89 @@
+"""Avisos de modificação (ModelChange) e o cache de matrizes do solver que depende deles."""
+import numpy as np
+import pytest
+from core.changes import ModelChange
+from core.solver import StructuralSolver
+
+def _changes(handler):
+    changes = []
+    handler.add_listener(changes.append)
+    return changes
+
+@pytest.mark.parametrize("edit, kinds", [
+    (lambda h: h.update_nodal_loads(4, 1.0, 0.0, 0.0), {ModelChange.LOAD}),
+    (lambda h: h.update_bar_load(7, -5.0), {ModelChange.LOAD}),
+    (lambda h: h.update_supports(4, True, True, False, 0), {ModelChange.SUPPORT}),
+    (lambda h: h.update_prescribed_displacements(0, 0.0, -0.01, 0.0), {ModelChange.PRESCRIBED}),
+    (lambda h: h.update_bars([1, 2], {"E": 1e6, "rot_i": True}), {ModelChange.SECTION, ModelChange.RELEASE}),
+    (lambda h: h.update_node_coords(4, 4.0, 3.5), {ModelChange.GEOMETRY}),
+    (lambda h: h.add_node(50.0, 50.0), {ModelChange.TOPOLOGY}),
+    (lambda h: h.delete_bar(0), {ModelChange.TOPOLOGY}),
+    (lambda h: h.update_bars([0], {"node_j": 8}), {ModelChange.TOPOLOGY}),
+])
+def test_change_kinds(frame_handler, edit, kinds):
+    changes = _changes(frame_handler)
+    edit(frame_handler)
+    assert len(changes) == 1
+    assert changes[0].kinds == kinds
+
+def test_changed_indices(frame_handler):
+    handler = frame_handler
+    changes = _changes(handler)
+    handler.update_bars([6, 8], {"Q": -1.0})
+    np.testing.assert_array_equal(changes[-1].bars(ModelChange.LOAD), [6, 8])
+    assert len(changes[-1].nodes()) == 0
+    # Nó movido: as barras ligadas a ele também contam como GEOMETRY
+    handler.update_node_coords(4, 4.0, 3.5)
+    np.testing.assert_array_equal(changes[-1].nodes(ModelChange.GEOMETRY), [4])
+    np.testing.assert_array_equal(changes[-1].bars(ModelChange.GEOMETRY), handler.bars_at_node(4))
+
+def test_batch_merges_changes(frame_handler):
+    handler = frame_handler
+    changes = _changes(handler)
+    with handler.batch():
+        handler.update_nodal_loads(3, 0.0, -1.0, 0.0)
+        handler.update_bars([2], {"I": 1e-4})
+    assert len(changes) == 1
+    assert changes[0].kinds == {ModelChange.LOAD, ModelChange.SECTION}
+    np.testing.assert_array_equal(changes[0].nodes(ModelChange.LOAD), [3])
+    np.testing.assert_array_equal(changes[0].bars(ModelChange.SECTION), [2])
+
+def test_loaded_model_affects_everything(frame_handler):
+    changes = _changes(frame_handler)
+    frame_handler.load_from_columns(frame_handler.get_column_data())
+    assert changes[0].affects(ModelChange.TOPOLOGY)
+    assert changes[0].nodes() is None and changes[0].bars() is None
+
+def test_tracked_solver_cache_matches_fresh_solver(frame_handler):
+    """Com o cache de matrizes (track), só as barras modificadas são refeitas e o resultado não muda."""
+    handler = frame_handler
+    solver = StructuralSolver()
+    solver.track(handler)
+    solver.run_analysis(handler.node_arrays(), handler.bar_arrays())
+    assert solver.rebuilt_bars == len(handler.bars)
+
+    handler.update_bars([6], {"Q": -30.0})  # Carga: nenhuma matriz refeita
+    handler.update_bars([7], {"I": 2e-4})   # Seção: só a barra 7
+    results = solver.run_analysis(handler.node_arrays(), handler.bar_arrays())
+    assert solver.rebuilt_bars == 1
+    fresh = StructuralSolver().run_analysis(handler.node_arrays(), handler.bar_arrays())
+    for key in ("displacements", "reactions", "forces"):
+        np.testing.assert_allclose(results[key], fresh[key])
+
+    handler.update_node_coords(4, 4.0, 3.5)  # Geometria: as barras ligadas ao nó 4
+    results = solver.run_analysis(handler.node_arrays(), handler.bar_arrays())
+    assert solver.rebuilt_bars == len(handler.bars_at_node(4))
+    fresh = StructuralSolver().run_analysis(handler.node_arrays(), handler.bar_arrays())
+    for key in ("displacements", "reactions", "forces"):
+        np.testing.assert_allclose(results[key], fresh[key])
+
+def test_topology_change_rebuilds_all_elements(frame_handler):
+    handler = frame_handler
+    solver = StructuralSolver()
+    solver.track(handler)
+    solver.run_analysis(handler.node_arrays(), handler.bar_arrays())
+    handler.delete_bar(9)
+    solver.run_analysis(handler.node_arrays(), handler.bar_arrays())
+    assert solver.rebuilt_bars == len(handler.bars)
+    solver.run_analysis(handler.node_arrays(), handler.bar_arrays())
+    assert solver.rebuilt_bars == 0  # Nada mudou desde a última análise
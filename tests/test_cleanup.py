@@ -0,0 +1,88 @@
+"""GeometryCleanup.apply: fusão de nós, remoção de barras inválidas e aplicação tudo ou nada."""
+import numpy as np
+from core.data_handler import DataHandler
+from core.cleanup import GeometryCleanup
+from tests.conftest import build_model, section, assert_same_data
+
+def _dirty_handler():
+    """Nós A(0,0), B(1,0), B'(1+1e-8, 0) e C(2,0); barras A-B, B'-C, B-A (repetida) e B-B' (nula)."""
+    return build_model(DataHandler(), {
+        "X": [0.0, 1.0, 1.0 + 1e-8, 2.0], "Y": [0.0, 0.0, 0.0, 0.0],
+        "Fy": [0.0, -5.0, -3.0, 0.0], "Restr_X": [1, 0, 0, 0], "Restr_Y": [1, 0, 1, 0],
+    }, {
+        "node_i": [0, 2, 1, 1], "node_j": [1, 3, 0, 2], "Q": [-1.0, -2.0, -3.0, -4.0], **section(4),
+    })
+
+def test_plan():
+    handler = _dirty_handler()
+    plan = GeometryCleanup.plan(handler.node_arrays(), handler.bar_arrays())
+    np.testing.assert_array_equal(plan["target"], [0, 1, 1, 3])
+    np.testing.assert_array_equal(plan["merged"], [2])
+    np.testing.assert_array_equal(plan["zero_length"], [3])
+    np.testing.assert_array_equal(plan["duplicate"], [2])
+
+def test_apply():
+    handler = _dirty_handler()
+    success, report = GeometryCleanup.apply(handler)
+    assert success
+    assert "Nós fundidos: 1" in report and "Nó 3 -> Nó 2" in report
+    assert "Barras de comprimento nulo removidas: 1" in report
+    assert "Barras repetidas removidas: 1" in report
+
+    # Nó fundido removido; cargas somadas e restrições combinadas no representante
+    np.testing.assert_array_equal(handler.nodes.column("X"), [0.0, 1.0, 2.0])
+    np.testing.assert_array_equal(handler.nodes.column("Fy"), [0.0, -8.0, 0.0])
+    np.testing.assert_array_equal(handler.nodes.column("Restr_Y"), [True, True, False])
+    np.testing.assert_array_equal(handler.nodes.column("Restr_X"), [True, False, False])
+    # Barras restantes ligadas ao representante, com as propriedades originais
+    np.testing.assert_array_equal(handler.bars.column("node_i"), [0, 1])
+    np.testing.assert_array_equal(handler.bars.column("node_j"), [1, 2])
+    np.testing.assert_array_equal(handler.bars.column("Q"), [-1.0, -2.0])
+    assert handler.node_index.find(1.0 + 1e-8, 0.0) is None
+    assert handler.node_index.find(2.0, 0.0) == 2
+
+def test_apply_is_one_undo_step():
+    handler = _dirty_handler()
+    before, revision = handler.get_column_data(), handler.revision
+    notified = []
+    handler.add_listener(notified.append)
+    GeometryCleanup.apply(handler)
+    assert len(notified) == 1
+    assert handler.undo()[0]
+    assert_same_data(handler.get_column_data(), before)
+    assert handler.revision == revision
+    assert handler.node_index.find(1.0 + 1e-8, 0.0) == 2
+
+def test_failed_step_rolls_back(monkeypatch):
+    """Falha na última etapa: as etapas anteriores são desfeitas, sem revisão, histórico ou aviso."""
+    handler = _dirty_handler()
+    before, revision = handler.get_column_data(), handler.revision
+    handler.analysis_results = {"estado": "antes"}
+    notified = []
+    handler.add_listener(notified.append)
+    monkeypatch.setattr(handler, "delete_nodes", lambda indices: (False, "falha simulada"))
+
+    assert GeometryCleanup.apply(handler) == (False, "falha simulada")
+    assert_same_data(handler.get_column_data(), before)
+    assert handler.revision == revision
+    assert handler.analysis_results == {"estado": "antes"}
+    assert notified == []
+    assert handler.node_index.find(1.0 + 1e-8, 0.0) == 2
+    # O desfazer volta ao estado anterior ao carregamento, não a uma limpeza parcial
+    assert handler.undo()[0]
+    assert len(handler.nodes) == 0
+
+def test_exception_rolls_back(monkeypatch):
+    handler = _dirty_handler()
+    before = handler.get_column_data()
+    def fail(indices, columns): raise RuntimeError("erro simulado")
+    monkeypatch.setattr(handler, "update_bars", fail)
+    assert GeometryCleanup.apply(handler) == (False, "erro simulado")
+    assert_same_data(handler.get_column_data(), before)
+
+def test_clean_model_is_untouched(frame_handler):
+    handler = frame_handler
+    revision = handler.revision
+    success, report = GeometryCleanup.apply(handler)
+    assert success and report.startswith("Nenhum problema encontrado.")
+    assert handler.revision == revision
@@ -0,0 +1,118 @@
+"""Geradores paramétricos: tamanhos, apoios e cargas dos modelos, e análise de cada um."""
+import numpy as np
+import pytest
+from core.data_handler import DataHandler
+from core.generators import ModelGenerator
+from core.solver import StructuralSolver
+
+def _analyze(handler):
+    """Roda a análise e verifica o equilíbrio global (reações + cargas nodais + cargas distribuídas = 0)."""
+    solver = StructuralSolver()
+    results = solver.run_analysis(handler.node_arrays(), handler.bar_arrays())
+    assert solver.issues == []
+    X, Y = handler.nodes.column("X"), handler.nodes.column("Y")
+    node_i, node_j = handler.bars.column("node_i"), handler.bars.column("node_j")
+    dx, dy = X[node_j] - X[node_i], Y[node_j] - Y[node_i]
+    Q = handler.bars.column("Q")
+    # Resultante de cada carga distribuída: Q * L no eixo local y, (-sen, cos) no global
+    applied = np.array([handler.nodes.column("Fx").sum() - (Q * dy).sum(),
+                        handler.nodes.column("Fy").sum() + (Q * dx).sum()])
+    scale = max(np.abs(applied).max(), 1.0)
+    np.testing.assert_allclose(results["reactions"][:, :2].sum(axis=0) + applied, 0.0, atol=1e-6 * scale)
+    return results
+
+def test_frame():
+    handler = DataHandler()
+    success, msg = ModelGenerator.frame(handler, 3, 2, storey_height=3.0, bay_width=5.0, beam_load=-12.0, beam_hinges=True)
+    assert success and msg == "Modelo gerado (Pórtico): 12 nós e 15 barras."
+    np.testing.assert_array_equal(handler.nodes.column("X")[:3], [0.0, 5.0, 10.0])
+    np.testing.assert_array_equal(handler.nodes.column("Y")[-1], 9.0)
+    # Engaste nos 3 nós do térreo
+    for col in ("Restr_X", "Restr_Y", "Restr_Rz"):
+        np.testing.assert_array_equal(np.flatnonzero(handler.nodes.column(col)), [0, 1, 2])
+    # 9 pilares (verticais, sem carga e sem rótula) e 6 vigas (horizontais, carregadas e rotuladas)
+    beams = handler.nodes.column("Y")[handler.bars.column("node_i")] == handler.nodes.column("Y")[handler.bars.column("node_j")]
+    assert beams.sum() == 6
+    np.testing.assert_array_equal(handler.bars.column("Q"), np.where(beams, -12.0, 0.0))
+    np.testing.assert_array_equal(handler.bars.column("rot_i"), beams)
+    np.testing.assert_array_equal(handler.bars.column("rot_j"), beams)
+    solver = StructuralSolver()
+    solver.run_analysis(handler.node_arrays(), handler.bar_arrays())
+    assert solver.issues == []
+
+def test_loaded_frame_analysis():
+    # Sem rótulas nas vigas: barras biarrotuladas são tratadas como treliça e não levam carga distribuída
+    handler = DataHandler()
+    assert ModelGenerator.frame(handler, 3, 2, storey_height=3.0, bay_width=5.0, beam_load=-12.0)[0]
+    results = _analyze(handler)
+    np.testing.assert_allclose(results["reactions"][:, 1].sum(), 12.0 * 10.0 * 3)
+
+@pytest.mark.parametrize("kind, num_nodes, num_bars", [("pratt", 14, 25), ("howe", 14, 25), ("warren", 13, 23)])
+def test_truss(kind, num_nodes, num_bars):
+    handler = DataHandler()
+    success, msg = ModelGenerator.truss(handler, kind, 6, 18.0, 2.5, node_load=-8.0)
+    assert success, msg
+    assert (len(handler.nodes), len(handler.bars)) == (num_nodes, num_bars)
+    assert handler.bars.column("rot_i").all() and handler.bars.column("rot_j").all()
+    np.testing.assert_array_equal(np.flatnonzero(handler.nodes.column("Restr_X")), [0])
+    np.testing.assert_array_equal(np.flatnonzero(handler.nodes.column("Restr_Y")), [0, 6])
+    assert not handler.nodes.column("Restr_Rz").any()
+    np.testing.assert_array_equal(np.flatnonzero(handler.nodes.column("Fy")), np.arange(1, 6))
+    assert (handler.node_degree() >= 2).all()
+    # Só as translações entram no sistema (rotações de nós totalmente rotulados ficam de fora)
+    results = _analyze(handler)
+    assert results["num_active_dofs"] == 2 * num_nodes
+    np.testing.assert_allclose(results["reactions"][[0, 6], 1], [20.0, 20.0])
+
+def test_continuous_beam():
+    handler = DataHandler()
+    success, msg = ModelGenerator.continuous_beam(handler, [4.0, 6.0, 4.0], segments_per_span=3, load=-10.0)
+    assert success and msg == "Modelo gerado (Viga contínua): 10 nós e 9 barras."
+    np.testing.assert_allclose(handler.nodes.column("X")[[0, 3, 6, 9]], [0.0, 4.0, 10.0, 14.0])
+    np.testing.assert_array_equal(np.flatnonzero(handler.nodes.column("Restr_Y")), [0, 3, 6, 9])
+    np.testing.assert_array_equal(np.flatnonzero(handler.nodes.column("Restr_X")), [0])
+    np.testing.assert_array_equal(handler.bars.column("Q"), np.full(9, -10.0))
+    results = _analyze(handler)
+    # Simetria: reações iguais nos apoios extremos e nos internos
+    Ry = results["reactions"][[0, 3, 6, 9], 1]
+    np.testing.assert_allclose(Ry[0], Ry[3])
+    np.testing.assert_allclose(Ry[1], Ry[2])
+    np.testing.assert_allclose(results["displacements"][[0, 3, 6, 9], 1], 0.0, atol=1e-12)
+
+@pytest.mark.parametrize("shape", ModelGenerator.ARCH_SHAPES)
+def test_arch(shape):
+    handler = DataHandler()
+    success, msg = ModelGenerator.arch(handler, 20.0, 5.0, 16, shape=shape, load=-3.0)
+    assert success and msg == "Modelo gerado (Arco): 17 nós e 16 barras."
+    X, Y = handler.nodes.column("X"), handler.nodes.column("Y")
+    np.testing.assert_allclose([X[0], X[-1], Y[0], Y[-1]], [0.0, 20.0, 0.0, 0.0], atol=1e-12)
+    np.testing.assert_allclose(Y[8], 5.0)  # Topo no meio do vão
+    np.testing.assert_allclose(X[8], 10.0, atol=1e-12)
+    if shape == "circular":
+        radius = (20.0 ** 2 / 4 + 5.0 ** 2) / (2 * 5.0)
+        np.testing.assert_allclose(np.hypot(X - 10.0, Y - (5.0 - radius)), radius)
+    np.testing.assert_array_equal(np.flatnonzero(handler.nodes.column("Restr_X")), [0, 16])
+    results = _analyze(handler)
+    np.testing.assert_allclose(results["reactions"][0, 0], -results["reactions"][16, 0])
+
+def test_generating_replaces_the_model_in_one_undo_step():
+    handler = DataHandler()
+    handler.add_node(100.0, 100.0)
+    ModelGenerator.frame(handler, 1, 1)
+    assert len(handler.nodes) == 4
+    assert handler.undo()[0]
+    assert len(handler.nodes) == 1
+
+@pytest.mark.parametrize("call, message", [
+    (lambda h: ModelGenerator.frame(h, 0, 2), "O pórtico precisa de pelo menos 1 andar e 1 vão."),
+    (lambda h: ModelGenerator.frame(h, 1, 1, support="articulado"), "Tipo de apoio desconhecido: articulado."),
+    (lambda h: ModelGenerator.truss(h, "k", 4, 8.0, 1.0), "Tipo de treliça desconhecido: k."),
+    (lambda h: ModelGenerator.truss(h, "pratt", 1, 8.0, 1.0), "A treliça precisa de pelo menos 2 painéis."),
+    (lambda h: ModelGenerator.continuous_beam(h, [4.0, 0.0]), "Informe vãos com comprimento positivo."),
+    (lambda h: ModelGenerator.arch(h, 10.0, 2.0, 8, shape="elíptico"), "Forma de arco desconhecida: elíptico."),
+    (lambda h: ModelGenerator.arch(h, 10.0, -2.0, 8), "O arco precisa de vão e flecha positivos e pelo menos 2 segmentos."),
+])
+def test_invalid_parameters(call, message):
+    handler = DataHandler()
+    assert call(handler) == (False, message)
+    assert len(handler.nodes) == 0
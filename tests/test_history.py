@@ -0,0 +1,114 @@
+"""Desfazer / refazer: cada tipo de operação do ColumnStore volta exatamente ao estado anterior."""
+import numpy as np
+import pytest
+from core.data_handler import DataHandler
+from core.changes import ModelChange
+from tests.conftest import assert_same_data
+
+def _add_node(h): return h.add_node(10.0, 10.0)
+def _add_nodes(h): return h.add_nodes({"X": [10.0, 11.0, 12.0], "Y": [5.0, 5.0, 5.0], "Fy": [-1.0, -2.0, -3.0]})
+def _add_bar(h): return h.add_bar({"node_i": 0, "node_j": 4, "E": 1.0, "A": 1.0, "I": 1.0})
+def _add_bars(h): return h.add_bars({"node_i": [0, 1], "node_j": [4, 5]}, defaults={"E": 1.0, "A": 1.0, "I": 1.0})
+def _move_node(h): return h.update_node_coords(4, 4.5, 3.5)
+def _update_loads(h): return h.update_nodal_loads(3, 1.0, -2.0, 0.5), ""
+def _update_nodes(h): return h.update_nodes([3, 4, 5], {"Y": 3.25, "Restr_X": True})
+def _update_bars(h): return h.update_bars([6, 7], {"Q": -25.0, "rot_j": True})
+def _delete_bar(h): return h.delete_bar(3), ""
+def _delete_bars(h): return h.delete_bars([0, 5, 9])
+def _delete_node(h): return h.delete_node(4)
+def _delete_nodes(h): return h.delete_nodes([1, 7])
+def _subdivide(h): return h.subdivide_bars([6, 8], 3)
+
+def _load(h):
+    data = h.get_column_data()
+    data["nodes"]["X"] = data["nodes"]["X"] * 2
+    return h.load_from_columns(data)
+
+def _batch(h):
+    with h.batch():
+        h.update_nodes([0, 1, 2], {"Fx": 3.0})
+        h.add_node(20.0, 0.0)
+        h.delete_node(4)
+        h.update_bars([0], {"E": 5.0})
+    return True, ""
+
+EDITS = {
+    "add_node": _add_node, "add_nodes": _add_nodes, "add_bar": _add_bar, "add_bars": _add_bars,
+    "update_node_coords": _move_node, "update_nodal_loads": _update_loads, "update_nodes": _update_nodes,
+    "update_bars": _update_bars, "delete_bar": _delete_bar, "delete_bars": _delete_bars,
+    "delete_node": _delete_node, "delete_nodes": _delete_nodes, "subdivide_bars": _subdivide,
+    "load_from_columns": _load, "batch": _batch,
+}
+
+def assert_index_consistent(handler):
+    """Cada nó é encontrado pelo índice espacial na própria posição (numeração atual)."""
+    X, Y = handler.nodes.column("X"), handler.nodes.column("Y")
+    for i in range(len(X)):
+        assert handler.node_index.find(X[i], Y[i]) == i
+        assert handler.find_nearest_node(X[i] + 1e-3, Y[i])[0] == i
+
+@pytest.mark.parametrize("name", EDITS)
+def test_undo_redo_round_trip(frame_handler, name):
+    handler = frame_handler
+    handler.analysis_results = {"estado": "antes"}
+    before, revision_before = handler.get_column_data(), handler.revision
+    parents_before = handler.bar_parents()
+
+    result = EDITS[name](handler)
+    success = result[0] if isinstance(result, tuple) else result
+    assert success, result
+    after, revision_after = handler.get_column_data(), handler.revision
+    parents_after = handler.bar_parents()
+    assert revision_after != revision_before
+    assert handler.analysis_results is None
+
+    for _ in range(2):
+        assert handler.undo()[0]
+        assert_same_data(handler.get_column_data(), before)
+        assert handler.revision == revision_before
+        assert handler.analysis_results == {"estado": "antes"}
+        np.testing.assert_array_equal(handler.bar_parents()["parent"], parents_before["parent"])
+        assert_index_consistent(handler)
+
+        assert handler.redo()[0]
+        assert_same_data(handler.get_column_data(), after)
+        assert handler.revision == revision_after
+        assert handler.analysis_results is None
+        np.testing.assert_array_equal(handler.bar_parents()["parent"], parents_after["parent"])
+        assert_index_consistent(handler)
+
+def test_batch_is_single_undo_step(frame_handler):
+    handler = frame_handler
+    before = handler.get_column_data()
+    _batch(handler)
+    assert handler.undo()[0]
+    assert_same_data(handler.get_column_data(), before)
+    # O passo anterior é o modelo gerado inteiro (um único load)
+    assert handler.undo()[0]
+    assert len(handler.nodes) == len(handler.bars) == 0
+
+def test_new_edit_clears_redo(frame_handler):
+    handler = frame_handler
+    handler.update_nodal_loads(0, 1.0, 0.0, 0.0)
+    handler.undo()
+    handler.update_nodal_loads(1, 2.0, 0.0, 0.0)
+    assert handler.redo() == (False, "Nada para refazer.")
+
+def test_undo_notifies_listeners_with_the_change(frame_handler):
+    handler = frame_handler
+    handler.update_bars([2], {"Q": -1.0})
+    changes = []
+    handler.add_listener(changes.append)
+    handler.undo()
+    assert len(changes) == 1
+    assert changes[0].affects(ModelChange.LOAD)
+    assert not changes[0].affects(ModelChange.GEOMETRY)
+    np.testing.assert_array_equal(changes[0].bars(ModelChange.LOAD), [2])
+
+def test_undo_refused_inside_batch():
+    handler = DataHandler()
+    handler.add_node(0.0, 0.0)
+    with handler.batch():
+        assert not handler.undo()[0]
+    assert handler.undo()[0]
+    assert len(handler.nodes) == 0
@@ -0,0 +1,44 @@
+"""Salvar como: o arquivo aberto só muda depois que a gravação em segundo plano termina com sucesso."""
+import os
+import pytest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+@pytest.fixture
+def window(monkeypatch):
+    app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+    from gui import main_window
+    errors = []
+    monkeypatch.setattr(main_window.QMessageBox, "critical", lambda *args: errors.append(args[2]))
+    win = main_window.StruTrixMainWindow()
+    win.errors = errors
+    yield win
+    win.autosave_timer.stop()
+    win.io_pool.waitForDone()
+    win.close()
+    app.processEvents()
+
+def _save_as(window, monkeypatch, filepath):
+    """Escolhe filepath no diálogo de Salvar e espera a gravação terminar."""
+    from gui import main_window
+    monkeypatch.setattr(main_window.QFileDialog, "getSaveFileName", lambda *args: (str(filepath), ""))
+    window._save_to_path()
+    window.io_pool.waitForDone()
+    QtWidgets.QApplication.processEvents()
+
+def test_failed_save_keeps_previous_file(window, monkeypatch, tmp_path):
+    window.data_handler.add_node(0.0, 0.0)
+    revision = window.data_handler.revision
+    _save_as(window, monkeypatch, tmp_path / "sem_pasta" / "modelo.stx")
+    assert window.errors
+    assert window.openfilepath is None
+    assert window.saved_revision != revision  # Continua com alterações não salvas
+
+def test_successful_save_sets_open_file(window, monkeypatch, tmp_path):
+    window.data_handler.add_node(0.0, 0.0)
+    _save_as(window, monkeypatch, tmp_path / "modelo.stxb")
+    assert window.errors == []
+    assert window.openfilepath == str(tmp_path / "modelo.stxb")
+    assert window.saved_revision == window.data_handler.revision
+    assert os.path.exists(tmp_path / "modelo.stxb")
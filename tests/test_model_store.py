@@ -0,0 +1,85 @@
+"""ColumnStore e os DataFrames entregues pelo DataHandler."""
+import numpy as np
+import pandas as pd
+import pytest
+from core.model_store import ColumnStore
+from core.changes import ModelChange
+
+DTYPES = {"X": np.float64, "n": np.int64, "flag": np.bool_}
+
+def test_growth_keeps_rows():
+    store = ColumnStore(DTYPES)
+    for i in range(100):
+        assert store.append({"X": i * 0.5, "n": i}) == i
+    assert len(store) == 100 and store.capacity >= 100
+    np.testing.assert_array_equal(store.column("n"), np.arange(100))
+    np.testing.assert_array_equal(store.column("flag"), np.zeros(100, dtype=bool))
+
+@pytest.mark.parametrize("edit", [
+    lambda s: s.append({"X": 9.0}),
+    lambda s: s.extend({"X": [7.0, 8.0], "n": [1, 2]}),
+    lambda s: s.set([0, 2], {"X": [-1.0, -2.0]}),
+    lambda s: s.delete([1, 3]),
+    lambda s: s.insert([0, 5], {"X": [10.0, 11.0]}),
+    lambda s: s.load({"X": np.ones(2), "n": np.ones(2, dtype=np.int64), "flag": np.ones(2, dtype=bool)}),
+])
+def test_recorded_op_undoes_the_edit(edit):
+    store = ColumnStore(DTYPES)
+    store.extend({"X": np.arange(5.0), "n": np.arange(5), "flag": np.arange(5) % 2 == 0})
+    before = {col: values.copy() for col, values in store.columns().items()}
+    ops = []
+    store.recorder = lambda s, op: ops.append(op)
+    edit(store)
+    after = {col: values.copy() for col, values in store.columns().items()}
+
+    redo = store.apply(ops[0])
+    for col in DTYPES: np.testing.assert_array_equal(store.column(col), before[col])
+    store.apply(redo)
+    for col in DTYPES: np.testing.assert_array_equal(store.column(col), after[col])
+
+def test_frame_is_a_snapshot(frame_handler):
+    """Um DataFrame guardado não muda com modificações posteriores da tabela."""
+    handler = frame_handler
+    nodes, bars = handler.nodes_df, handler.bars_df
+    x, node_j = nodes["X"].to_numpy().copy(), bars["node_j"].to_numpy().copy()
+    handler.update_node_coords(0, 50.0, 50.0)
+    handler.delete_node(1)
+    handler.update_bars([0], {"node_j": 5})
+    np.testing.assert_array_equal(nodes["X"].to_numpy(), x)
+    np.testing.assert_array_equal(bars["node_j"].to_numpy(), node_j)
+    assert len(handler.nodes_df) == len(nodes) - 1
+
+def test_frame_is_cached_and_read_only(frame_handler):
+    handler = frame_handler
+    frame = handler.nodes_df
+    assert handler.nodes_df is frame  # Sem modificações, o mesmo DataFrame
+    with pytest.raises(ValueError):
+        frame["X"].to_numpy()[0] = 99.0
+    assert handler.nodes.column("X")[0] == 0.0
+    handler.update_nodal_loads(0, 1.0, 0.0, 0.0)
+    assert handler.nodes_df is not frame
+
+@pytest.mark.parametrize("table", ["nodes", "bars"])
+def test_frame_setter_is_a_committed_edit(frame_handler, table):
+    """Atribuir nodes_df / bars_df é uma modificação completa: revisão nova, aviso e passo de desfazer."""
+    handler = frame_handler
+    before, revision = getattr(handler, f"{table}_df"), handler.revision
+    handler.analysis_results = {"estado": "antes"}
+    changes = []
+    handler.add_listener(changes.append)
+
+    setattr(handler, f"{table}_df", before.iloc[:2])
+    assert len(getattr(handler, table)) == 2
+    assert handler.revision != revision and handler.analysis_results is None
+    assert len(changes) == 1 and changes[0].affects(ModelChange.TOPOLOGY)
+    assert handler.history.mark() == 0  # Nada pendente no histórico
+
+    assert handler.undo()[0]
+    pd.testing.assert_frame_equal(getattr(handler, f"{table}_df"), before)
+    assert handler.revision == revision
+
+def test_node_frame_setter_updates_the_index(frame_handler):
+    handler = frame_handler
+    handler.nodes_df = pd.DataFrame({"X": [10.0, 20.0], "Y": [0.0, 0.0]}).reindex(columns=handler.node_cols)
+    assert handler.node_index.find(20.0, 0.0) == 1
+    assert handler.node_index.find(0.0, 0.0) is None
@@ -0,0 +1,43 @@
+"""SpatialHash: pares próximos, duplicatas em lote e consultas após edições, contra força bruta."""
+import numpy as np
+import pytest
+from core.data_handler import DataHandler
+from core.spatial_index import SpatialHash
+
+def brute_pairs(points, tolerance):
+    distance = np.hypot(*(points[:, np.newaxis, :] - points[np.newaxis, :, :]).transpose(2, 0, 1))
+    a, b = np.nonzero(np.triu(distance <= tolerance, k=1))
+    return set(zip(a.tolist(), b.tolist()))
+
+@pytest.mark.parametrize("seed", range(5))
+def test_close_pairs_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    points = rng.uniform(0, 10, size=(400, 2))
+    # Repetições exatas e quase coincidentes, além de um aglomerado denso
+    points[300:340] = points[:40]
+    points[340:380] = points[40:80] + rng.normal(scale=1e-7, size=(40, 2))
+    points[380:] = 5.0 + rng.uniform(0, 1e-6, size=(20, 2))
+    tolerance = 1e-6
+    a, b = SpatialHash.close_pairs(points, tolerance)
+    assert set(zip(a.tolist(), b.tolist())) == brute_pairs(points, tolerance)
+
+def test_find_many_reports_existing_and_repeated_points():
+    handler = DataHandler()
+    handler.add_nodes({"X": [0.0, 1.0, 2.0], "Y": [0.0, 0.0, 0.0]})
+    index = handler.node_index
+    np.testing.assert_array_equal(index.find_many(np.array([5.0, 1.0, 6.0, 5.0]), np.zeros(4)), [1, 3])
+    # Pontos excluídos (nós sendo movidos) não contam como ocupados
+    assert len(index.find_many(np.array([1.0]), np.array([0.0]), exclude=np.array([1]))) == 0
+
+def test_queries_after_incremental_edits():
+    handler = DataHandler()
+    rng = np.random.default_rng(1)
+    for x, y in rng.uniform(0, 100, size=(300, 2)):
+        handler.add_node(x, y)
+    handler.update_node_coords(10, 50.0, 50.0)
+    handler.delete_nodes([0, 5, 200])
+    X, Y = handler.nodes.column("X"), handler.nodes.column("Y")
+    for x, y in rng.uniform(-10, 110, size=(50, 2)):
+        expected = np.argmin(np.hypot(X - x, Y - y))
+        assert handler.find_nearest_node(x, y)[0] == expected
+    assert handler.node_index.find(50.0, 50.0) == 8  # Nó 10 após remover 0 e 5
@@ -0,0 +1,63 @@
+"""Leitura e gravação em blocos do .stx (JSON), com compressão opcional pela extensão."""
+import json
+import numpy as np
+import pytest
+from core.data_handler import DataHandler
+from core.file_manager import FileManager
+from tests.conftest import assert_same_data
+
+def _dtypes(handler):
+    return {"nodes": handler.node_dtypes, "bars": handler.bar_dtypes}
+
+@pytest.mark.parametrize("name", ["modelo.stx", "modelo.stx.gz", "modelo.stx.xz"])
+def test_stream_round_trip(frame_handler, tmp_path, name):
+    path = tmp_path / name
+    data = frame_handler.get_column_data()
+    assert FileManager.save_file_stream(path, data, chunk_rows=4)[0]
+    success, loaded = FileManager.load_file_stream(path, _dtypes(frame_handler), chunk_rows=3)
+    assert success, loaded
+    assert_same_data(loaded, data)
+
+def test_stream_file_is_the_record_json(frame_handler, tmp_path):
+    """O arquivo gravado em blocos é o mesmo JSON de registros do formato original."""
+    path = tmp_path / "modelo.stx"
+    FileManager.save_file_stream(path, frame_handler.get_column_data(), chunk_rows=4)
+    assert json.loads(path.read_text(encoding="utf-8")) == frame_handler.get_dict_data()
+
+def test_reads_original_format_in_tiny_blocks(frame_handler, tmp_path, monkeypatch):
+    """Arquivo do save_file (indentado) lido com blocos de poucos bytes: valores cortados no meio do bloco."""
+    path = tmp_path / "modelo.stx"
+    frame_handler.update_nodes([3], {"X": 1.0 / 3.0, "Fx": -1234.5678e-3})
+    FileManager.save_file(path, frame_handler.get_dict_data())
+    monkeypatch.setattr(FileManager, "STREAM_BLOCK_SIZE", 7)
+    progress = []
+    success, loaded = FileManager.load_file_stream(path, _dtypes(frame_handler), chunk_rows=2, progress_callback=progress.append)
+    assert success, loaded
+    assert_same_data(loaded, frame_handler.get_column_data())
+    assert progress == sorted(progress) and 0.0 <= progress[0] and progress[-1] == 1.0
+
+def test_types_are_inferred_without_dtypes(tmp_path):
+    path = tmp_path / "modelo.stx"
+    path.write_text('{"version": 2, "nodes": [{"X": 1, "Y": 2.5, "Restr_X": true}], "bars": []}')
+    success, data = FileManager.load_file_stream(path)
+    assert success, data
+    assert set(data) == {"nodes", "bars"}  # Valores que não são tabelas são ignorados
+    assert data["nodes"]["X"].dtype.kind == "i" and data["nodes"]["Y"].dtype == np.float64
+    assert data["nodes"]["Restr_X"].dtype == np.bool_
+    assert data["bars"] == {}
+
+def test_missing_columns_become_zero(tmp_path):
+    handler = DataHandler()
+    path = tmp_path / "modelo.stx"
+    path.write_text('{"nodes": [{"X": 1.0, "Y": 2.0}, {"X": 3.0, "Y": 4.0, "Fy": -5}], "bars": []}')
+    success, data = FileManager.load_file_stream(path, _dtypes(handler))
+    assert success
+    np.testing.assert_array_equal(data["nodes"]["Fy"], [0.0, -5.0])
+    assert handler.load_from_columns(data)[0]
+    assert len(handler.nodes) == 2
+
+def test_invalid_json_is_reported(tmp_path):
+    path = tmp_path / "modelo.stx"
+    path.write_text('{"nodes": [{"X": 1.0} {"X": 2.0}]}')
+    success, msg = FileManager.load_file_stream(path)
+    assert not success and "esperado ','" in msg
@@ -0,0 +1,61 @@
+"""Subdivisão de barras: nós internos, rótulas, origem de cada trecho e resultados inalterados."""
+import numpy as np
+from core.data_handler import DataHandler
+from core.solver import StructuralSolver
+from tests.conftest import build_model, section
+
+def _beam():
+    """Viga biengastada de 6 m com carga distribuída e uma barra vertical rotulada no topo."""
+    return build_model(DataHandler(), {
+        "X": [0.0, 6.0, 3.0, 3.0], "Y": [0.0, 0.0, -2.0, -4.0],
+        "Restr_X": [1, 1, 0, 1], "Restr_Y": [1, 1, 0, 1], "Restr_Rz": [1, 1, 0, 1],
+    }, {
+        "node_i": [0, 3], "node_j": [1, 2], "Q": [-10.0, 0.0], "rot_j": [0, 1], **section(2),
+    })
+
+def test_segments_and_nodes():
+    handler = _beam()
+    success, msg = handler.subdivide_bars([0, 1], 3)
+    assert success and msg == "2 barras divididas em 3 trechos (4 nós criados)."
+    np.testing.assert_allclose(handler.nodes.column("X")[4:], [2.0, 4.0, 3.0, 3.0])
+    np.testing.assert_allclose(handler.nodes.column("Y")[4:], [0.0, 0.0, -10 / 3, -8 / 3])
+    # Primeiro trecho na linha original, demais no fim da tabela
+    np.testing.assert_array_equal(handler.bars.column("node_i"), [0, 3, 4, 5, 6, 7])
+    np.testing.assert_array_equal(handler.bars.column("node_j"), [4, 6, 5, 1, 7, 2])
+    np.testing.assert_array_equal(handler.bars.column("Q"), [-10.0, 0.0, -10.0, -10.0, 0.0, 0.0])
+    # A rótula final fica só no último trecho da barra 1
+    np.testing.assert_array_equal(handler.bars.column("rot_j"), [0, 0, 0, 0, 0, 1])
+    parents = handler.bar_parents()
+    np.testing.assert_array_equal(parents["parent"], [0, 1, 0, 0, 1, 1])
+    np.testing.assert_allclose(parents["t0"], [0, 0, 1 / 3, 2 / 3, 1 / 3, 2 / 3])
+
+def test_nested_subdivision_keeps_the_original_bar():
+    handler = _beam()
+    handler.subdivide_bars([0], 2)
+    handler.subdivide_bars([2], 2)  # Segunda metade da barra 0
+    parents = handler.bar_parents()
+    assert handler.is_subdivided()
+    np.testing.assert_array_equal(parents["parent"], [0, 1, 0, 0])
+    np.testing.assert_allclose(parents["t0"][[2, 3]], [0.5, 0.75])
+    np.testing.assert_allclose(parents["t1"][[2, 3]], [0.75, 1.0])
+
+def test_results_do_not_change():
+    handler = _beam()
+    solver = StructuralSolver()
+    before = solver.run_analysis(handler.node_arrays(), handler.bar_arrays())
+    handler.subdivide_bars(None, 4)
+    after = solver.run_analysis(handler.node_arrays(), handler.bar_arrays())
+    np.testing.assert_allclose(after["reactions"][:4], before["reactions"], atol=1e-8)
+    np.testing.assert_allclose(after["displacements"][:4], before["displacements"], atol=1e-12)
+    # Momento no meio do vão da viga biengastada: q L² / 24 (anti-horário no nó final do trecho)
+    middle = np.flatnonzero(handler.bars.column("node_j") == 5)[0]
+    np.testing.assert_allclose(after["forces"][middle, 5], 10.0 * 36 / 24, rtol=1e-6)
+
+def test_undo_and_errors():
+    handler = _beam()
+    assert handler.subdivide_bars([0], 1) == (False, "Informe pelo menos 2 trechos por barra.")
+    assert not handler.subdivide_bars([5], 2)[0]
+    handler.subdivide_bars(None, 2)
+    assert handler.undo()[0]
+    assert (len(handler.nodes), len(handler.bars)) == (4, 2)
+    assert not handler.is_subdivided()